@@ -0,0 +1,168 @@
+# dyslexim/bench/replay.py
+"""
+Deterministic gaze trace replay for latency benchmarking.
+
+Feeds a trace recorded with `main.py --record-trace` back through the regular
+dispatch pipeline (source -> GazeDispatcher -> GazeStream -> handleGaze)
+against a local HTML fixture, headlessly, and reports sample-to-paint latency
+percentiles and how many samples the 50 ms throttle in handleGaze dropped
+(superseded by a newer sample before the page got to them).
+
+    cd dyslexim
+    python -m bench.replay trace.dxgt
+    python -m bench.replay --synthetic 10 --fixture bench/fixtures/article.html
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer, QUrl, QPointF
+from PyQt6.QtWidgets import QApplication
+
+from core.config import config, HIT_TEST_MODES
+from core.gaze_trace import GazeTrace, TraceGazeSource, load_gaze_trace
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_FIXTURE = os.path.join(FIXTURES_DIR, "article.html")
+
+
+def synthetic_trace(seconds, rate=120, lines=12):
+    """Builds a reading-like trace (left to right, line by line) for runs without a recording."""
+    trace = GazeTrace(urls=["synthetic"])
+    line_seconds = seconds / lines
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        line = int(t / line_seconds)
+        trace.t.append(t)
+        trace.x.append(0.1 + 0.8 * ((t % line_seconds) / line_seconds))
+        trace.y.append(0.08 + 0.84 * (line + 0.5) / lines)
+        trace.url_index.append(0)
+    return trace
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(latencies_ms, page_stats, dispatch_stats, trace):
+    values = sorted(latencies_ms)
+    return {
+        "traceSamples": len(trace),
+        "traceDurationS": round(trace.duration(), 3),
+        "dispatched": dispatch_stats.get("sent", 0),
+        "coalesced": dispatch_stats.get("skipped", 0),
+        "received": page_stats.get("received", 0),
+        "handled": page_stats.get("handled", 0),
+        "debounceDropped": page_stats.get("dropped", 0),
+        "snapped": page_stats.get("snapped", 0),
+        "indexRebuilds": page_stats.get("indexRebuilds", 0),
+        "maskDowngraded": page_stats.get("maskDowngraded", False),
+        "highlightFrames": page_stats.get("highlightFrames", 0),
+        "forcedLayouts": page_stats.get("forcedLayouts", 0),
+        "latencyMs": {
+            "count": len(values),
+            "p50": round(percentile(values, 50), 2),
+            "p90": round(percentile(values, 90), 2),
+            "p95": round(percentile(values, 95), 2),
+            "p99": round(percentile(values, 99), 2),
+            "max": round(values[-1], 2) if values else 0.0,
+        },
+    }
+
+
+def run_replay(trace, fixture, speed=1.0, timeout_s=None, hit_test_mode=None):
+    """Replays `trace` against `fixture` and returns the summary dict."""
+    from core.main_window import DysleximMainWindow
+    from core.scheme import register_url_scheme
+
+    if hit_test_mode:
+        # Only for this run; nothing is saved back to config.json
+        config['hitTestMode'] = hit_test_mode
+
+    app = QApplication.instance()
+    if app is None:
+        register_url_scheme()
+        app = QApplication(sys.argv[:1])
+    source = TraceGazeSource(trace, to_global=None, speed=speed)
+    window = DysleximMainWindow(
+        gaze_source=source,
+        start_urls=[(QUrl.fromLocalFile(os.path.abspath(fixture)).toString(), "Replay")],
+        latency_reporting=True,
+    )
+    window.show()
+    tab = window.current_tab()
+
+    def to_global(x, y):
+        pt = tab.view.mapToGlobal(QPointF(x * tab.view.width(), y * tab.view.height()))
+        return pt.x(), pt.y()
+    source.to_global = to_global
+
+    latencies = []
+    tab.gaze_stream.handled.connect(lambda sample_ms, now_ms: latencies.append(now_ms - sample_ms))
+    result = {}
+
+    def finish():
+        if result:
+            return
+
+        def on_stats(stats_json):
+            page_stats = json.loads(stats_json) if stats_json else {}
+            result.update(summarize(latencies, page_stats, window.gaze_dispatcher.stats(), trace))
+            window.close()
+            app.quit()
+        tab.run_js("JSON.stringify(window.__dyslexim_stats || {})", on_stats)
+
+    def poll_finished():
+        if source.finished():
+            # Leave time for the last throttled sample and paint acks
+            QTimer.singleShot(500, finish)
+        else:
+            QTimer.singleShot(100, poll_finished)
+
+    def on_loaded(ok):
+        tab.view.loadFinished.disconnect(on_loaded)
+        # Give the handler's web channel a moment to connect before playing samples
+        QTimer.singleShot(300, lambda: (source.begin(), poll_finished()))
+
+    tab.view.loadFinished.connect(on_loaded)
+    limit = timeout_s if timeout_s is not None else trace.duration() / speed + 30
+    QTimer.singleShot(int(limit * 1000), finish)
+    app.exec()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", nargs="?", help="trace file recorded with --record-trace")
+    parser.add_argument("--synthetic", type=float, metavar="SECONDS", help="replay a generated reading trace instead")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="local HTML page to replay against")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    parser.add_argument("--hit-test", choices=HIT_TEST_MODES, help="override the hitTestMode setting")
+    parser.add_argument("--json", metavar="PATH", help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = load_gaze_trace(args.trace)
+        print(f"Loaded {len(trace)} samples over {trace.duration():.1f}s from {len(trace.urls)} page(s)")
+    elif args.synthetic:
+        trace = synthetic_trace(args.synthetic)
+    else:
+        parser.error("give a trace file or --synthetic SECONDS")
+
+    summary = run_replay(trace, args.fixture, speed=args.speed, hit_test_mode=args.hit_test)
+    print(json.dumps(summary, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# dyslexim/bench/suite.py
+"""
+Headless benchmark suite for the browser, injection and gaze hot paths.
+
+Runs the real window offscreen against synthetic article pages of 1k, 10k and
+100k nodes (see bench/synthetic.py) and measures, per page size:
+
+  tab.create / tab.load       BrowserTab construction, and until loadFinished
+  tab.rendererRss             resident memory of the tab's renderer process
+  handler.install             the gaze handler's own setup time in the page
+  handleGaze.p50 / .p95       synchronous cost of one gaze sample (hit test +
+                              highlight bookkeeping; the batched DOM writes
+                              land in the next frame and aren't included)
+  focus.on / focus.off        Focus Mode toggle, including the style recalc
+  settings.apply              settings store update -> page sees the new value
+
+Results are written as JSON. With --compare, the run (or an existing results
+file given with --results) is checked against a baseline and the exit status
+is 1 if any metric got worse by more than --threshold.
+
+    cd dyslexim
+    python -m bench.suite --out bench-results.json
+    python -m bench.suite --compare baseline.json --threshold 0.15
+    python -m bench.suite --compare baseline.json --results bench-results.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QEventLoop, QTimer, QUrl, PYQT_VERSION_STR, QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+from core.config import config_store
+from core.gaze_trace import GazeTrace, TraceGazeSource
+from core.tab_lifecycle import read_process_rss_kb
+from bench.replay import percentile
+from bench.synthetic import SIZES, ensure_fixture
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+# Changes smaller than this (in the metric's unit) are noise, whatever the ratio
+DEFAULT_NOISE_FLOOR = 0.5
+
+
+class Timeout(Exception):
+    pass
+
+
+def spin_until(predicate, timeout_s=60.0):
+    """Runs the event loop until `predicate()` is true."""
+    deadline = time.perf_counter() + timeout_s
+    loop = QEventLoop()
+    # Wakes the loop up regularly so the deadline is noticed even when nothing happens
+    heartbeat = QTimer()
+    heartbeat.start(20)
+    try:
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise Timeout(f"gave up after {timeout_s:.0f}s")
+            loop.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+    finally:
+        heartbeat.stop()
+
+
+def eval_js(tab, js, timeout_s=30.0):
+    """Runs `js` in the gaze handler's world and returns its result."""
+    box = []
+    tab.run_js(js, box.append)
+    spin_until(lambda: box, timeout_s)
+    return box[0]
+
+
+class BenchSuite:
+    """Drives one offscreen DysleximMainWindow through every measurement."""
+
+    def __init__(self, sizes, repeat=3, samples=200):
+        self.sizes = sizes
+        self.repeat = repeat
+        self.samples = samples
+        self.values = {}     # metric name -> list of measurements
+        self.units = {}
+
+    def add(self, name, value, unit="ms"):
+        self.values.setdefault(name, []).append(value)
+        self.units[name] = unit
+
+    def run(self):
+        from core.main_window import DysleximMainWindow
+        from core.scheme import register_url_scheme
+
+        app = QApplication.instance()
+        if app is None:
+            register_url_scheme()
+            app = QApplication(sys.argv[:1])
+
+        # Settings changes made by the suite go to a scratch file, never the user's
+        config_store.path = os.path.join(tempfile.mkdtemp(prefix="dyslexim-bench-"), "config.json")
+
+        # An idle trace source: no gaze input except what the suite sends itself
+        self.window = DysleximMainWindow(
+            gaze_source=TraceGazeSource(GazeTrace(), to_global=None),
+            start_urls=[("about:blank", "Bench")],
+        )
+        self.window.show()
+        try:
+            for size in self.sizes:
+                url = QUrl.fromLocalFile(ensure_fixture(size)).toString()
+                for _ in range(self.repeat):
+                    self.measure_page(size, url)
+        finally:
+            self.window.close()
+        return self.results()
+
+    def measure_page(self, size, url):
+        window = self.window
+        browser_rss_before = read_process_rss_kb(os.getpid()) or 0
+
+        start = time.perf_counter()
+        tab = window.add_new_tab(url, size)
+        created = time.perf_counter()
+        loaded = []
+        tab.view.loadFinished.connect(lambda ok: loaded.append(time.perf_counter()))
+        spin_until(lambda: loaded, 120)
+        self.add(f"tab.create.{size}", (created - start) * 1000.0)
+        self.add(f"tab.load.{size}", (loaded[0] - start) * 1000.0)
+
+        # The handler is in once its stats exist; settings need its web channel too
+        spin_until(lambda: eval_js(tab, "!!window.__dyslexim_channel"), 30)
+        stats = json.loads(eval_js(tab, "JSON.stringify(window.__dyslexim_stats)"))
+        self.add(f"handler.install.{size}", stats.get("installMs", 0.0))
+
+        rss = read_process_rss_kb(tab.page.renderProcessPid())
+        if rss is not None:
+            self.add(f"tab.rendererRss.{size}", rss / 1024.0, "MB")
+        browser_rss = read_process_rss_kb(os.getpid())
+        if browser_rss is not None:
+            self.add(f"tab.browserRssDelta.{size}", (browser_rss - browser_rss_before) / 1024.0, "MB")
+
+        self.measure_handle_gaze(tab, size)
+        self.measure_focus_mode(tab, size)
+        self.measure_settings_change(tab, size)
+
+        window.close_tab(window.tabs.indexOf(tab))
+        # Let the closed tab's page actually go away before the next load
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    def measure_handle_gaze(self, tab, size):
+        # A reading path: left to right across 20 lines, top to bottom
+        lines = 20
+        per_line = max(1, self.samples // lines)
+        for i in range(self.samples):
+            line, step = divmod(i, per_line)
+            x = 0.1 + 0.8 * step / per_line
+            y = 0.05 + 0.9 * (line % lines + 0.5) / lines
+            ms = eval_js(tab, f"""(function() {{
+                const start = performance.now();
+                window.__dyslexim_handleGazeNow({x:.4f}, {y:.4f});
+                return performance.now() - start;
+            }})()""")
+            self.values.setdefault(f"_handleGaze.{size}", []).append(ms)
+
+    def measure_focus_mode(self, tab, size):
+        for state in ("on", "off"):
+            ms = eval_js(tab, f"""(function() {{
+                const start = performance.now();
+                window.__dyslexim_focusMode.set({'true' if state == 'on' else 'false'});
+                // Include the style recalc and layout the toggle causes
+                document.body.offsetHeight;
+                return performance.now() - start;
+            }})()""")
+            self.add(f"focus.{state}.{size}", ms)
+
+    def measure_settings_change(self, tab, size):
+        current = config_store.get("highlightColor")
+        color = "rgba(0, 160, 255, 0.35)" if current != "rgba(0, 160, 255, 0.35)" else "rgba(255, 200, 0, 0.35)"
+        start = time.perf_counter()
+        config_store.update({"highlightColor": color})
+        spin_until(lambda: eval_js(tab, "window.__dyslexim_config.highlightColor") == color, 30)
+        self.add(f"settings.apply.{size}", (time.perf_counter() - start) * 1000.0)
+
+    def results(self):
+        metrics = {}
+        for name, values in sorted(self.values.items()):
+            if name.startswith("_handleGaze."):
+                size = name.split(".", 1)[1]
+                ordered = sorted(values)
+                metrics[f"handleGaze.p50.{size}"] = {"value": round(percentile(ordered, 50), 4), "unit": "ms"}
+                metrics[f"handleGaze.p95.{size}"] = {"value": round(percentile(ordered, 95), 4), "unit": "ms"}
+                continue
+            # Median over the repeats
+            metrics[name] = {"value": round(statistics.median(values), 4), "unit": self.units[name]}
+        return {
+            "version": RESULTS_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": {
+                "python": platform.python_version(),
+                "qt": QT_VERSION_STR,
+                "pyqt": PYQT_VERSION_STR,
+                "platform": platform.platform(),
+                "sizes": self.sizes,
+                "repeat": self.repeat,
+                "samples": self.samples,
+            },
+            "metrics": metrics,
+        }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, noise_floor=DEFAULT_NOISE_FLOOR):
+    """
+    Returns (rows, regressions). Every metric is lower-is-better; one regresses
+    when it grew by more than `threshold` (a ratio) and by more than `noise_floor`.
+    """
+    rows, regressions = [], []
+    base_metrics = baseline.get("metrics", {})
+    for name, entry in sorted(current.get("metrics", {}).items()):
+        base = base_metrics.get(name)
+        if base is None:
+            rows.append((name, None, entry["value"], None, "new"))
+            continue
+        old, new = base["value"], entry["value"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and (new - old) > noise_floor
+        status = "REGRESSED" if regressed else ("improved" if change < -threshold else "ok")
+        rows.append((name, old, new, change, status))
+        if regressed:
+            regressions.append(name)
+    for name in sorted(set(base_metrics) - set(current.get("metrics", {}))):
+        rows.append((name, base_metrics[name]["value"], None, None, "missing"))
+    return rows, regressions
+
+
+def print_comparison(rows):
+    print(f"{'metric':<32} {'baseline':>12} {'current':>12} {'change':>8}  status")
+    for name, old, new, change, status in rows:
+        old_s = f"{old:.3f}" if old is not None else "-"
+        new_s = f"{new:.3f}" if new is not None else "-"
+        change_s = f"{change:+.1%}" if change is not None else ""
+        print(f"{name:<32} {old_s:>12} {new_s:>12} {change_s:>8}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated page sizes (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="page loads per size; medians are reported")
+    parser.add_argument("--samples", type=int, default=200, help="gaze samples per page load")
+    parser.add_argument("--out", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if a metric regressed against this results file")
+    parser.add_argument("--results", metavar="PATH", help="with --compare: compare this file instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed growth as a ratio (default: 0.10 = 10%%)")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR,
+                        help="ignore changes smaller than this, in the metric's unit")
+    args = parser.parse_args()
+
+    if args.results and not args.compare:
+        parser.error("--results only makes sense with --compare")
+
+    if args.results:
+        with open(args.results, "r", encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+        unknown = [s for s in sizes if s not in SIZES]
+        if unknown:
+            parser.error(f"unknown size(s) {', '.join(unknown)}; choose from {', '.join(SIZES)}")
+        results = BenchSuite(sizes, repeat=args.repeat, samples=args.samples).run()
+        print(json.dumps(results["metrics"], indent=2))
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(baseline, results, args.threshold, args.noise_floor)
+        print_comparison(rows)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# dyslexim/bench/synthetic.py
+"""
+Synthetic article pages of a given size for the benchmark suite.
+
+Pages are generated from a fixed seed, so a given node count always produces
+the same file; they are written to bench/fixtures/generated/ on first use
+instead of being checked in (the 100k-node page is several megabytes).
+"""
+import os
+import random
+
+GENERATED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "generated")
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+WORDS = (
+    "reading letters words line page text focus colour contrast spacing font gaze highlight "
+    "sentence paragraph mask voice learner comfort pattern shape sound rhythm clarity pause "
+    "attention detail story chapter margin column layout measure weight balance calm steady"
+).split()
+
+STYLE = """
+body { font-family: Georgia, serif; max-width: 760px; margin: 2em auto; line-height: 1.5; }
+h2 { border-bottom: 1px solid #ccc; }
+.note { color: #555; font-size: 0.9em; }
+.tag { background: #eef; padding: 0 2px; }
+aside { float: right; width: 30%; }
+"""
+
+
+def _sentence(rng, words):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def synthetic_page(node_count, seed=None):
+    """
+    Returns an article-like HTML page with about `node_count` elements:
+    sections of headings and paragraphs with inline links, emphasis and spans.
+    """
+    rng = random.Random(node_count if seed is None else seed)
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset=\"utf-8\">",
+        f"<title>Synthetic article ({node_count} nodes)</title>",
+        f"<style>{STYLE}</style>",
+        "<style>p:first-of-type { font-size: 1.1em; } a { color: #1d5fa8; }</style>",
+        "</head><body><article>",
+    ]
+    # html, head, meta, title, 2 x style, body, article
+    count = 8
+    section = 0
+    while count < node_count:
+        section += 1
+        parts.append(f"<section><h2>Section {section}</h2>")
+        count += 2
+        for _ in range(rng.randint(4, 8)):
+            if count >= node_count:
+                break
+            # <p> + <a> + <em> + two <span>s
+            parts.append(
+                f"<p>{_sentence(rng, 12)} <a href=\"#s{section}\">{rng.choice(WORDS)}</a> "
+                f"{_sentence(rng, 8)} <em>{rng.choice(WORDS)}</em> "
+                f"<span class=\"tag\">{rng.choice(WORDS)}</span> {_sentence(rng, 10)} "
+                f"<span class=\"note\">{_sentence(rng, 5)}</span></p>"
+            )
+            count += 5
+        if section % 5 == 0 and count < node_count:
+            parts.append(f"<aside><ul><li>{_sentence(rng, 4)}</li><li>{_sentence(rng, 4)}</li></ul></aside>")
+            count += 4
+        parts.append("</section>")
+    parts.append("</article></body></html>")
+    return "\n".join(parts)
+
+
+def ensure_fixture(size):
+    """Returns the path of the generated page for `size` ('1k', '10k' or '100k'), writing it if needed."""
+    node_count = SIZES[size]
+    os.makedirs(GENERATED_DIR, exist_ok=True)
+    path = os.path.join(GENERATED_DIR, f"synthetic-{size}.html")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(synthetic_page(node_count))
+    return path
@@ -0,0 +1,625 @@
+# dyslexim/core/adblock.py
+import glob
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from functools import lru_cache
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+from .metrics import metrics
+
+# Bump when the compiled format changes, so old caches are rebuilt
+ENGINE_VERSION = 1
+
+# Request types, as used in filter options ($script, $~image, ...)
+TYPE_NAMES = (
+    'document', 'subdocument', 'stylesheet', 'script', 'image', 'font', 'object', 'media',
+    'xmlhttprequest', 'ping', 'websocket', 'other', 'popup',
+)
+TYPE_BITS = {name: 1 << i for i, name in enumerate(TYPE_NAMES)}
+ALL_TYPES = (1 << len(TYPE_NAMES)) - 1
+# Without type options a filter never blocks the page itself or popups
+DEFAULT_TYPES = ALL_TYPES & ~TYPE_BITS['document'] & ~TYPE_BITS['popup']
+TYPE_ALIASES = {
+    'xhr': 'xmlhttprequest', 'frame': 'subdocument', 'css': 'stylesheet', 'doc': 'document',
+    'object-subrequest': 'object', 'background': 'image', 'beacon': 'ping',
+}
+
+FIRST_PARTY, THIRD_PARTY = 1, 2
+
+# Options that change nothing about whether a request is blocked. Any other
+# unknown option (redirect=, csp=, $elemhide exceptions, ...) drops the filter,
+# since applying it without the option would block or allow too much
+IGNORED_OPTIONS = {'collapse', '~collapse'}
+
+# Keywords shorter than this match too much to be worth indexing
+MIN_KEYWORD_LENGTH = 3
+# Filters per pickle in the compiled cache. Unpickling holds the GIL, so the
+# cache is read in pieces to keep the UI thread responsive while it loads
+CACHE_CHUNK = 2048
+
+_HOST_RE = re.compile(r'[a-z0-9-]+(?:\.[a-z0-9-]+)+')
+# Second-level labels under which sites register their names (example.co.uk)
+_PUBLIC_SECOND_LEVEL = {'co', 'com', 'net', 'org', 'gov', 'ac', 'edu', 'ne', 'or', 'go'}
+
+
+def base_domain(host):
+    """The registrable part of a host (news.bbc.co.uk -> bbc.co.uk); good enough to tell parties apart."""
+    labels = host.rstrip('.').split('.')
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _PUBLIC_SECOND_LEVEL:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def host_suffixes(host):
+    """news.example.com -> ['news.example.com', 'example.com', 'com']"""
+    suffixes = [host]
+    i = host.find('.')
+    while i >= 0:
+        suffixes.append(host[i + 1:])
+        i = host.find('.', i + 1)
+    return suffixes
+
+
+def pattern_to_regex(pattern):
+    """Translates an Adblock Plus pattern (without options) to a regex source."""
+    if len(pattern) > 1 and pattern.startswith('/') and pattern.endswith('/'):
+        return pattern[1:-1]
+    start = end = ''
+    if pattern.startswith('||'):
+        start = r'^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?'
+        pattern = pattern[2:]
+    elif pattern.startswith('|'):
+        start = '^'
+        pattern = pattern[1:]
+    if pattern.endswith('|'):
+        end = '$'
+        pattern = pattern[:-1]
+    # Unanchored ends are implied wildcards already
+    if not start:
+        pattern = pattern.lstrip('*')
+    if not end:
+        pattern = pattern.rstrip('*')
+    body = re.escape(pattern).replace(r'\*', '.*').replace(r'\^', r'(?:[^\w\-.%]|$)')
+    return start + body + end
+
+
+def regex_keyword(source):
+    """
+    The longest run of literal characters every match of regex `source` must
+    contain, or '' when that can't be told simply (alternations, groups).
+    Lets regex filters be found through the keyword automaton too.
+    """
+    if '|' in source:
+        return ''
+    best, run = '', ''
+    i = 0
+    while i < len(source):
+        ch = source[i]
+        literal = None
+        if ch == '\\' and i + 1 < len(source):
+            nxt = source[i + 1]
+            if not nxt.isalnum():
+                literal = nxt
+            i += 2
+        elif ch.isalnum() or ch in '/-_=&%:;,~@!"\'<>':
+            literal = ch
+            i += 1
+        elif ch in '([':
+            # Skip the group or class; what's inside may be optional or varied
+            close = ')' if ch == '(' else ']'
+            depth = 0
+            while i < len(source):
+                if source[i] == '\\':
+                    i += 2
+                    continue
+                if source[i] == ch:
+                    depth += 1
+                elif source[i] == close:
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+        else:
+            i += 1
+        quantifier = source[i] if i < len(source) else ''
+        if literal is not None and quantifier not in ('?', '*', '{'):
+            run += literal
+            if quantifier == '+':
+                # One or more of the same character: the run can't go on past it
+                best, run = max(best, run, key=len), ''
+                i += 1
+        else:
+            best, run = max(best, run, key=len), ''
+    return max(best, run, key=len)
+
+
+@lru_cache(maxsize=None)
+def _compile(source, match_case):
+    # Filters keep only their regex source; it's compiled the first time a URL
+    # gets as far as needing it, so loading the compiled lists stays cheap
+    try:
+        return re.compile(source, 0 if match_case else re.IGNORECASE)
+    except re.error:
+        return None
+
+
+class Filter:
+    """One network filter: what it matches and the options that narrow it down."""
+
+    __slots__ = ('text', 'regex', 'match_case', 'types', 'party', 'include', 'exclude', 'important')
+
+    def __init__(self, text, regex, match_case=False, types=DEFAULT_TYPES, party=0,
+                 include=frozenset(), exclude=frozenset(), important=False):
+        self.text = text
+        self.regex = regex          # None when the domain trie match is all there is to check
+        self.match_case = match_case
+        self.types = types
+        self.party = party
+        self.include = include
+        self.exclude = exclude
+        self.important = important
+
+    def matches(self, request):
+        if not self.types & request.type_bit:
+            return False
+        if self.party and self.party != request.party:
+            return False
+        if self.include or self.exclude:
+            suffixes = request.source_suffixes
+            if self.exclude and not self.exclude.isdisjoint(suffixes):
+                return False
+            if self.include and self.include.isdisjoint(suffixes):
+                return False
+        if self.regex is not None:
+            compiled = _compile(self.regex, self.match_case)
+            if compiled is None or compiled.search(request.url) is None:
+                return False
+        return True
+
+
+class Request:
+    """What filters are matched against: the URL, where it was requested from and its type."""
+
+    __slots__ = ('url', 'host', 'type_bit', 'party', 'source_suffixes')
+
+    def __init__(self, url, host, source_host, type_bit):
+        self.url = url
+        self.host = host
+        self.type_bit = type_bit
+        if source_host:
+            self.party = FIRST_PARTY if base_domain(host) == base_domain(source_host) else THIRD_PARTY
+            self.source_suffixes = host_suffixes(source_host)
+        else:
+            self.party = FIRST_PARTY
+            self.source_suffixes = []
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring search over bytes: every keyword occurring in a
+    URL is found in one pass over it, however many keywords there are.
+
+    Transitions live in one flat dict keyed by (state << 8 | byte) rather
+    than a dict per state, which keeps large automata small.
+    """
+
+    def __init__(self):
+        self.goto = {}
+        self.fail = [0]
+        self.out = [()]
+
+    def __len__(self):
+        return len(self.fail)
+
+    def add(self, keyword, value):
+        state = 0
+        for byte in keyword:
+            key = state << 8 | byte
+            child = self.goto.get(key)
+            if child is None:
+                child = self.goto[key] = len(self.fail)
+                self.fail.append(0)
+                self.out.append(())
+            state = child
+        self.out[state] += (value,)
+
+    def build(self):
+        """Computes the failure links; call once after the last add()."""
+        children = [[] for _ in self.fail]
+        for key, child in self.goto.items():
+            children[key >> 8].append((key & 0xff, child))
+        queue = [child for _, child in children[0]]
+        goto, fail, out = self.goto, self.fail, self.out
+        for state in queue:
+            for byte, child in children[state]:
+                f = fail[state]
+                while f and (f << 8 | byte) not in goto:
+                    f = fail[f]
+                fail[child] = goto.get(f << 8 | byte, 0)
+                if out[fail[child]]:
+                    out[child] += out[fail[child]]
+                queue.append(child)
+
+    def search(self, data):
+        """Returns the values of every keyword found in `data` (bytes)."""
+        goto, fail, out = self.goto, self.fail, self.out
+        found = []
+        state = 0
+        for byte in data:
+            child = goto.get(state << 8 | byte)
+            while child is None and state:
+                state = fail[state]
+                child = goto.get(state << 8 | byte)
+            state = child or 0
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+class RuleSet:
+    """
+    Filters indexed for matching: host-anchored filters (||example.com^) in a
+    trie of reversed domain labels, the rest by a literal keyword (for regex
+    filters, one every match must contain) in an Aho-Corasick automaton. The
+    few filters without a usable keyword are checked one by one.
+    """
+
+    def __init__(self):
+        self.filters = []
+        self.domains = {}
+        self.keywords = AhoCorasick()
+        self.generic = []
+
+    def __len__(self):
+        return len(self.filters)
+
+    def __getstate__(self):
+        # The filters themselves are cached separately, in chunks (see load_engine)
+        state = self.__dict__.copy()
+        state['filters'] = []
+        return state
+
+    def add(self, flt, host=None, keyword=None):
+        index = len(self.filters)
+        self.filters.append(flt)
+        if host is not None:
+            node = self.domains
+            for label in reversed(host.split('.')):
+                node = node.setdefault(label, {})
+            # '' can't be a host label, so it marks the filters ending here
+            node.setdefault('', []).append(index)
+        elif keyword is not None:
+            self.keywords.add(keyword.encode('ascii', 'ignore'), index)
+        else:
+            self.generic.append(index)
+
+    def build(self):
+        self.keywords.build()
+
+    def match(self, request, url_bytes):
+        filters = self.filters
+        node = self.domains
+        for label in reversed(request.host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            for index in node.get('', ()):
+                if filters[index].matches(request):
+                    return filters[index]
+        for index in self.keywords.search(url_bytes):
+            if filters[index].matches(request):
+                return filters[index]
+        for index in self.generic:
+            if filters[index].matches(request):
+                return filters[index]
+        return None
+
+
+def parse_filter(line):
+    """
+    Parses one filter list line into (is_exception, Filter, host, keyword).
+    Returns None for comments, cosmetic (element hiding) rules and filters
+    with options this engine doesn't support.
+    """
+    line = line.strip()
+    if not line or line[0] in '![' or '##' in line or '#@#' in line or '#?#' in line or '#$#' in line:
+        return None
+    exception = line.startswith('@@')
+    if exception:
+        line = line[2:]
+
+    pattern, options = line, ''
+    dollar = line.rfind('$')
+    # A '$' followed by a path is part of the pattern (/ads$/ is a regex)
+    if dollar > 0 and '/' not in line[dollar + 1:]:
+        pattern, options = line[:dollar], line[dollar + 1:]
+
+    match_case = important = False
+    party = 0
+    include, exclude = set(), set()
+    positive, negative = 0, 0
+    for option in filter(None, options.split(',')):
+        name, _, value = option.partition('=')
+        name = name.lower()
+        negated = name.startswith('~')
+        bare = name[1:] if negated else name
+        bare = TYPE_ALIASES.get(bare, bare)
+        if bare in TYPE_BITS:
+            if negated:
+                negative |= TYPE_BITS[bare]
+            else:
+                positive |= TYPE_BITS[bare]
+        elif name in ('third-party', '3p', '~first-party', '~1p'):
+            party = THIRD_PARTY
+        elif name in ('~third-party', '~3p', 'first-party', '1p'):
+            party = FIRST_PARTY
+        elif name == 'domain':
+            for domain in value.lower().split('|'):
+                if domain.startswith('~'):
+                    exclude.add(domain[1:])
+                elif domain:
+                    include.add(domain)
+        elif name == 'match-case':
+            match_case = True
+        elif name == 'important':
+            important = True
+        elif name in IGNORED_OPTIONS:
+            continue
+        else:
+            return None
+    types = (positive or DEFAULT_TYPES) & ~negative
+    # Popups aren't requests the interceptor sees
+    if not types & ~TYPE_BITS['popup']:
+        return None
+    if not match_case:
+        pattern = pattern.lower()
+
+    host = keyword = None
+    regex = pattern_to_regex(pattern)
+    if pattern.startswith('||'):
+        m = _HOST_RE.match(pattern, 2)
+        tail = pattern[m.end():] if m else None
+        if m and (not tail or tail[0] in '^/'):
+            host = m.group()
+            # ||example.com^ is decided by the trie alone
+            if tail in ('^', '^|'):
+                regex = None
+    if host is None:
+        if len(pattern) > 1 and pattern.startswith('/') and pattern.endswith('/'):
+            longest = regex_keyword(pattern[1:-1]).lower()
+        else:
+            longest = max(re.split(r'[*^|]', pattern.lower()), key=len)
+        if len(longest) >= MIN_KEYWORD_LENGTH:
+            keyword = longest
+
+    flt = Filter(line, regex, match_case, types, party, frozenset(include), frozenset(exclude), important)
+    return exception, flt, host, keyword
+
+
+class FilterEngine:
+    """
+    Block and exception filters compiled from EasyList-style lists.
+    check() returns the filter a request is blocked by, or None.
+    """
+
+    def __init__(self):
+        self.block = RuleSet()
+        self.allow = RuleSet()
+        self.skipped = 0
+        self._page_allowed = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_page_allowed'] = {}
+        return state
+
+    def add_lines(self, lines):
+        for line in lines:
+            parsed = parse_filter(line)
+            if parsed is None:
+                if line.strip() and not line.startswith(('!', '[')):
+                    self.skipped += 1
+                continue
+            exception, flt, host, keyword = parsed
+            (self.allow if exception else self.block).add(flt, host, keyword)
+
+    def build(self):
+        self.block.build()
+        self.allow.build()
+
+    def _page_is_allowed(self, source_url, source_host):
+        # @@||example.com^$document turns blocking off for a whole site
+        allowed = self._page_allowed.get(source_url)
+        if allowed is None:
+            request = Request(source_url.lower(), source_host, source_host, TYPE_BITS['document'])
+            allowed = self.allow.match(request, request.url.encode('ascii', 'ignore')) is not None
+            if len(self._page_allowed) > 256:
+                self._page_allowed.clear()
+            self._page_allowed[source_url] = allowed
+        return allowed
+
+    def check(self, url, host, source_url, source_host, type_name):
+        """`url` is the encoded (ASCII) request URL; `source_url` the page that made the request."""
+        request = Request(url, host.lower(), source_host.lower(), TYPE_BITS.get(type_name, TYPE_BITS['other']))
+        url_bytes = url.lower().encode('ascii', 'ignore')
+        blocked = self.block.match(request, url_bytes)
+        if blocked is None:
+            return None
+        if blocked.important:
+            return blocked
+        if source_url and self._page_is_allowed(source_url, source_host.lower()):
+            return None
+        if self.allow.match(request, url_bytes) is not None:
+            return None
+        return blocked
+
+
+def find_filter_lists(directories):
+    """Every *.txt filter list in `directories`, in a stable order."""
+    paths = []
+    for directory in directories:
+        paths.extend(sorted(glob.glob(os.path.join(directory, '*.txt'))))
+    return paths
+
+
+def _lists_key(paths):
+    digest = hashlib.sha1(str(ENGINE_VERSION).encode())
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8', 'replace'))
+    return digest.hexdigest()
+
+
+def load_engine(paths, cache_path):
+    """
+    Returns a FilterEngine for the filter lists at `paths`, from the compiled
+    cache when the lists haven't changed since it was written.
+    """
+    key = _lists_key(paths)
+    try:
+        with open(cache_path, 'rb') as f:
+            if pickle.load(f) == key:
+                engine = pickle.load(f)
+                for rules in (engine.block, engine.allow):
+                    while (chunk := pickle.load(f)) is not None:
+                        rules.filters.extend(chunk)
+                return engine
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+        pass
+
+    engine = FilterEngine()
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                engine.add_lines(f)
+        except OSError as e:
+            print(f"Could not read filter list {path}: {e}")
+    engine.build()
+
+    try:
+        tmp = cache_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for rules in (engine.block, engine.allow):
+                for i in range(0, len(rules.filters), CACHE_CHUNK):
+                    pickle.dump(rules.filters[i:i + CACHE_CHUNK], f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(None, f)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"Could not cache compiled filter lists at {cache_path}: {e}")
+    return engine
+
+
+_RT = QWebEngineUrlRequestInfo.ResourceType
+RESOURCE_TYPES = {
+    _RT.ResourceTypeMainFrame: 'document',
+    _RT.ResourceTypeNavigationPreloadMainFrame: 'document',
+    _RT.ResourceTypeSubFrame: 'subdocument',
+    _RT.ResourceTypeNavigationPreloadSubFrame: 'subdocument',
+    _RT.ResourceTypeStylesheet: 'stylesheet',
+    _RT.ResourceTypeScript: 'script',
+    _RT.ResourceTypeWorker: 'script',
+    _RT.ResourceTypeSharedWorker: 'script',
+    _RT.ResourceTypeServiceWorker: 'script',
+    _RT.ResourceTypeImage: 'image',
+    _RT.ResourceTypeFavicon: 'image',
+    _RT.ResourceTypeFontResource: 'font',
+    _RT.ResourceTypeObject: 'object',
+    _RT.ResourceTypePluginResource: 'object',
+    _RT.ResourceTypeMedia: 'media',
+    _RT.ResourceTypeXhr: 'xmlhttprequest',
+    _RT.ResourceTypeJson: 'xmlhttprequest',
+    _RT.ResourceTypePing: 'ping',
+    _RT.ResourceTypeCspReport: 'ping',
+    _RT.ResourceTypeWebSocket: 'websocket',
+}
+BLOCKABLE_SCHEMES = ('http', 'https', 'ws', 'wss')
+
+
+class ContentBlocker(QObject):
+    """
+    Ad and tracker blocking for every tab. The filter lists are compiled (or
+    loaded from the compiled cache) on a worker thread at startup; until
+    then requests go through. Each tab's page gets its own interceptor from
+    `interceptor_for()`, which counts what it blocked for that tab.
+    """
+
+    loaded = pyqtSignal()
+    _engineLoaded = pyqtSignal(object)
+
+    def __init__(self, list_paths, cache_path, enabled=True, parent=None):
+        super().__init__(parent)
+        self.enabled = enabled
+        self.engine = None
+        self._engineLoaded.connect(self._on_engine_loaded)
+        threading.Thread(
+            target=self._load, args=(list_paths, cache_path), name='dyslexim-adblock', daemon=True,
+        ).start()
+
+    def _load(self, list_paths, cache_path):
+        start = time.perf_counter()
+        engine = load_engine(list_paths, cache_path)
+        print(f"Content blocking: {len(engine.block)} filters, {len(engine.allow)} exceptions "
+              f"from {len(list_paths)} list(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        self._engineLoaded.emit(engine)
+
+    def _on_engine_loaded(self, engine):
+        self.engine = engine
+        self.loaded.emit()
+
+    def interceptor_for(self, parent):
+        return TabRequestInterceptor(self, parent)
+
+
+class TabRequestInterceptor(QWebEngineUrlRequestInterceptor):
+    """
+    A tab page's request interceptor (called on the UI thread). `blocked`
+    counts requests blocked since the tab's last page load.
+    """
+
+    def __init__(self, blocker, parent=None):
+        super().__init__(parent)
+        self.blocker = blocker
+        self.blocked = 0
+
+    def interceptRequest(self, info):
+        type_name = RESOURCE_TYPES.get(info.resourceType(), 'other')
+        if type_name == 'document':
+            # Pages the user navigates to are never blocked; a new page starts a new count
+            self.blocked = 0
+            return
+        engine = self.blocker.engine
+        if engine is None or not self.blocker.enabled:
+            return
+        url = info.requestUrl()
+        if url.scheme() not in BLOCKABLE_SCHEMES:
+            return
+
+        start = time.perf_counter() if metrics.enabled else None
+        first_party = info.firstPartyUrl()
+        try:
+            blocked = engine.check(
+                bytes(url.toEncoded()).decode('ascii', 'replace'), url.host(),
+                first_party.toString(), first_party.host(), type_name,
+            )
+        except Exception as e:
+            print(f"Content blocking failed for {url.toString()}: {e}")
+            return
+        if blocked is not None:
+            info.block(True)
+            self.blocked += 1
+        if start is not None:
+            metrics.record_ms('adblock.decision', (time.perf_counter() - start) * 1000.0)
+            if blocked is not None:
+                metrics.count('adblock.blocked')
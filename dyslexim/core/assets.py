@@ -0,0 +1,93 @@
+# dyslexim/core/assets.py
+import hashlib
+import os
+
+from PyQt6.QtCore import QFile, QIODevice, QResource, QByteArray, Qt
+from PyQt6.QtGui import QGuiApplication, QIcon, QImage, QPainter, QPixmap
+
+from .config import get_asset_path, get_user_data_dir
+
+# Built by tools/build_resources.py from resources.qrc
+RESOURCE_BUNDLE = get_asset_path('resources.rcc')
+# Icons are drawn in this colour for the dark theme (the SVGs use stroke="white")
+ICON_COLOR = "#c9d1d9"
+ICON_LOGICAL_SIZE = 24
+
+_registered = None
+
+
+def register_resources():
+    """Registers the compiled resource bundle once. Returns False if it hasn't been built."""
+    global _registered
+    if _registered is None:
+        _registered = os.path.exists(RESOURCE_BUNDLE) and QResource.registerResource(RESOURCE_BUNDLE)
+        if not _registered:
+            print("resources.rcc not found; loading icons and theme from resources/ "
+                  "(run tools/build_resources.py to build it)")
+    return _registered
+
+
+def read_resource(name):
+    """Returns the bytes of `name` from the resource bundle, or from resources/ when it isn't built."""
+    if register_resources():
+        f = QFile(f":/{name}")
+        if f.open(QIODevice.OpenModeFlag.ReadOnly):
+            try:
+                return bytes(f.readAll())
+            finally:
+                f.close()
+    try:
+        with open(get_asset_path(os.path.join('resources', name)), 'rb') as f:
+            return f.read()
+    except OSError as e:
+        print(f"Missing resource {name}: {e}")
+        return b''
+
+
+def load_theme_qss():
+    return read_resource('theme.qss').decode('utf-8')
+
+
+def _device_pixel_ratios():
+    ratios = {1.0, 2.0}
+    for screen in QGuiApplication.screens():
+        ratios.add(round(screen.devicePixelRatio(), 2))
+    return sorted(ratios)
+
+
+def _render_svg(svg_bytes, size_px):
+    # Imported here so a warm start never loads the SVG module at all
+    from PyQt6.QtSvg import QSvgRenderer
+    image = QImage(size_px, size_px, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    renderer = QSvgRenderer(QByteArray(svg_bytes))
+    painter = QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    return image
+
+
+def load_icon(name, color=ICON_COLOR, logical_size=ICON_LOGICAL_SIZE):
+    """
+    Returns a QIcon for resources/icons/<name>.svg with a pixmap for every
+    device-pixel-ratio in use. Each pixmap is rasterized once and cached as a
+    PNG named after a hash of the SVG, colour, size and ratio; later launches
+    just load the PNGs, with no SVG parsing.
+    """
+    svg = read_resource(f"icons/{name}.svg").replace(b'stroke="white"', f'stroke="{color}"'.encode('ascii'))
+    digest = hashlib.sha1(svg).hexdigest()[:16]
+    cache_dir = get_user_data_dir('cache', 'icons')
+
+    icon = QIcon()
+    for dpr in _device_pixel_ratios():
+        size_px = int(round(logical_size * dpr))
+        path = os.path.join(cache_dir, f"{name}-{digest}-{size_px}.png")
+        pixmap = QPixmap(path) if os.path.exists(path) else QPixmap()
+        if pixmap.isNull():
+            image = _render_svg(svg, size_px)
+            if not image.save(path, 'PNG'):
+                print(f"Could not cache icon {path}")
+            pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        icon.addPixmap(pixmap)
+    return icon
@@ -1,7 +1,42 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-from PyQt6.QtCore import QUrl, pyqtSlot
+from PyQt6.QtWebEngineCore import QWebEnginePage
+import uuid
+
+from PyQt6.QtCore import QUrl, QPointF, pyqtSlot, pyqtSignal
+
+from .gaze_stream import GazeStream
+from .metrics import metrics
+from .scripts import GAZE_WORLD_ID, script_world_for_url
+
+
+class DysleximPage(QWebEnginePage):
+    """
+    A page that keeps its web channel in the same JS world as the gaze handler.
+
+    Web pages run the handler in an isolated world; Dyslexim's own pages run it
+    in the main world next to their settings code. The world is switched before
+    each main-frame navigation commits.
+    """
+
+    def __init__(self, profile, parent=None):
+        super().__init__(profile, parent)
+        self.script_world = GAZE_WORLD_ID
+        self._channel = None
+
+    def set_channel(self, channel):
+        self._channel = channel
+        self.setWebChannel(channel, self.script_world)
+
+    def acceptNavigationRequest(self, url, nav_type, is_main_frame):
+        if is_main_frame:
+            world = script_world_for_url(url.toString())
+            if world != self.script_world:
+                self.script_world = world
+                if self._channel:
+                    self.setWebChannel(self._channel, world)
+        return super().acceptNavigationRequest(url, nav_type, is_main_frame)
+
 
 class BrowserView(QWebEngineView):
     """A custom QWebEngineView with the leaveEvent fix."""
@@ -13,41 +48,112 @@ class BrowserView(QWebEngineView):
     def leaveEvent(self, event):
         """Fires when the mouse leaves the web view area."""
         js = "(function(){ if(window.__dyslexim_clearHighlight) window.__dyslexim_clearHighlight(); })();"
-        self.page().runJavaScript(js)
+        self.page().runJavaScript(js, self.page().script_world)
         super().leaveEvent(event)
 
 class BrowserTab(QWidget):
-    """A single tab widget, containing a web view and its state."""
+    """
+    A single tab widget, containing a web view and its state.
+
+    A lazy tab is a placeholder: it only keeps its URL and title until
+    `materialize()` is called (when the tab is first shown), which builds the
+    BrowserView and starts loading.
+    """
+
+    # Emitted right after the view and page exist, before the first load starts
+    materialized = pyqtSignal(object)
     
-    def __init__(self, start_url, *args, **kwargs):
+    def __init__(self, start_url, profile_manager, *args, lazy=False, latency_reporting=False, session_id=None, **kwargs):
         super().__init__(*args, **kwargs)
         
-        layout = QVBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
+        self._layout = QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
         
         # --- State is stored here, on the tab ---
         self.gaze_enabled = True
         self.focus_mode_enabled = False
+        # Source URL while the tab shows (or is preparing) its reader view
+        self.reader_url = None
+        self.reader_view_url = None
+        self.reader_pending_url = None
+        self.start_url = start_url
+        self.profile_manager = profile_manager
+        # Identifies the tab's row in the session store
+        self.session_id = session_id or uuid.uuid4().hex
+        # Applied when the view is built; scroll is restored once the page has loaded
+        self.zoom_factor = 1.0
+        self.saved_scroll = None
+
+        # Gaze samples reach the page through this object on the tab's QWebChannel
+        self.gaze_stream = GazeStream(self, latency_reporting=latency_reporting)
         
+        self.view = None
+        self.page = None
+        self.profile = None
+        # Set by the window when the page is built; counts the requests it blocked
+        self.request_interceptor = None
+        # Set by the window when the page is built; the page's text analysis channel object
+        self.analysis_stream = None
+
+        if not lazy:
+            self.materialize()
+
+    def is_materialized(self):
+        return self.view is not None
+
+    def url_string(self):
+        """The tab's current URL, or the URL it will load once materialized."""
+        return self.view.url().toString() if self.view else self.start_url
+
+    def run_js(self, js, callback=None):
+        """Runs `js` in the world the gaze handler lives in for the current page."""
+        if metrics.enabled:
+            callback = metrics.timed_callback('python.runJavaScript', callback)
+        if callback is None:
+            self.page.runJavaScript(js, self.page.script_world)
+        else:
+            self.page.runJavaScript(js, self.page.script_world, callback)
+
+    def materialize(self):
+        """Builds the web view and starts loading the tab's URL (no-op if already done)."""
+        if self.view is not None:
+            return
+
         self.view = BrowserView()
         
-        # Use an off-the-record profile for privacy, like Incognito
-        # Use QWebEngineProfile.defaultProfile() for persistence
-        self.profile = QWebEngineProfile(f"profile_{id(self)}", self)
-        self.page = QWebEnginePage(self.profile, self)
+        # The profile (shared persistent, shared private or per-tab) comes from the manager
+        self.page = self.profile_manager.create_page(self, page_class=DysleximPage)
+        self.profile = self.page.profile()
         self.view.setPage(self.page)
+        if self.zoom_factor != 1.0:
+            self.page.setZoomFactor(self.zoom_factor)
         
-        layout.addWidget(self.view)
-        self.setLayout(layout)
-        
-        self.view.setUrl(QUrl(start_url))
+        self._layout.addWidget(self.view)
+
+        self.materialized.emit(self)
+        self.restore_scroll_on_load()
+        self.view.setUrl(QUrl(self.start_url))
+
+    def restore_scroll_on_load(self):
+        """Scrolls back to `saved_scroll` once the next load finishes (used after a discard or restore)."""
+        scroll = self.saved_scroll
+        if not scroll or scroll == QPointF(0, 0):
+            return
+
+        def on_loaded(ok):
+            self.view.loadFinished.disconnect(on_loaded)
+            if ok:
+                self.page.runJavaScript(f"window.scrollTo({scroll.x():.0f}, {scroll.y():.0f});")
+            self.saved_scroll = None
+
+        self.view.loadFinished.connect(on_loaded)
     
     def __del__(self):
         """Cleanup when tab is deleted."""
         try:
+            # The profile is owned by the ProfileManager (or by the page itself in isolated mode)
             if hasattr(self, 'page') and self.page:
                 self.page.deleteLater()
-            if hasattr(self, 'profile') and self.profile:
-                self.profile.deleteLater()
         except:
             pass
\ No newline at end of file
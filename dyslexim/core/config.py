@@ -1,8 +1,9 @@
 # dyslexim/core/config.py
-import json
 import os
 import sys
 
+from .config_store import ConfigStore
+
 def get_asset_path(relative_path):
     """ Get absolute path to asset, works for dev and for PyInstaller """
     try:
@@ -13,8 +14,36 @@ def get_asset_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
-# Path to the config file
-CONFIG_PATH = get_asset_path('config.json')
+def get_user_data_dir(*parts):
+    """ Get a per-user writable directory for Dyslexim data (profiles, caches, ...) """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA') or os.path.expanduser('~')
+        root = os.path.join(base, 'Dyslexim')
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser('~/Library/Application Support/Dyslexim')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        root = os.path.join(base, 'dyslexim')
+
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_user_config_dir():
+    """ Get the per-user directory Dyslexim keeps its settings in """
+    if sys.platform == 'win32':
+        root = os.path.join(os.environ.get('APPDATA') or os.path.expanduser('~'), 'Dyslexim')
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser('~/Library/Application Support/Dyslexim')
+    else:
+        root = os.path.join(os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config'), 'dyslexim')
+    os.makedirs(root, exist_ok=True)
+    return root
+
+# Path to the config file; the copy bundled next to the code (read-only when
+# frozen) only seeds it on first run
+CONFIG_PATH = os.path.join(get_user_config_dir(), 'config.json')
+BUNDLED_CONFIG_PATH = get_asset_path('config.json')
 
 # Default values
 DEFAULT_HIGHLIGHT_COLOR = "rgba(255, 200, 0, 0.35)"
@@ -22,6 +51,42 @@ DEFAULT_FONT = "Poppins"
 DEFAULT_HIGHLIGHT_ALIGNMENT = "center"
 DEFAULT_READING_MASK = True
 DEFAULT_TTS_HOVER_TIME = 1.0
+DEFAULT_GAZE_MOVE_THRESHOLD = 0.004
+# 'shared' (persistent, on-disk cache), 'private' (shared off-the-record) or 'isolated' (one profile per tab)
+DEFAULT_PROFILE_MODE = "shared"
+PROFILE_MODES = ("shared", "private", "isolated")
+DEFAULT_HTTP_CACHE_SIZE_MB = 256
+# Background tabs are discarded (least recently used first) while renderers use more than this
+DEFAULT_TAB_MEMORY_BUDGET_MB = 1024
+# Reopen the last session's tabs on launch (never saved in 'private' profile mode)
+DEFAULT_RESTORE_SESSION = True
+# Block ads and trackers with the filter lists in assets/filters and the user's filters folder
+DEFAULT_CONTENT_BLOCKING = True
+# 'point' (elementFromPoint per sample) or 'indexed' (spatial index of text blocks, with snapping)
+DEFAULT_HIT_TEST_MODE = "point"
+HIT_TEST_MODES = ("point", "indexed")
+# In indexed mode, gaze landing this close to a text block (gutters, between lines) snaps to it
+DEFAULT_SNAP_TOLERANCE_PX = 24
+# Reading mask: 'blur' (backdrop blur), 'panels' (four transform-moved panels, no blur)
+# or 'auto' (blur, falling back to panels when frames miss their budget)
+DEFAULT_MASK_RENDERER = "auto"
+MASK_RENDERERS = ("blur", "panels", "auto")
+# 'typography' (spacing/font/alignment on the gazed element, reflows it) or
+# 'stable' (outline, background and CSS highlights only; no layout changes)
+DEFAULT_HIGHLIGHT_MODE = "typography"
+HIGHLIGHT_MODES = ("typography", "stable")
+# Give every readable block on the page the user's font and spacing (as it comes into view),
+# optionally with the start of each word in bold
+DEFAULT_PAGE_TYPOGRAPHY = False
+DEFAULT_WORD_STEM_EMPHASIS = False
+# Readability, syllables and rare words for the paragraphs on screen, worked out in
+# background processes; rare words are underlined and show their syllables on hover
+DEFAULT_TEXT_ANALYSIS = False
+# 'auto' (offline engine such as espeak-ng when installed, else the page's speechSynthesis) or 'browser'
+DEFAULT_TTS_ENGINE = "auto"
+TTS_ENGINES = ("auto", "browser")
+DEFAULT_TTS_VOICE = "en"
+DEFAULT_TTS_RATE = 175  # words per minute
 POST_ONBOARDING_URL = "https://www.google.com"
 DEFAULT_SEARCH_ENGINE = "Google"
 SEARCH_ENGINES = {
@@ -33,62 +98,104 @@ SEARCH_ENGINES = {
 }
 
 
+# Every setting and its default, in one place. Settings missing from the
+# user's file get these values.
+CONFIG_DEFAULTS = {
+    'highlightColor': DEFAULT_HIGHLIGHT_COLOR,
+    'onboarding_complete': False,
+    'font': DEFAULT_FONT,
+    'highlightAlignment': DEFAULT_HIGHLIGHT_ALIGNMENT,
+    'readingMask': DEFAULT_READING_MASK,
+    'ttsHoverTime': DEFAULT_TTS_HOVER_TIME,
+    'searchEngine': DEFAULT_SEARCH_ENGINE,
+    'gazeMoveThreshold': DEFAULT_GAZE_MOVE_THRESHOLD,
+    'profileMode': DEFAULT_PROFILE_MODE,
+    'httpCacheSizeMb': DEFAULT_HTTP_CACHE_SIZE_MB,
+    'tabMemoryBudgetMb': DEFAULT_TAB_MEMORY_BUDGET_MB,
+    'restoreSession': DEFAULT_RESTORE_SESSION,
+    'contentBlocking': DEFAULT_CONTENT_BLOCKING,
+    'hitTestMode': DEFAULT_HIT_TEST_MODE,
+    'snapTolerancePx': DEFAULT_SNAP_TOLERANCE_PX,
+    'maskRenderer': DEFAULT_MASK_RENDERER,
+    'highlightMode': DEFAULT_HIGHLIGHT_MODE,
+    'pageTypography': DEFAULT_PAGE_TYPOGRAPHY,
+    'wordStemEmphasis': DEFAULT_WORD_STEM_EMPHASIS,
+    'textAnalysis': DEFAULT_TEXT_ANALYSIS,
+    'ttsEngine': DEFAULT_TTS_ENGINE,
+    'ttsVoice': DEFAULT_TTS_VOICE,
+    'ttsRate': DEFAULT_TTS_RATE,
+}
+
+# The settings themselves: an in-memory dict kept by the store and saved in the background
+config_store = ConfigStore(CONFIG_PATH, CONFIG_DEFAULTS, seed_path=BUNDLED_CONFIG_PATH)
+config = config_store.data
+
+
 def load_config():
-    """Loads the configuration from config.json, updating the global config object."""
-    global config
-    if not os.path.exists(CONFIG_PATH):
-        new_config = {
-            'highlightColor': DEFAULT_HIGHLIGHT_COLOR,
-            'onboarding_complete': False,
-            'font': DEFAULT_FONT,
-            'highlightAlignment': DEFAULT_HIGHLIGHT_ALIGNMENT,
-            'readingMask': DEFAULT_READING_MASK,
-            'ttsHoverTime': DEFAULT_TTS_HOVER_TIME,
-            'searchEngine': DEFAULT_SEARCH_ENGINE
-        }
-    else:
-        try:
-            with open(CONFIG_PATH, 'r') as f:
-                new_config = json.load(f)
-                if 'readingMask' not in new_config:
-                    new_config['readingMask'] = DEFAULT_READING_MASK
-                if 'ttsHoverTime' not in new_config:
-                    new_config['ttsHoverTime'] = DEFAULT_TTS_HOVER_TIME
-                if 'searchEngine' not in new_config:
-                    new_config['searchEngine'] = DEFAULT_SEARCH_ENGINE
-        except (json.JSONDecodeError, IOError):
-            new_config = {
-                'highlightColor': DEFAULT_HIGHLIGHT_COLOR,
-                'onboarding_complete': False,
-                'font': DEFAULT_FONT,
-                'highlightAlignment': DEFAULT_HIGHLIGHT_ALIGNMENT,
-                'readingMask': DEFAULT_READING_MASK,
-                'ttsHoverTime': DEFAULT_TTS_HOVER_TIME,
-                'searchEngine': DEFAULT_SEARCH_ENGINE
-            }
-    
-    config.clear()
-    config.update(new_config)
-    return config
+    """Re-reads the settings file into the global config object."""
+    return config_store.reload()
 
 def save_config(config_data):
-    """Saves the configuration to config.json."""
-    try:
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(config_data, f, indent=2)
-    except IOError:
-        pass
+    """Applies `config_data` to the settings; they are written to disk in the background."""
+    config_store.update(config_data)
+
+
+# Dyslexim's own pages are served from memory by the dyslexim:// scheme (core/scheme.py)
+APP_URL = "dyslexim://app/"
+HOME_URL = APP_URL + "home.html"
+SETTINGS_URL = APP_URL + "settings.html"
+# @font-face rules for BUNDLED_FONT_FAMILIES; pages link it when the user picks one
+FONTS_CSS_URL = APP_URL + "fonts.css"
+
+# Dyslexim's own pages; they open their QWebChannel in the page's main world
+LOCAL_PAGE_PREFIXES = (APP_URL,)
+
+# Fonts shipped in assets/fonts: family -> (file stem, weight, style) faces
+BUNDLED_FONT_FAMILIES = {
+    'OpenDyslexic': [
+        ('OpenDyslexic-Regular', 'normal', 'normal'),
+        ('OpenDyslexic-Bold', 'bold', 'normal'),
+        ('OpenDyslexic-Italic', 'normal', 'italic'),
+        ('OpenDyslexic-Bold-Italic', 'bold', 'italic'),
+    ],
+}
+
+# The page handles at most one gaze sample per GAZE_THROTTLE_MS (the latest one wins)
+GAZE_THROTTLE_MS = 50
+# Frequency of gaze updates in milliseconds while the gaze is moving. Sending faster
+# than the page's throttle only costs IPC for samples the page would drop.
+GAZE_UPDATE_INTERVAL_MS = GAZE_THROTTLE_MS
+
+# Slower polling rate used once the gaze has been still for GAZE_IDLE_AFTER_MS
+GAZE_IDLE_INTERVAL_MS = 250
+GAZE_IDLE_AFTER_MS = 600
+
+# Background tabs idle for this long are frozen; lifecycle policy runs every TAB_LIFECYCLE_CHECK_MS
+TAB_FREEZE_AFTER_S = 300
+TAB_LIFECYCLE_CHECK_MS = 30000
+
+# Number of samples buffered between dispatch ticks for threaded gaze sources (eye trackers)
+GAZE_RING_BUFFER_SIZE = 512
+
+# Session: tab changes are batched and written to the session database after this much quiet
+SESSION_WRITE_DELAY_S = 1.0
 
-# Initial config load
-config = {}
-load_config()
+# History: visits are written after this much quiet; frecency halves every HISTORY_HALF_LIFE_DAYS
+HISTORY_WRITE_DELAY_S = 2.0
+HISTORY_HALF_LIFE_DAYS = 14
+# Address bar suggestions shown at once
+HISTORY_SUGGESTIONS = 8
 
-# URL to load in the initial tab
-HOME_URL = "file:///" + get_asset_path('home.html').replace('\\', '/')
-SETTINGS_URL = "file:///" + get_asset_path('settings.html').replace('\\', '/')
+# Offline TTS: synthesized sentences kept in memory / on disk, and sentences synthesized ahead of playback
+TTS_MEMORY_CACHE_ITEMS = 64
+TTS_DISK_CACHE_MB = 64
+TTS_PREFETCH_CHUNKS = 1
 
-# Small delay in milliseconds before injecting the gaze handler after a page load
-INJECT_DELAY_MS = 220
+# Reader view extraction results kept in memory (keyed by URL and page content hash)
+READER_CACHE_ITEMS = 32
 
-# Frequency of gaze updates in milliseconds (e.g., 100ms = 10Hz)
-GAZE_UPDATE_INTERVAL_MS = 100
+# Text analysis: paragraphs per worker task, worker processes, and results kept in
+# memory (keyed by paragraph content hash)
+TEXT_ANALYSIS_CHUNK = 8
+TEXT_ANALYSIS_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+TEXT_ANALYSIS_CACHE_ITEMS = 4096
@@ -0,0 +1,154 @@
+# dyslexim/core/config_store.py
+import atexit
+import json
+import os
+import threading
+
+from .debounced_writer import DebouncedWriter
+
+
+class ConfigStore:
+    """
+    In-memory source of truth for the user's settings, persisted in the background.
+
+    `data` is a plain dict (core.config exposes it as `config`) that always
+    holds every key of `defaults`. Changes go through update(), which notifies
+    subscribers right away and schedules a write; writes are debounced by
+    `write_delay_s` and done on a writer thread as write-temp, fsync, rename,
+    so the file is never half-written and the GUI thread never waits on
+    disk. A failed write is retried. flush() (also run at exit) writes any
+    pending change immediately.
+    """
+
+    def __init__(self, path, defaults, seed_path=None, write_delay_s=0.5):
+        self.path = path
+        self.defaults = dict(defaults)
+        self.seed_path = seed_path
+        self.write_delay_s = write_delay_s
+        self.data = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._writer = DebouncedWriter(self._lock, lambda: self._dirty, self.flush, write_delay_s, 'dyslexim-config')
+        self._io_lock = threading.Lock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        self.reload()
+        atexit.register(self.flush)
+
+    # --- Reading ---
+    def _read_file(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            return loaded if isinstance(loaded, dict) else None
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError) as e:
+            print(f"Could not read settings from {path}: {e}")
+            return None
+
+    def reload(self):
+        """Re-reads the settings file (first run: the bundled seed file), filling in defaults."""
+        loaded = self._read_file(self.path)
+        if loaded is None and self.seed_path:
+            loaded = self._read_file(self.seed_path)
+        merged = dict(self.defaults)
+        merged.update(loaded or {})
+        with self._lock:
+            self.data.clear()
+            self.data.update(merged)
+        return self.data
+
+    def get(self, key, default=None):
+        return self.data.get(key, self.defaults.get(key, default))
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.data)
+
+    # --- Changing ---
+    def update(self, changes=None, **kwargs):
+        """
+        Applies `changes`, notifies subscribers of the keys whose values actually
+        changed, and schedules a write. Returns the changed keys and values.
+        """
+        changes = dict(changes or {}, **kwargs)
+        with self._lock:
+            changed = {k: v for k, v in changes.items() if self.data.get(k) != v}
+            self.data.update(changed)
+        if not changed:
+            return changed
+        self._schedule_write()
+        for callback, keys in list(self._subscribers):
+            if keys is None or not keys.isdisjoint(changed):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"Settings subscriber failed: {e}")
+        return changed
+
+    def subscribe(self, callback, keys=None):
+        """
+        Calls `callback(changed)` after every update that changes one of `keys`
+        (any key if None). Returns a function that unsubscribes.
+        """
+        entry = (callback, frozenset(keys) if keys is not None else None)
+        self._subscribers.append(entry)
+
+        def unsubscribe():
+            try:
+                self._subscribers.remove(entry)
+            except ValueError:
+                pass
+        return unsubscribe
+
+    # --- Writing ---
+    def _schedule_write(self):
+        with self._lock:
+            self._dirty = True
+            self._writer.schedule()
+
+    def _take_snapshot(self):
+        # Called with the lock held
+        self._dirty = False
+        self._snapshot_seq += 1
+        return self._snapshot_seq, dict(self.data)
+
+    def _write(self, seq, data):
+        # The GUI thread never waits on the disk: only writers share this lock
+        with self._io_lock:
+            if seq <= self._written_seq:
+                return  # a newer snapshot is already on disk
+            directory = os.path.dirname(self.path)
+            tmp = self.path + '.tmp'
+            try:
+                os.makedirs(directory, exist_ok=True)
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                if hasattr(os, 'O_DIRECTORY'):
+                    # Make the rename itself durable
+                    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                self._written_seq = seq
+            except OSError as e:
+                print(f"Could not save settings to {self.path}: {e}")
+                with self._lock:
+                    # Retry later, unless a newer snapshot is already on its way
+                    if seq == self._snapshot_seq:
+                        self._dirty = True
+                        self._writer.schedule()
+
+    def flush(self):
+        """Writes pending changes now (called on exit)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = self._take_snapshot()
+        self._write(*snapshot)
@@ -0,0 +1,50 @@
+# dyslexim/core/debounced_writer.py
+import threading
+import time
+
+
+class DebouncedWriter:
+    """
+    Background writer shared by the settings, session and history stores.
+
+    schedule() (called with the store's `lock` held, right after queuing a
+    change) pushes the deadline back by `delay_s` and makes sure a writer
+    thread is running. The thread calls `write()` once the deadline passes
+    with nothing new queued, and exits when `has_pending()` (checked with the
+    lock held) says there is nothing left.
+    """
+
+    def __init__(self, lock, has_pending, write, delay_s, name):
+        self.delay_s = delay_s
+        self.name = name
+        self._lock = lock
+        self._wake = threading.Condition(lock)
+        self._has_pending = has_pending
+        self._write = write
+        self._deadline = 0.0
+        self._thread = None
+
+    def schedule(self):
+        # Called with the lock held
+        self._deadline = time.monotonic() + self.delay_s
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._wake.notify()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._has_pending():
+                    # Cleared under the lock, so a change queued after this starts a new thread
+                    self._thread = None
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._wake.wait(remaining)
+                    continue
+            try:
+                self._write()
+            except Exception as e:
+                # Keep the thread alive so later changes still get written
+                print(f"{self.name}: write failed: {e}")
@@ -0,0 +1,119 @@
+# dyslexim/core/gaze_dispatcher.py
+import math
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+class GazeDispatcher(QObject):
+    """
+    Drives gaze sampling with an adaptive timer.
+
+    The dispatcher calls `sample_fn` on every tick. The callback reads the
+    current gaze position and hands it back through `submit()`, which decides
+    whether the sample moved far enough from the last one sent to be worth
+    delivering to the page. While the gaze is moving the timer runs at the
+    active interval; once it has been still for `idle_after_ms` it falls back
+    to the idle interval. Pausing (window inactive, minimized or hidden) stops
+    the timer entirely.
+    """
+
+    def __init__(self, sample_fn, threshold, active_interval_ms, idle_interval_ms,
+                 idle_after_ms, parent=None):
+        super().__init__(parent)
+        self.sample_fn = sample_fn
+        self.threshold = threshold
+        self.active_interval_ms = active_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.idle_after_ms = idle_after_ms
+
+        self.sent = 0
+        self.skipped = 0
+
+        self._last_target = None
+        self._last_x = None
+        self._last_y = None
+        self._last_move = 0.0
+        self._pause_reasons = set()
+        self._started = False
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_tick)
+
+    # --- Lifecycle ---
+    def start(self):
+        """Starts sampling at the active rate unless the dispatcher is paused."""
+        self._started = True
+        self._last_move = time.monotonic()
+        if not self._pause_reasons:
+            self._timer.start(self.active_interval_ms)
+
+    def stop(self):
+        self._started = False
+        self._timer.stop()
+
+    def set_paused(self, reason, paused):
+        """
+        Pauses or resumes sampling for a named reason ('inactive', 'minimized', ...).
+        The timer only runs again once every reason has been cleared.
+        """
+        if paused:
+            self._pause_reasons.add(reason)
+            self._timer.stop()
+        else:
+            self._pause_reasons.discard(reason)
+            if self._started and not self._pause_reasons and not self._timer.isActive():
+                self.reset()
+                self.start()
+
+    def is_paused(self):
+        return bool(self._pause_reasons)
+
+    def reset(self):
+        """Forgets the last sent sample so the next one is always delivered."""
+        self._last_target = None
+        self._last_x = None
+        self._last_y = None
+
+    # --- Sampling ---
+    def _on_tick(self):
+        self.sample_fn()
+
+    def submit(self, target, x, y):
+        """
+        Offers a normalized (x, y) sample for `target` (the active tab).
+        Returns True if the sample should be sent, False if it was coalesced.
+        """
+        now = time.monotonic()
+        if (target is self._last_target and self._last_x is not None
+                and math.hypot(x - self._last_x, y - self._last_y) < self.threshold):
+            self.skip(now)
+            return False
+
+        self._last_target = target
+        self._last_x = x
+        self._last_y = y
+        self._last_move = now
+        self.sent += 1
+        if self._timer.isActive() and self._timer.interval() != self.active_interval_ms:
+            self._timer.setInterval(self.active_interval_ms)
+        return True
+
+    def skip(self, now=None):
+        """Records a tick that produced nothing to send (still gaze, outside the view...)."""
+        now = time.monotonic() if now is None else now
+        self.skipped += 1
+        if ((now - self._last_move) * 1000 >= self.idle_after_ms
+                and self._timer.isActive() and self._timer.interval() != self.idle_interval_ms):
+            self._timer.setInterval(self.idle_interval_ms)
+
+    def stats(self):
+        """Returns the dispatch counters, e.g. for the status bar or telemetry."""
+        total = self.sent + self.skipped
+        return {
+            'sent': self.sent,
+            'skipped': self.skipped,
+            'skipRatio': (self.skipped / total) if total else 0.0,
+            'intervalMs': self._timer.interval() if self._timer.isActive() else 0,
+            'paused': self.is_paused(),
+        }
@@ -0,0 +1,288 @@
+# dyslexim/core/gaze_sources.py
+import json
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from urllib.parse import urlparse
+
+from PyQt6.QtGui import QCursor
+
+from .config import GAZE_RING_BUFFER_SIZE
+
+
+class GazeRingBuffer:
+    """
+    Fixed-size, array-backed ring buffer of (x, y, timestamp_ms) samples.
+
+    Writers (a socket or file reader thread) call `append()`; the GUI thread
+    calls `drain()` to take everything written since the previous drain. When
+    the reader outpaces the GUI the oldest samples are overwritten, so memory
+    use stays constant no matter how fast the tracker streams.
+    """
+
+    def __init__(self, capacity=GAZE_RING_BUFFER_SIZE):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * 3 * capacity))
+        self._written = 0  # total samples ever appended
+        self._read = 0     # total samples ever drained
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, x, y, timestamp_ms):
+        with self._lock:
+            i = (self._written % self.capacity) * 3
+            self._data[i] = x
+            self._data[i + 1] = y
+            self._data[i + 2] = timestamp_ms
+            self._written += 1
+
+    def drain(self):
+        """Returns the samples appended since the last drain, oldest first."""
+        with self._lock:
+            pending = self._written - self._read
+            if pending > self.capacity:
+                self.dropped += pending - self.capacity
+                self._read = self._written - self.capacity
+            out = []
+            data = self._data
+            for n in range(self._read, self._written):
+                i = (n % self.capacity) * 3
+                out.append((data[i], data[i + 1], data[i + 2]))
+            self._read = self._written
+            return out
+
+    def latest(self):
+        """Returns the newest sample without consuming anything, or None."""
+        with self._lock:
+            if not self._written:
+                return None
+            i = ((self._written - 1) % self.capacity) * 3
+            return (self._data[i], self._data[i + 1], self._data[i + 2])
+
+
+class GazeSource:
+    """
+    Base class for gaze inputs.
+
+    `drain()` is called from the GUI thread on every dispatch tick and returns
+    a list of (x, y, timestamp_ms) samples in global screen pixels.
+    """
+
+    name = 'base'
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def drain(self):
+        return []
+
+
+class MouseGazeSource(GazeSource):
+    """Uses the mouse cursor as the gaze position (the original behaviour)."""
+
+    name = 'mouse'
+
+    def drain(self):
+        pos = QCursor.pos()
+        return [(float(pos.x()), float(pos.y()), time.monotonic() * 1000.0)]
+
+
+class _ThreadedGazeSource(GazeSource, ABC):
+    """
+    Shared plumbing for sources that read on a worker thread.
+
+    Incoming coordinates are normalized to the screen (0..1) and converted to
+    global pixels with `screen_rect` = (left, top, width, height), so the GUI
+    thread only has to drain the ring buffer. Subclasses implement `_run()`,
+    the read loop, which should return soon after `self._stop` is set.
+    """
+
+    def __init__(self, screen_rect, capacity=GAZE_RING_BUFFER_SIZE):
+        self.screen_rect = screen_rect
+        self.buffer = GazeRingBuffer(capacity)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"gaze-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def drain(self):
+        return self.buffer.drain()
+
+    def _append_normalized(self, nx, ny, timestamp_ms=None):
+        left, top, width, height = self.screen_rect
+        if timestamp_ms is None:
+            timestamp_ms = time.monotonic() * 1000.0
+        self.buffer.append(left + nx * width, top + ny * height, timestamp_ms)
+
+    @abstractmethod
+    def _run(self):
+        """Reads samples into the ring buffer until `self._stop` is set (on the worker thread)."""
+
+
+def parse_gaze_message(line):
+    """
+    Parses one tracker message into normalized (x, y) or None.
+
+    Accepted forms: "x y", "x,y" (extra fields such as a device timestamp are
+    ignored) or a JSON object with "x" and "y" keys.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if line.startswith('{'):
+            msg = json.loads(line)
+            return float(msg['x']), float(msg['y'])
+        parts = line.replace(',', ' ').split()
+        return float(parts[0]), float(parts[1])
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+class NetworkGazeSource(_ThreadedGazeSource):
+    """
+    Reads normalized gaze samples from an eye tracker over UDP or TCP.
+
+    UDP: binds `host:port` and treats every datagram line as a sample.
+    TCP: connects to a tracker server at `host:port` and reads newline-delimited
+    samples, reconnecting if the tracker goes away.
+    """
+
+    def __init__(self, protocol, host, port, screen_rect, capacity=GAZE_RING_BUFFER_SIZE):
+        super().__init__(screen_rect, capacity)
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.name = protocol
+
+    def _run(self):
+        if self.protocol == 'udp':
+            self._run_udp()
+        else:
+            self._run_tcp()
+
+    def _handle_data(self, data):
+        for line in data.decode('utf-8', 'replace').splitlines():
+            sample = parse_gaze_message(line)
+            if sample:
+                self._append_normalized(*sample)
+
+    def _run_udp(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind((self.host, self.port))
+            sock.settimeout(0.25)
+            while not self._stop.is_set():
+                try:
+                    data, _ = sock.recvfrom(4096)
+                except socket.timeout:
+                    continue
+                self._handle_data(data)
+        except OSError as e:
+            print(f"Gaze UDP source error: {e}")
+        finally:
+            sock.close()
+
+    def _run_tcp(self):
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1.0) as sock:
+                    sock.settimeout(0.25)
+                    pending = b''
+                    while not self._stop.is_set():
+                        try:
+                            chunk = sock.recv(4096)
+                        except socket.timeout:
+                            continue
+                        if not chunk:
+                            break
+                        pending += chunk
+                        complete, _, pending = pending.rpartition(b'\n')
+                        if complete:
+                            self._handle_data(complete)
+            except OSError:
+                # Tracker not up (yet); retry without busy-looping
+                self._stop.wait(1.0)
+
+
+class FileGazeSource(_ThreadedGazeSource):
+    """
+    Plays back a text trace of "t x y" lines (t in seconds, x/y normalized)
+    at its recorded pace.
+    """
+
+    name = 'file'
+
+    def __init__(self, path, screen_rect, loop=False, capacity=GAZE_RING_BUFFER_SIZE):
+        super().__init__(screen_rect, capacity)
+        self.path = path
+        self.loop = loop
+
+    def _read_samples(self):
+        samples = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.replace(',', ' ').split()
+                if len(parts) < 3 or line.lstrip().startswith('#'):
+                    continue
+                try:
+                    samples.append((float(parts[0]), float(parts[1]), float(parts[2])))
+                except ValueError:
+                    continue
+        return samples
+
+    def _run(self):
+        try:
+            samples = self._read_samples()
+        except (OSError, ValueError) as e:
+            # ValueError covers UnicodeDecodeError: a binary file, e.g. a .dxgt trace
+            print(f"Gaze file source error: {e}")
+            return
+        if not samples:
+            return
+        while not self._stop.is_set():
+            start = time.monotonic()
+            t0 = samples[0][0]
+            for t, x, y in samples:
+                delay = (t - t0) - (time.monotonic() - start)
+                if delay > 0 and self._stop.wait(delay):
+                    return
+                self._append_normalized(x, y)
+            if not self.loop:
+                return
+
+
+def create_gaze_source(spec, screen_rect):
+    """
+    Builds a gaze source from a spec string:
+    'mouse', 'udp://host:port', 'tcp://host:port' or a trace file path.
+    A ready-made GazeSource instance is returned unchanged.
+    """
+    if isinstance(spec, GazeSource):
+        return spec
+    if not spec or spec == 'mouse':
+        return MouseGazeSource()
+    parsed = urlparse(spec)
+    if parsed.scheme in ('udp', 'tcp'):
+        return NetworkGazeSource(parsed.scheme, parsed.hostname or '127.0.0.1', parsed.port or 4242, screen_rect)
+    path = parsed.path if parsed.scheme == 'file' else spec
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown gaze source: {spec}")
+    return FileGazeSource(path, screen_rect)
@@ -0,0 +1,90 @@
+# dyslexim/core/gaze_stream.py
+import time
+from functools import lru_cache
+
+from PyQt6.QtCore import QObject, QTimer, QFile, QIODevice, pyqtSignal, pyqtSlot, pyqtProperty
+
+
+@lru_cache(maxsize=1)
+def load_qwebchannel_js():
+    """
+    Returns the qwebchannel.js client library shipped with QtWebChannel,
+    wrapped so it only defines `QWebChannel` on pages that don't already have it.
+    """
+    f = QFile(":/qtwebchannel/qwebchannel.js")
+    if not f.open(QIODevice.OpenModeFlag.ReadOnly):
+        return ""
+    try:
+        source = bytes(f.readAll()).decode('utf-8')
+    finally:
+        f.close()
+    return f"(function(){{ if (window.QWebChannel) return; {source}\nwindow.QWebChannel = QWebChannel; }})();"
+
+
+class GazeStream(QObject):
+    """
+    Per-tab QWebChannel object that streams gaze samples to the page.
+
+    Samples are queued with `push()` and delivered on the next event loop turn
+    as one flat [x0, y0, t0, x1, y1, t1, ...] batch through the `samples`
+    signal. If the GUI thread falls behind, several samples share one message
+    instead of each one costing a script compilation in the renderer.
+    """
+
+    # Flat list of (x, y, timestamp_ms) triples; x/y are normalized to the view
+    samples = pyqtSignal(list)
+
+    # Python-side notification for sampleHandled(): (sample_time_ms, handled_at_ms)
+    handled = pyqtSignal(float, float)
+
+    # The page's gaze handler finished installing, with its install time in ms
+    installed = pyqtSignal(float)
+
+    # Oldest samples are dropped beyond this many per batch
+    MAX_BATCH = 32
+
+    def __init__(self, parent=None, latency_reporting=False):
+        super().__init__(parent)
+        self._pending = []
+        self._flush_scheduled = False
+        self._latency_reporting = latency_reporting
+
+    def _get_latency_reporting(self):
+        return self._latency_reporting
+
+    # Read by the page when the channel connects; when set, it acks every handled sample
+    latencyReporting = pyqtProperty(bool, fget=_get_latency_reporting, constant=True)
+
+    @pyqtSlot(float)
+    def sampleHandled(self, sample_time_ms):
+        """Called by the page once a sample's highlight has been painted."""
+        self.handled.emit(sample_time_ms, time.monotonic() * 1000.0)
+
+    @pyqtSlot(float)
+    def handlerInstalled(self, install_ms):
+        """Called by the page once its gaze handler is installed and connected."""
+        self.installed.emit(install_ms)
+
+    def push(self, x, y, timestamp_ms=None):
+        """Queues a normalized gaze sample for the next batch."""
+        if timestamp_ms is None:
+            timestamp_ms = time.monotonic() * 1000.0
+        self._pending.extend((round(x, 4), round(y, 4), timestamp_ms))
+        if len(self._pending) > self.MAX_BATCH * 3:
+            del self._pending[:-self.MAX_BATCH * 3]
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Emits every queued sample as a single batch."""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        self.samples.emit(batch)
+
+    def clear(self):
+        """Drops queued samples, e.g. when the tab is navigated away."""
+        self._pending = []
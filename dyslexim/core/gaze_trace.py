@@ -0,0 +1,177 @@
+# dyslexim/core/gaze_trace.py
+import struct
+import sys
+import time
+from array import array
+
+from .gaze_sources import GazeSource
+
+# File layout (little-endian):
+#   header   b'DXGT', u16 version, u32 sample count, u32 url count
+#   urls     u32 byte length + UTF-8 bytes, repeated
+#   columns  float32 t[n] (seconds since start), float32 x[n], float32 y[n], u32 url_index[n]
+# Version 1 files (u16 url count, lengths and url_index) can still be read.
+TRACE_MAGIC = b'DXGT'
+TRACE_VERSION = 2
+_PREFIX = struct.Struct('<4sH')
+# Per version: rest of the header, URL length, url_index typecode
+_LAYOUTS = {
+    1: (struct.Struct('<IH'), struct.Struct('<H'), 'H'),
+    2: (struct.Struct('<II'), struct.Struct('<I'), 'I'),
+}
+
+
+def _write_array(f, arr):
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    arr.tofile(f)
+
+
+def _read_array(f, typecode, count):
+    arr = array(typecode)
+    arr.fromfile(f, count)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+
+class GazeTrace:
+    """A recorded gaze session: parallel float32 columns plus a URL table."""
+
+    def __init__(self, t=None, x=None, y=None, url_index=None, urls=None):
+        self.t = t if t is not None else array('f')
+        self.x = x if x is not None else array('f')
+        self.y = y if y is not None else array('f')
+        self.url_index = url_index if url_index is not None else array('I')
+        self.urls = urls if urls is not None else []
+
+    def __len__(self):
+        return len(self.t)
+
+    def duration(self):
+        return self.t[-1] if len(self.t) else 0.0
+
+    def samples(self):
+        """Yields (t_seconds, x, y, url) tuples."""
+        for i in range(len(self.t)):
+            yield self.t[i], self.x[i], self.y[i], self.urls[self.url_index[i]]
+
+    def save(self, path):
+        counts, length, index_type = _LAYOUTS[TRACE_VERSION]
+        url_index = self.url_index if self.url_index.typecode == index_type else array(index_type, self.url_index)
+        with open(path, 'wb') as f:
+            f.write(_PREFIX.pack(TRACE_MAGIC, TRACE_VERSION))
+            f.write(counts.pack(len(self.t), len(self.urls)))
+            for url in self.urls:
+                data = url.encode('utf-8')
+                f.write(length.pack(len(data)))
+                f.write(data)
+            for column in (self.t, self.x, self.y, url_index):
+                _write_array(f, column)
+
+
+def is_gaze_trace_file(path):
+    """True if `path` is a file starting with the trace magic (as written by --record-trace)."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+    except OSError:
+        return False
+
+
+def load_gaze_trace(path):
+    """Reads a trace written by `GazeTrace.save()`."""
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"Not a Dyslexim gaze trace: {path}")
+        magic, version = _PREFIX.unpack(prefix)
+        if magic != TRACE_MAGIC or version not in _LAYOUTS:
+            raise ValueError(f"Not a Dyslexim gaze trace: {path}")
+        counts, length, index_type = _LAYOUTS[version]
+        header = f.read(counts.size)
+        if len(header) < counts.size:
+            raise ValueError(f"Truncated gaze trace: {path}")
+        count, url_count = counts.unpack(header)
+        urls = []
+        for _ in range(url_count):
+            (size,) = length.unpack(f.read(length.size))
+            urls.append(f.read(size).decode('utf-8'))
+        t = _read_array(f, 'f', count)
+        x = _read_array(f, 'f', count)
+        y = _read_array(f, 'f', count)
+        url_index = _read_array(f, index_type, count)
+    return GazeTrace(t, x, y, url_index, urls)
+
+
+class GazeTraceRecorder:
+    """Captures the normalized samples dispatched to the active tab."""
+
+    def __init__(self):
+        self.trace = GazeTrace()
+        self._url_ids = {}
+        self._start = None
+
+    def record(self, x, y, url):
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        url_id = self._url_ids.get(url)
+        if url_id is None:
+            url_id = self._url_ids[url] = len(self.trace.urls)
+            self.trace.urls.append(url)
+        self.trace.t.append(now - self._start)
+        self.trace.x.append(x)
+        self.trace.y.append(y)
+        self.trace.url_index.append(url_id)
+
+    def save(self, path):
+        self.trace.save(path)
+
+
+class TraceGazeSource(GazeSource):
+    """
+    Replays a recorded trace at its original pace (scaled by `speed`).
+
+    Trace coordinates are normalized to the web view, so `to_global(x, y)`
+    maps them back to global screen pixels for the regular dispatch path.
+    Samples are stamped with their scheduled time, so measured latency
+    includes the dispatch tick delay.
+    """
+
+    name = 'trace'
+
+    def __init__(self, trace, to_global, speed=1.0):
+        self.trace = trace
+        self.to_global = to_global
+        self.speed = speed
+        self._next = 0
+        self._start_ms = None
+
+    def start(self):
+        # Called by the window at construction; playback waits for begin()
+        pass
+
+    def begin(self):
+        """Starts playback from the first sample, e.g. once the fixture has loaded."""
+        self._next = 0
+        self._start_ms = time.monotonic() * 1000.0
+
+    def finished(self):
+        return self._next >= len(self.trace)
+
+    def drain(self):
+        if self._start_ms is None or self.finished():
+            return []
+        now_ms = time.monotonic() * 1000.0
+        out = []
+        t = self.trace.t
+        while self._next < len(t):
+            due_ms = self._start_ms + t[self._next] * 1000.0 / self.speed
+            if due_ms > now_ms:
+                break
+            gx, gy = self.to_global(self.trace.x[self._next], self.trace.y[self._next])
+            out.append((gx, gy, due_ms))
+            self._next += 1
+        return out
@@ -0,0 +1,476 @@
+# dyslexim/core/history.py
+import atexit
+import bisect
+import heapq
+import math
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from operator import attrgetter
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .config import HISTORY_WRITE_DELAY_S, HISTORY_HALF_LIFE_DAYS, HISTORY_SUGGESTIONS
+from .debounced_writer import DebouncedWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    last_visit REAL NOT NULL DEFAULT 0,
+    rank REAL NOT NULL DEFAULT 0
+);
+"""
+
+HALF_LIFE_S = HISTORY_HALF_LIFE_DAYS * 86400.0
+# Prefix ranges bigger than this are answered from a per-prefix top list instead of being scanned
+RANGE_SCAN_LIMIT = 256
+TOP_LIST_SIZE = 64
+# Once this many keys were added since the index was built, it is rebuilt on a worker thread
+REBUILD_AFTER_KEYS = 32768
+# The index is built on a thread next to the GUI: keys are sorted in runs of this
+# many and merged in Python, so no single call holds the GIL for long
+SORT_RUN_KEYS = 8192
+MAX_TOKENS = 12
+
+_SCHEME = re.compile(r'^[a-z][a-z0-9+.-]*://')
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z]+')
+_VOWELS = re.compile(r'[aeiouy]')
+_REPEATS = re.compile(r'(.)\1+')
+# Spellings that sound alike, and letters that are easy to mirror (b/d, p/q)
+_SOUND_ALIKE = (('ph', 'f'), ('ck', 'k'), ('qu', 'kw'), ('wh', 'w'), ('gh', 'g'))
+_LOOK_ALIKE = str.maketrans('czdqv', 'ksbpf')
+_rank = attrgetter('rank')
+
+
+def bump_rank(rank, now, weight=1.0):
+    """
+    Frecency as a rank that never needs decaying: a visit adds `weight` to a
+    score that halves every HALF_LIFE_S, and rank = log2(score) + t / HALF_LIFE_S.
+    Since every score decays at the same rate, comparing ranks compares
+    current scores, and an entry's rank only changes when it is visited.
+    """
+    score = 2.0 ** (rank - now / HALF_LIFE_S) if rank else 0.0
+    return math.log2(score + weight) + now / HALF_LIFE_S
+
+
+def normalize(text):
+    text = text.strip().lower()
+    text = _SCHEME.sub('', text)
+    return text[4:] if text.startswith('www.') else text
+
+
+@lru_cache(maxsize=65536)
+def skeleton(word):
+    """
+    A spelling-tolerant key: sound-alike spellings merged, vowels after the
+    first letter dropped and doubled letters collapsed, so 'wikepedia',
+    'wikipdia' and 'wikkipedia' all look like 'wikipedia'.
+    """
+    for a, b in _SOUND_ALIKE:
+        word = word.replace(a, b)
+    word = word.translate(_LOOK_ALIKE)
+    if len(word) > 1:
+        word = word[0] + _VOWELS.sub('', word[1:])
+    return _REPEATS.sub(r'\1', word)
+
+
+def tokenize(url, title):
+    """Words an entry can be found by: its URL (without scheme/www), URL parts and title words."""
+    key = normalize(url)
+    tokens = [key]
+    for word in _TOKEN_SPLIT.split(key) + _TOKEN_SPLIT.split(title.lower()):
+        if len(word) >= 2 and word not in tokens:
+            tokens.append(word)
+            if len(tokens) >= MAX_TOKENS:
+                break
+    return tuple(tokens)
+
+
+class _Entry:
+    __slots__ = ('url', 'title', 'visit_count', 'last_visit', 'rank', 'tokens')
+
+    def __init__(self, url, title, visit_count, last_visit, rank):
+        self.url = url
+        self.title = title
+        self.visit_count = visit_count
+        self.last_visit = last_visit
+        self.rank = rank
+        self.tokens = tokenize(url, title)
+
+
+def _sorted_order(keys):
+    """Indexes of `keys` in sorted order, sorted run by run (see SORT_RUN_KEYS)."""
+    runs = [
+        sorted(range(start, min(start + SORT_RUN_KEYS, len(keys))), key=keys.__getitem__)
+        for start in range(0, len(keys), SORT_RUN_KEYS)
+    ]
+    if len(runs) == 1:
+        return runs[0]
+    return list(heapq.merge(*runs, key=keys.__getitem__))
+
+
+class _PrefixIndex:
+    """
+    Sorted (key, entry) arrays searched with bisect. Big prefix ranges (short
+    queries like 'g') are answered from top lists kept per prefix, which stay
+    valid as entries are added because ranks only ever go up.
+    `tokens_of(entry)` picks which of an entry's tokens are indexed.
+
+    Keys added after the index was built go to a second, small pair of sorted
+    arrays, so a visit never shifts the big ones (History rebuilds the whole
+    index in the background once the small pair gets big).
+    """
+
+    def __init__(self, entries, key_func, tokens_of):
+        self.key_func = key_func
+        self.tokens_of = tokens_of
+        # Parallel lists sorted through an index order: (key, entry) tuples would be
+        # millions of GC-tracked objects for a big history
+        keys, owners = [], []
+        for entry in entries:
+            tokens = tokens_of(entry)
+            keys.extend(map(key_func, tokens))
+            owners.extend([entry] * len(tokens))
+        order = _sorted_order(keys)
+        self.keys = [keys[i] for i in order]
+        self.entries = [owners[i] for i in order]
+        # Freed run by run too: dropping a million ints at once is one long stall
+        while order:
+            del order[-SORT_RUN_KEYS:]
+        self.new_keys = []
+        self.new_entries = []
+        self.top = {}
+
+    def add(self, entry, tokens):
+        for token in tokens:
+            key = self.key_func(token)
+            i = bisect.bisect_left(self.new_keys, key)
+            self.new_keys.insert(i, key)
+            self.new_entries.insert(i, entry)
+        self.promote(entry, tokens)
+
+    def remove(self, entry, tokens):
+        for token in tokens:
+            key = self.key_func(token)
+            for keys, entries in ((self.new_keys, self.new_entries), (self.keys, self.entries)):
+                i = bisect.bisect_left(keys, key)
+                while i < len(keys) and keys[i] == key and entries[i] is not entry:
+                    i += 1
+                if i < len(keys) and keys[i] == key:
+                    del keys[i]
+                    del entries[i]
+                    break
+        # Dropping an entry from the top lists would leave them short; rebuild on demand
+        self.top.clear()
+
+    def promote(self, entry, tokens):
+        """Updates cached top lists after `entry` was added or its rank went up."""
+        if not self.top:
+            return
+        for token in tokens:
+            key = self.key_func(token)
+            for n in range(1, len(key) + 1):
+                top = self.top.get(key[:n])
+                if top is None:
+                    continue
+                if entry in top:
+                    top.remove(entry)
+                elif len(top) >= TOP_LIST_SIZE and entry.rank <= top[-1].rank:
+                    continue
+                top.append(entry)
+                top.sort(key=_rank, reverse=True)
+                del top[TOP_LIST_SIZE:]
+
+    def search(self, prefix):
+        """Entries with a key starting with `prefix`, best first (at most TOP_LIST_SIZE)."""
+        prefix = self.key_func(prefix)
+        if not prefix:
+            return []
+        top = self.top.get(prefix)
+        if top is not None:
+            return top
+        candidates = set()
+        size = 0
+        for keys, entries in ((self.keys, self.entries), (self.new_keys, self.new_entries)):
+            lo = bisect.bisect_left(keys, prefix)
+            hi = bisect.bisect_left(keys, prefix + '\uffff', lo)
+            candidates.update(entries[lo:hi])
+            size += hi - lo
+        best = heapq.nlargest(TOP_LIST_SIZE, candidates, key=_rank)
+        if size > RANGE_SCAN_LIMIT:
+            self.top[prefix] = best
+        return best
+
+    def warm(self, max_length=2):
+        """Fills the top lists for every big prefix range up to `max_length` characters (right after building)."""
+        keys = self.keys
+        for n in range(1, max_length + 1):
+            i = 0
+            while i < len(keys):
+                prefix = keys[i][:n]
+                hi = bisect.bisect_left(keys, prefix + '\uffff', i)
+                if len(prefix) == n and hi - i > RANGE_SCAN_LIMIT:
+                    self.top[prefix] = heapq.nlargest(TOP_LIST_SIZE, set(self.entries[i:hi]), key=_rank)
+                i = hi
+
+
+class HistoryIndex:
+    """
+    In-memory index over every history entry, for address bar suggestions.
+
+    search() matches word prefixes of URLs and titles and ranks by frecency.
+    When exact prefixes don't fill the list it retries with spelling-tolerant
+    keys (see skeleton()) and with the query's one-letter-extra and
+    swapped-letter variants.
+    """
+
+    def __init__(self, rows=()):
+        self.by_url = {}
+        for url, title, visit_count, last_visit, rank in rows:
+            self.by_url[url] = _Entry(url, title, visit_count, last_visit, rank)
+        entries = list(self.by_url.values())
+        self.exact = _PrefixIndex(entries, str, attrgetter('tokens'))
+        # Spelling-tolerant keys only make sense for words, not whole URLs
+        self.fuzzy = _PrefixIndex(entries, skeleton, lambda entry: entry.tokens[1:])
+        self.exact.warm()
+        self.fuzzy.warm()
+
+    def __len__(self):
+        return len(self.by_url)
+
+    def needs_rebuild(self):
+        """True once enough was added since the build that a fresh index would search faster."""
+        return len(self.exact.new_keys) + len(self.fuzzy.new_keys) > REBUILD_AFTER_KEYS
+
+    def visit(self, url, title, now):
+        """Records a visit; returns the entry."""
+        entry = self.by_url.get(url)
+        if entry is None:
+            entry = self.by_url[url] = _Entry(url, title, 1, now, bump_rank(0.0, now))
+            self.exact.add(entry, entry.tokens)
+            self.fuzzy.add(entry, entry.tokens[1:])
+            return entry
+        entry.visit_count += 1
+        entry.last_visit = now
+        entry.rank = bump_rank(entry.rank, now)
+        self.exact.promote(entry, entry.tokens)
+        self.fuzzy.promote(entry, entry.tokens[1:])
+        if title and title != entry.title:
+            self.set_title(url, title)
+        return entry
+
+    def restore(self, other):
+        """Copies an entry's current state from another index (see History._on_index_built)."""
+        entry = self.by_url.get(other.url)
+        if entry is None:
+            entry = self.by_url[other.url] = _Entry(
+                other.url, other.title, other.visit_count, other.last_visit, other.rank,
+            )
+            self.exact.add(entry, entry.tokens)
+            self.fuzzy.add(entry, entry.tokens[1:])
+            return entry
+        entry.visit_count = other.visit_count
+        entry.last_visit = other.last_visit
+        entry.rank = other.rank
+        self.exact.promote(entry, entry.tokens)
+        self.fuzzy.promote(entry, entry.tokens[1:])
+        self.set_title(other.url, other.title)
+        return entry
+
+    def set_title(self, url, title):
+        entry = self.by_url.get(url)
+        if entry is None or title == entry.title:
+            return entry
+        old_tokens = entry.tokens
+        entry.title = title
+        entry.tokens = tokenize(url, title)
+        for index in (self.exact, self.fuzzy):
+            index.remove(entry, [t for t in old_tokens if t not in entry.tokens])
+            index.add(entry, [t for t in entry.tokens if t not in old_tokens])
+        return entry
+
+    @staticmethod
+    def _matches(entry, term):
+        return term in entry.tokens[0] or any(t.startswith(term) for t in entry.tokens)
+
+    @staticmethod
+    def _variants(term):
+        """The term with one letter left out, or two neighbouring letters swapped."""
+        seen = set()
+        for i in range(len(term)):
+            seen.add(term[:i] + term[i + 1:])
+            if i + 1 < len(term):
+                seen.add(term[:i] + term[i + 1] + term[i] + term[i + 2:])
+        seen.discard(term)
+        return [v for v in seen if len(v) >= 3]
+
+    def search(self, text, limit=HISTORY_SUGGESTIONS):
+        """Returns up to `limit` (url, title) pairs for what's typed in the address bar."""
+        terms = normalize(text).split()
+        if not terms:
+            return []
+        # Candidates come from the longest word; the others just have to match too
+        first = max(terms, key=len)
+        rest = [t for t in terms if t is not first]
+
+        results = []
+        seen = set()
+
+        def take(candidates):
+            for entry in candidates:
+                if len(results) >= limit:
+                    return
+                if entry.url in seen or not all(self._matches(entry, t) for t in rest):
+                    continue
+                seen.add(entry.url)
+                results.append(entry)
+
+        take(self.exact.search(first))
+        if len(results) < limit and len(first) >= 3:
+            fuzzy = list(self.fuzzy.search(first))
+            if len(first) >= 4:
+                for variant in self._variants(first):
+                    fuzzy.extend(self.exact.search(variant))
+            fuzzy.sort(key=_rank, reverse=True)
+            take(fuzzy)
+        return [(e.url, e.title) for e in results]
+
+
+class HistoryStore:
+    """
+    History rows in SQLite (WAL mode). record() only queues the entry's new
+    state; a writer thread writes everything queued after `write_delay_s` of
+    quiet in one transaction. flush() (also run at exit) writes right away.
+    """
+
+    def __init__(self, path, write_delay_s=HISTORY_WRITE_DELAY_S):
+        self.path = path
+        self.write_delay_s = write_delay_s
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._writer = DebouncedWriter(
+            self._lock, lambda: bool(self._pending), self._write_pending, write_delay_s, 'dyslexim-history',
+        )
+        self._io_lock = threading.Lock()
+        self._db = None
+        atexit.register(self.flush)
+
+    def _connect(self):
+        # Called with _io_lock held
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def load(self):
+        """Returns every row as (url, title, visit_count, last_visit, rank)."""
+        with self._io_lock:
+            try:
+                return self._connect().execute(
+                    "SELECT url, title, visit_count, last_visit, rank FROM history"
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Could not read history from {self.path}: {e}")
+                return []
+
+    def record(self, entry):
+        with self._lock:
+            self._pending[entry.url] = (entry.url, entry.title, entry.visit_count, entry.last_visit, entry.rank)
+            self._writer.schedule()
+
+    def _write_pending(self):
+        with self._io_lock:
+            with self._lock:
+                rows = list(self._pending.values())
+                self._pending = {}
+            if not rows:
+                return
+            try:
+                db = self._connect()
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO history (url, title, visit_count, last_visit, rank) "
+                        "VALUES (?, ?, ?, ?, ?)", rows,
+                    )
+            except sqlite3.Error as e:
+                print(f"Could not save history to {self.path}: {e}")
+
+    def flush(self):
+        self._write_pending()
+
+
+class History(QObject):
+    """
+    Navigation history for the window: visits are indexed in memory right
+    away and saved in the background. The saved history is loaded and indexed
+    on a worker thread at startup; `loaded` fires when suggestions are ready.
+    After many new pages the index is rebuilt the same way, and the old one
+    answers searches until the new one is ready.
+    """
+
+    loaded = pyqtSignal()
+    _indexBuilt = pyqtSignal(object)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.store = HistoryStore(path)
+        self.index = None
+        self._early_visits = []
+        # URLs changed while a rebuild runs; None when no rebuild is running
+        self._touched = None
+        self._indexBuilt.connect(self._on_index_built)
+        threading.Thread(target=self._build_index, name='dyslexim-history-index', daemon=True).start()
+
+    def _build_index(self):
+        # Whatever is still queued has to be in the database the new index is built from
+        self.store.flush()
+        self._indexBuilt.emit(HistoryIndex(self.store.load()))
+
+    def _on_index_built(self, index):
+        if self.index is not None:
+            # A rebuild: bring over what changed since it started
+            for url in self._touched:
+                index.restore(self.index.by_url[url])
+            self.index = index
+            self._touched = None
+            return
+        self.index = index
+        for url, title, now in self._early_visits:
+            self.store.record(index.visit(url, title, now))
+        self._early_visits = []
+        self.loaded.emit()
+
+    def _changed(self, entry):
+        self.store.record(entry)
+        if self._touched is not None:
+            self._touched.add(entry.url)
+        elif self.index.needs_rebuild():
+            self._touched = set()
+            threading.Thread(target=self._build_index, name='dyslexim-history-index', daemon=True).start()
+
+    def record_visit(self, url, title=''):
+        now = time.time()
+        if self.index is None:
+            self._early_visits.append((url, title, now))
+            return
+        self._changed(self.index.visit(url, title, now))
+
+    def set_title(self, url, title):
+        if self.index is None:
+            self._early_visits = [(u, title if u == url else t, now) for u, t, now in self._early_visits]
+            return
+        entry = self.index.set_title(url, title)
+        if entry is not None:
+            self._changed(entry)
+
+    def search(self, text):
+        return self.index.search(text) if self.index is not None else []
+
+    def flush(self):
+        self.store.flush()
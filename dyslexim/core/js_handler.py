@@ -1,176 +1,1317 @@
 # dyslexim/core/js_handler.py
+import json
 
-def get_js_gaze_handler(highlight_color, font, alignment, reading_mask, tts_hover_time):
-    """Returns the JavaScript gaze handler with the specified highlight color, font, and alignment."""
+from .config import FONTS_CSS_URL, BUNDLED_FONT_FAMILIES, GAZE_THROTTLE_MS
+
+# Settings the page-side handler reads at runtime from window.__dyslexim_config
+RUNTIME_CONFIG_KEYS = (
+    'highlightColor', 'font', 'highlightAlignment', 'readingMask', 'ttsHoverTime',
+    'hitTestMode', 'snapTolerancePx', 'maskRenderer', 'highlightMode',
+    'pageTypography', 'wordStemEmphasis', 'textAnalysis',
+)
+
+# Batches DOM work per animation frame: every queued read runs before any
+# queued write, so the handler never interleaves writes and layout reads.
+# Layout reads go through measure(), which counts the ones made while our own
+# writes are still unrendered (each of those is a forced synchronous layout).
+FRAME_JS = r"""
+      const createFrameScheduler = function() {
+        let reads = [], writes = [];
+        let requested = false;
+        let wroteThisFrame = false;
+
+        const flush = function() {
+          requested = false;
+          const r = reads;
+          reads = [];
+          r.forEach(fn => fn());
+          // Writes queued by this frame's reads still land in this frame
+          const w = writes;
+          writes = [];
+          w.forEach(fn => fn());
+          if (w.length) {
+            // Until the frame is rendered, a layout read would be forced
+            wroteThisFrame = true;
+            setTimeout(() => { wroteThisFrame = false; }, 0);
+          }
+        };
+        const request = function() {
+          if (requested) return;
+          requested = true;
+          requestAnimationFrame(flush);
+        };
+
+        return {
+          read: fn => { reads.push(fn); request(); },
+          write: fn => { writes.push(fn); request(); },
+          measure: function(fn) {
+            if (wroteThisFrame) window.__dyslexim_stats.forcedLayouts++;
+            return fn();
+          }
+        };
+      };
+"""
+
+# Spatial index of readable text blocks for hitTestMode 'indexed'. Blocks are
+# kept in document coordinates and bucketed into horizontal bands, so a gaze
+# sample is a lookup in one band (a few when snapping) instead of
+# elementFromPoint + closest(). Only blocks near the viewport are indexed;
+# observers mark the index dirty and it is re-measured once per frame at most.
+TEXT_INDEX_JS = r"""
+      const createTextIndex = function(selector, frame) {
+        const BAND_PX = 64;
+        const blocks = new Map();   // element -> {el, left, top, right, bottom, area}
+        const near = new Set();     // elements within IntersectionObserver's margin
+        let bands = new Map();      // band number -> [block, ...]
+        let dirty = true;
+        let scheduled = false;
+
+        const isReadable = el => el.isConnected && (el.textContent || '').trim().length > 0;
+
+        const rebuild = function() {
+          scheduled = false;
+          if (!dirty) return;
+          dirty = false;
+          const sx = window.scrollX, sy = window.scrollY;
+          const next = new Map();
+          blocks.clear();
+          // One batch of reads, no writes in between
+          near.forEach(el => {
+            if (!isReadable(el)) return;
+            const r = frame.measure(() => el.getBoundingClientRect());
+            if (r.width === 0 || r.height === 0) return;
+            const b = { el: el, left: r.left + sx, top: r.top + sy, right: r.right + sx, bottom: r.bottom + sy,
+                        area: r.width * r.height };
+            blocks.set(el, b);
+            const last = Math.floor(b.bottom / BAND_PX);
+            for (let band = Math.floor(b.top / BAND_PX); band <= last; band++) {
+              let list = next.get(band);
+              if (!list) next.set(band, list = []);
+              list.push(b);
+            }
+          });
+          bands = next;
+          window.__dyslexim_stats.indexRebuilds++;
+          window.__dyslexim_stats.indexBlocks = blocks.size;
+        };
+
+        const markDirty = function() {
+          dirty = true;
+          if (scheduled) return;
+          scheduled = true;
+          frame.read(rebuild);
+        };
+
+        const intersection = new IntersectionObserver(entries => {
+          entries.forEach(e => e.isIntersecting ? near.add(e.target) : near.delete(e.target));
+          markDirty();
+        }, { rootMargin: '100% 0px' });
+        const resize = new ResizeObserver(markDirty);
+
+        const track = function(el) {
+          intersection.observe(el);
+          resize.observe(el);
+        };
+        const untrack = function(el) {
+          intersection.unobserve(el);
+          resize.unobserve(el);
+          near.delete(el);
+        };
+        const trackTree = function(node) {
+          if (node.nodeType !== 1) return;
+          if (node.matches(selector)) track(node);
+          node.querySelectorAll(selector).forEach(track);
+        };
+        const untrackTree = function(node) {
+          if (node.nodeType !== 1) return;
+          if (node.matches(selector)) untrack(node);
+          node.querySelectorAll(selector).forEach(untrack);
+        };
+
+        const mutations = new MutationObserver(records => {
+          records.forEach(m => {
+            m.addedNodes.forEach(trackTree);
+            m.removedNodes.forEach(untrackTree);
+          });
+          markDirty();
+        });
+
+        const start = function() {
+          document.querySelectorAll(selector).forEach(track);
+          // The body resizing covers reflow that moves blocks without resizing them
+          if (document.body) resize.observe(document.body);
+          mutations.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+        };
+
+        const stop = function() {
+          intersection.disconnect();
+          resize.disconnect();
+          mutations.disconnect();
+          near.clear();
+          blocks.clear();
+          bands = new Map();
+        };
+
+        const distance = function(b, x, y) {
+          const dx = x < b.left ? b.left - x : (x > b.right ? x - b.right : 0);
+          const dy = y < b.top ? b.top - y : (y > b.bottom ? y - b.bottom : 0);
+          return Math.hypot(dx, dy);
+        };
+
+        // (x, y) in viewport pixels. Returns the innermost block under the point,
+        // else the nearest block within `tolerance` px, else null.
+        const hitTest = function(x, y, tolerance) {
+          if (dirty && !scheduled) rebuild();
+          const dx = x + window.scrollX, dy = y + window.scrollY;
+          let best = null;
+          (bands.get(Math.floor(dy / BAND_PX)) || []).forEach(b => {
+            if (dx >= b.left && dx <= b.right && dy >= b.top && dy <= b.bottom && (!best || b.area < best.area)) {
+              best = b;
+            }
+          });
+          if (best) return best.el.isConnected ? best.el : null;
+          if (!(tolerance > 0)) return null;
+
+          let bestDist = tolerance;
+          const last = Math.floor((dy + tolerance) / BAND_PX);
+          for (let band = Math.floor((dy - tolerance) / BAND_PX); band <= last; band++) {
+            (bands.get(band) || []).forEach(b => {
+              const d = distance(b, dx, dy);
+              if (d <= bestDist && (!best || d < bestDist || b.area < best.area)) {
+                best = b;
+                bestDist = d;
+              }
+            });
+          }
+          if (!best || !best.el.isConnected) return null;
+          window.__dyslexim_stats.snapped++;
+          return best.el;
+        };
+
+        return { start: start, stop: stop, hitTest: hitTest, size: () => blocks.size };
+      };
+"""
+
+
+def get_runtime_config(config):
+    """Picks the settings the gaze handler needs out of the full config."""
+    return {key: config.get(key) for key in RUNTIME_CONFIG_KEYS if key in config}
+
+
+# Reading mask renderers. 'blur' is the original full-viewport backdrop blur
+# with a clip-path hole; 'panels' darkens around the highlight with four plain
+# panels positioned only with transform (compositor-only, no blur or clip-path);
+# 'auto' starts with blur and switches to panels for the rest of the page if
+# frames measured after mask updates and scrolls keep missing the budget.
+READING_MASK_JS = r"""
+      const createReadingMask = function(cfg) {
+        const PAD = 10;
+        const SHADE = 'rgba(0,0,0,0.7)';
+        const FRAME_BUDGET_MS = 25;      // 60 Hz frame plus slack
+        const PROBE_FRAMES = 30;
+        const SLOW_FRACTION = 0.5;
+
+        let root = null;
+        let kind = null;                 // renderer currently in the DOM
+        let panels = null;
+        let downgraded = false;
+        let lastRect = null;
+
+        const wanted = function() {
+          if (cfg.maskRenderer === 'panels' || cfg.maskRenderer === 'blur') return cfg.maskRenderer;
+          return downgraded ? 'panels' : 'blur';
+        };
+
+        const build = function(type) {
+          remove();
+          root = document.createElement('div');
+          root.id = '__dyslexim_reading_mask';
+          root.setAttribute('data-dyslexim', '1');
+          const s = root.style;
+          s.position = 'fixed';
+          s.top = '0';
+          s.left = '0';
+          s.width = '100vw';
+          s.height = '100vh';
+          s.pointerEvents = 'none';
+          s.zIndex = '999999';
+          if (type === 'blur') {
+            s.transition = 'all 0.2s ease-in-out';
+            s.boxShadow = '0 0 0 9999px ' + SHADE;
+            s.backdropFilter = 'blur(5px)';
+          } else {
+            s.overflow = 'hidden';
+            s.contain = 'strict';
+            // top, bottom: full-size panels slid up/down; left, right: 1px tall, scaled to the line band
+            panels = ['100vh', '100vh', '1px', '1px'].map(height => {
+              const p = document.createElement('div');
+              const ps = p.style;
+              ps.position = 'absolute';
+              ps.left = '0';
+              ps.top = '0';
+              ps.width = '100vw';
+              ps.height = height;
+              ps.background = SHADE;
+              ps.transformOrigin = '0 0';
+              ps.willChange = 'transform';
+              ps.transition = 'transform 0.2s ease-in-out';
+              root.appendChild(p);
+              return p;
+            });
+          }
+          (document.body || document.documentElement).appendChild(root);
+          kind = type;
+        };
+
+        const place = function(rect) {
+          const top = rect.top - PAD, bottom = rect.bottom + PAD;
+          const left = rect.left - PAD, right = rect.right + PAD;
+          if (kind === 'blur') {
+            root.style.clipPath = `polygon(0 0, 100% 0, 100% 100%, 0 100%, 0 0, ${left}px ${top}px, ${left}px ${bottom}px, ${right}px ${bottom}px, ${right}px ${top}px, ${left}px ${top}px)`;
+            return;
+          }
+          const vw = window.innerWidth, vh = window.innerHeight;
+          const band = Math.max(0, bottom - top);
+          panels[0].style.transform = `translate3d(0, ${top - vh}px, 0)`;
+          panels[1].style.transform = `translate3d(0, ${bottom}px, 0)`;
+          panels[2].style.transform = `translate3d(${left - vw}px, ${top}px, 0) scaleY(${band})`;
+          panels[3].style.transform = `translate3d(${right}px, ${top}px, 0) scaleY(${band})`;
+        };
+
+        // --- 'auto': measure a burst of frames after each change ---
+        let probing = false;
+        const probe = function() {
+          if (probing || downgraded || cfg.maskRenderer !== 'auto' || kind !== 'blur') return;
+          probing = true;
+          let frames = 0, slow = 0, last = performance.now();
+          const tick = function(now) {
+            if (now - last > FRAME_BUDGET_MS) slow++;
+            last = now;
+            if (++frames < PROBE_FRAMES && kind === 'blur') {
+              requestAnimationFrame(tick);
+              return;
+            }
+            probing = false;
+            if (kind === 'blur' && slow / frames >= SLOW_FRACTION) {
+              downgraded = true;
+              window.__dyslexim_stats.maskDowngraded = true;
+              if (lastRect) update(lastRect);
+            }
+          };
+          requestAnimationFrame(tick);
+        };
+        window.addEventListener('scroll', () => { if (root) probe(); }, { passive: true });
+
+        const update = function(rect) {
+          if (!cfg.readingMask || !rect) {
+            remove();
+            return;
+          }
+          lastRect = rect;
+          const type = wanted();
+          if (!root || !root.isConnected || kind !== type) build(type);
+          place(rect);
+          probe();
+        };
+
+        const remove = function() {
+          if (root) root.remove();
+          root = null;
+          kind = null;
+          panels = null;
+        };
+
+        return { update: update, remove: remove };
+      };
+"""
+
+
+# Applies the highlight for handleGaze. show()/clear() only record the target;
+# the DOM is touched in the next frame, reads first, then writes.
+#   'typography' - the reading aid: class plus inline line-height, spacing,
+#                  font and alignment on the element (changes its layout, so
+#                  the reading mask follows one frame later, once it's laid out)
+#   'stable'     - outline/background via a class, and the CSS Custom Highlight
+#                  API for the text where available; nothing that needs layout
+HIGHLIGHTER_JS = r"""
+      const createHighlighter = function(cfg, frame, readingMask) {
+        const TYPOGRAPHY = {
+          transition: 'all 0.12s ease',
+          lineHeight: '1.8',
+          letterSpacing: '0.04em',
+          backgroundColor: 'rgba(255,255,0,0.03)'
+        };
+        const highlights = (typeof CSS !== 'undefined' && CSS.highlights && typeof Highlight !== 'undefined')
+          ? CSS.highlights : null;
+
+        let target = null;   // what the next frame should show
+        let shown = null;    // what is styled in the DOM
+        let shownMode = null;
+        let restyle = false;
+        let pending = false;
+
+        const unstyle = function(el) {
+          el.classList.remove('__dyslexim_highlight', '__dyslexim_highlight_stable');
+          const prev = el.__dyslexim_prevStyles;
+          if (prev) {
+            for (const k in prev) el.style[k] = prev[k];
+            el.__dyslexim_prevStyles = null;
+          }
+          if (highlights) highlights.delete('dyslexim');
+        };
+
+        const style = function(el) {
+          if (cfg.highlightMode === 'stable') {
+            el.classList.add('__dyslexim_highlight_stable');
+            if (highlights) {
+              const range = document.createRange();
+              range.selectNodeContents(el);
+              highlights.set('dyslexim', new Highlight(range));
+            }
+            return;
+          }
+          const inline = Object.assign({}, TYPOGRAPHY, {
+            fontFamily: `'${cfg.font}'`,
+            textAlign: cfg.highlightAlignment
+          });
+          const prev = {};
+          for (const k in inline) prev[k] = el.style[k] || '';
+          el.__dyslexim_prevStyles = prev;
+          el.classList.add('__dyslexim_highlight');
+          for (const k in inline) el.style[k] = inline[k];
+        };
+
+        const followWithMask = function(el) {
+          frame.read(() => {
+            if (shown !== el) return;
+            const rect = frame.measure(() => el.getBoundingClientRect());
+            frame.write(() => { if (shown === el) readingMask.update(rect); });
+          });
+        };
+
+        const commit = function() {
+          let rect = null, viewportH = 0;
+          frame.read(() => {
+            pending = false;
+            if (target && target.isConnected) {
+              rect = frame.measure(() => target.getBoundingClientRect());
+              viewportH = window.innerHeight;
+            }
+          });
+          frame.write(() => {
+            const el = target && target.isConnected ? target : null;
+            const mode = cfg.highlightMode;
+            if (el !== shown || mode !== shownMode || restyle) {
+              if (shown) unstyle(shown);
+              if (el) style(el);
+              shown = el;
+              shownMode = mode;
+              restyle = false;
+              window.__dyslexim_stats.highlightFrames++;
+            }
+            if (!el) {
+              readingMask.update(null);
+              return;
+            }
+            if (mode === 'stable') readingMask.update(rect);
+            else followWithMask(el);
+            if (rect.top < 24 || rect.bottom > viewportH - 24) {
+              el.scrollIntoView({behavior: 'smooth', block: 'center'});
+            }
+          });
+        };
+        const schedule = function() {
+          if (pending) return;
+          pending = true;
+          commit();
+        };
+
+        return {
+          show: function(el) { target = el; schedule(); },
+          clear: function() { target = null; schedule(); },
+          // Re-applies the current styling, e.g. after a settings change
+          refresh: function() { restyle = true; schedule(); },
+          current: () => target
+        };
+      };
+"""
+
+
+# Page-side metrics: latency histograms bucketed exactly like core/metrics.py
+# (bucket_index), sent as sparse [index, count, ...] arrays to the tab's
+# 'metrics' channel object every REPORT_MS. Until start() is called (only when
+# Python registered that object) `on` is false and nothing is timed.
+METRICS_JS = r"""
+      const createPageMetrics = function() {
+        const SUB_BUCKET_BITS = 4, SUB_BUCKETS = 16, LINEAR_LIMIT = 32;
+        const REPORT_MS = 2000;
+        let sink = null;
+        let pending = {};
+        let dirty = false;
+
+        const bucketIndex = function(us) {
+          const v = Math.min(Math.max(0, Math.round(us)), 0xffffffff) >>> 0;
+          if (v < LINEAR_LIMIT) return v;
+          const shift = (32 - Math.clz32(v)) - SUB_BUCKET_BITS - 1;
+          return LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + ((v >>> shift) - SUB_BUCKETS);
+        };
+
+        const self = {
+          on: false,
+          record(name, ms) {
+            if (!self.on) return;
+            const buckets = pending[name] || (pending[name] = new Map());
+            const index = bucketIndex(ms * 1000);
+            buckets.set(index, (buckets.get(index) || 0) + 1);
+            dirty = true;
+          },
+          flush() {
+            if (!sink || !dirty) return;
+            const histograms = {};
+            Object.keys(pending).forEach(name => {
+              const flat = [];
+              pending[name].forEach((count, index) => flat.push(index, count));
+              histograms[name] = flat;
+            });
+            const heap = performance.memory ? Math.round(performance.memory.usedJSHeapSize / 1024) : null;
+            sink.report(JSON.stringify({ histograms: histograms, stats: window.__dyslexim_stats, heapKb: heap }));
+            pending = {};
+            dirty = false;
+          },
+          start(metricsObject) {
+            if (self.on) return;
+            sink = metricsObject;
+            self.on = true;
+            setInterval(self.flush, REPORT_MS);
+            window.addEventListener('pagehide', self.flush);
+          }
+        };
+        return self;
+      };
+"""
+
+
+# Focus Mode: switches off the page's own stylesheets. It lives in the page
+# for the document's lifetime. Turning it on walks document.styleSheets (and
+# the known shadow roots), not the DOM, so a 10k-node page costs about the
+# same as a small one. A MutationObserver disables sheets added later, and
+# turning it off restores exactly the sheets it disabled. Open shadow roots
+# are discovered in the background with an idle-time walk and remembered for
+# later toggles.
+FOCUS_MODE_JS = r"""
+      const createFocusMode = function() {
+        const SHEET_SELECTOR = 'style, link[rel~="stylesheet"]';
+        const disabledNodes = new Set();      // <style>/<link> elements we switched off
+        const savedAdopted = new Map();       // document or shadow root -> its adoptedStyleSheets
+        const shadowRoots = new Set();
+        let enabled = false;
+        let scanned = false;
+
+        const isOurs = node => node.getAttribute && node.getAttribute('data-dyslexim') === '1';
+
+        const disableNode = function(node) {
+          if (!node || isOurs(node) || disabledNodes.has(node)) return;
+          // Sheets the page switched off itself are left alone, so they stay off afterwards
+          if (node.sheet ? node.sheet.disabled : node.disabled) return;
+          node.disabled = true;
+          disabledNodes.add(node);
+        };
+
+        const disableRoot = function(root) {
+          for (const sheet of root.styleSheets) disableNode(sheet.ownerNode);
+          if (root.adoptedStyleSheets && root.adoptedStyleSheets.length) {
+            if (!savedAdopted.has(root)) savedAdopted.set(root, root.adoptedStyleSheets);
+            root.adoptedStyleSheets = [];
+          }
+        };
+
+        const addShadowRoot = function(root) {
+          if (shadowRoots.has(root)) return;
+          shadowRoots.add(root);
+          if (!enabled) return;
+          disableRoot(root);
+          observer.observe(root, { childList: true, subtree: true });
+        };
+
+        // Only the added subtree is looked at, so cost follows what the page inserts
+        const onAdded = function(node) {
+          if (node.nodeType !== 1) return;
+          if (node.matches(SHEET_SELECTOR)) disableNode(node);
+          if (node.shadowRoot) addShadowRoot(node.shadowRoot);
+          if (!node.firstElementChild) return;
+          node.querySelectorAll(SHEET_SELECTOR).forEach(disableNode);
+          for (const el of node.querySelectorAll('*')) if (el.shadowRoot) addShadowRoot(el.shadowRoot);
+        };
+
+        const observer = new MutationObserver(records => {
+          records.forEach(m => m.addedNodes.forEach(onAdded));
+          // adoptedStyleSheets assignments aren't observable; catch them on the next mutation
+          if (document.adoptedStyleSheets && document.adoptedStyleSheets.length) disableRoot(document);
+        });
+
+        // Finds open shadow roots that already existed, a slice at a time when the page is idle
+        const scanShadowRoots = function() {
+          if (scanned) return;
+          scanned = true;
+          const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+          const idle = window.requestIdleCallback || (cb => setTimeout(() => cb({ timeRemaining: () => 8 }), 16));
+          const step = function(deadline) {
+            let node;
+            while (deadline.timeRemaining() > 1 && (node = walker.nextNode())) {
+              if (node.shadowRoot) addShadowRoot(node.shadowRoot);
+            }
+            if (node) idle(step);
+          };
+          idle(step);
+        };
+
+        const enable = function() {
+          if (enabled) return;
+          enabled = true;
+          disableRoot(document);
+          shadowRoots.forEach(root => {
+            disableRoot(root);
+            observer.observe(root, { childList: true, subtree: true });
+          });
+          observer.observe(document.documentElement, { childList: true, subtree: true });
+          scanShadowRoots();
+        };
+
+        const disable = function() {
+          if (!enabled) return;
+          enabled = false;
+          observer.disconnect();
+          disabledNodes.forEach(node => { node.disabled = false; });
+          disabledNodes.clear();
+          savedAdopted.forEach((sheets, root) => {
+            // Keep anything the page adopted while Focus Mode was on
+            root.adoptedStyleSheets = sheets.concat(root.adoptedStyleSheets.filter(s => !sheets.includes(s)));
+          });
+          savedAdopted.clear();
+        };
+
+        return {
+          set: on => (on ? enable() : disable()),
+          isEnabled: () => enabled
+        };
+      };
+"""
+
+
+# Page-wide typography: the user's font and spacing on every readable block,
+# applied with one class and a stylesheet (no inline style writes). Blocks are
+# transformed only once they come within half a viewport of the screen
+# (IntersectionObserver), a slice at a time in idle callbacks; even handing the
+# blocks to the observer is spread over idle time on long pages. With
+# wordStemEmphasis the start of each word is wrapped in <dyslexim-b>, inside a
+# <dyslexim-w> that replaces the text node and remembers it for undoing. The
+# wrappers aren't TEXT_TAGS, so gaze hit testing still lands on the block.
+PAGE_TYPOGRAPHY_JS = r"""
+      const createPageTypography = function(cfg) {
+        const SELECTOR = 'p, li, dd, dt, blockquote, figcaption, caption, td, th, h1, h2, h3, h4, h5, h6';
+        const SKIP_TEXT = 'script, style, textarea, pre, code, kbd, samp, [contenteditable], dyslexim-w';
+        const OBSERVE_CHUNK = 256;
+        const WORD = /[\p{L}\p{N}]+/gu;
+        const idle = window.requestIdleCallback || (cb => setTimeout(() => cb({ timeRemaining: () => 8 }), 16));
+
+        const sheet = document.createElement('style');
+        sheet.setAttribute('data-dyslexim', '1');
+        const renderSheet = function() {
+          sheet.textContent = `
+            .__dyslexim_type,
+            .__dyslexim_type :is(span, a, em, strong, b, i, u, small, mark, cite, q, abbr, label, sup, sub):not([class*="icon"]):not([aria-hidden="true"]) {
+              font-family: '${cfg.font}', sans-serif !important;
+            }
+            .__dyslexim_type {
+              line-height: 1.8 !important;
+              letter-spacing: 0.04em !important;
+              word-spacing: 0.12em !important;
+            }
+            dyslexim-b { font-weight: 700; }
+          `;
+        };
+
+        let enabled = false;
+        let stems = false;
+        let done = new WeakSet();
+        const queued = new Set();    // near the viewport, waiting for idle time (in arrival order)
+        let toObserve = null;        // {list, index}: blocks not handed to the observer yet
+        let idleScheduled = false;
+
+        const stemLength = word => (word.length <= 3 ? 1 : Math.ceil(word.length * 0.4));
+
+        const emphasize = function(text) {
+          const wrapper = document.createElement('dyslexim-w');
+          const source = text.data;
+          let last = 0;
+          WORD.lastIndex = 0;
+          for (let m; (m = WORD.exec(source));) {
+            const word = m[0];
+            if (word.length < 2) continue;
+            if (m.index > last) wrapper.append(source.slice(last, m.index));
+            const stem = document.createElement('dyslexim-b');
+            stem.textContent = word.slice(0, stemLength(word));
+            wrapper.append(stem, word.slice(stem.textContent.length));
+            last = m.index + word.length;
+          }
+          if (!last) return;
+          if (last < source.length) wrapper.append(source.slice(last));
+          wrapper.__dyslexim_text = source;
+          text.replaceWith(wrapper);
+        };
+
+        const transform = function(el) {
+          intersection.unobserve(el);
+          if (!el.isConnected || done.has(el)) return;
+          done.add(el);
+          el.classList.add('__dyslexim_type');
+          window.__dyslexim_stats.typographyBlocks++;
+          if (!stems) return;
+          // Text directly in this block; nested blocks are transformed on their own
+          const texts = [];
+          const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+          for (let node; (node = walker.nextNode());) {
+            const parent = node.parentElement;
+            if (parent && !parent.closest(SKIP_TEXT) && parent.closest(SELECTOR) === el) texts.push(node);
+          }
+          texts.forEach(emphasize);
+        };
+
+        const step = function(deadline) {
+          idleScheduled = false;
+          if (!enabled) return;
+          for (const el of queued) {
+            if (deadline.timeRemaining() <= 1) break;
+            queued.delete(el);
+            transform(el);
+          }
+          while (toObserve && deadline.timeRemaining() > 1) {
+            const end = Math.min(toObserve.index + OBSERVE_CHUNK, toObserve.list.length);
+            for (let i = toObserve.index; i < end; i++) intersection.observe(toObserve.list[i]);
+            toObserve = end < toObserve.list.length ? { list: toObserve.list, index: end } : null;
+          }
+          if (queued.size || toObserve) schedule();
+        };
+        const schedule = function() {
+          if (idleScheduled) return;
+          idleScheduled = true;
+          idle(step, { timeout: 250 });
+        };
+
+        const intersection = new IntersectionObserver(entries => {
+          entries.forEach(e => {
+            if (e.isIntersecting && !done.has(e.target)) queued.add(e.target);
+          });
+          if (queued.size) schedule();
+        }, { rootMargin: '50% 0px' });
+
+        const observeTree = function(node) {
+          if (node.nodeType !== 1 || node.tagName.startsWith('DYSLEXIM-')) return;
+          if (node.matches(SELECTOR)) intersection.observe(node);
+          if (node.firstElementChild) node.querySelectorAll(SELECTOR).forEach(el => intersection.observe(el));
+        };
+        const mutations = new MutationObserver(records => {
+          if (enabled) records.forEach(m => m.addedNodes.forEach(observeTree));
+        });
+
+        const enable = function() {
+          enabled = true;
+          stems = !!cfg.wordStemEmphasis;
+          renderSheet();
+          (document.head || document.documentElement).appendChild(sheet);
+          toObserve = { list: document.querySelectorAll(SELECTOR), index: 0 };
+          mutations.observe(document.documentElement, { childList: true, subtree: true });
+          schedule();
+        };
+
+        const disable = function() {
+          enabled = false;
+          intersection.disconnect();
+          mutations.disconnect();
+          queued.clear();
+          toObserve = null;
+          document.querySelectorAll('dyslexim-w').forEach(w => {
+            if (w.__dyslexim_text !== undefined) w.replaceWith(document.createTextNode(w.__dyslexim_text));
+          });
+          document.querySelectorAll('.__dyslexim_type').forEach(el => el.classList.remove('__dyslexim_type'));
+          done = new WeakSet();
+          window.__dyslexim_stats.typographyBlocks = 0;
+          sheet.remove();
+        };
+
+        // Follows cfg.pageTypography / wordStemEmphasis / font
+        const sync = function() {
+          const want = !!cfg.pageTypography;
+          // Switching stems on or off redoes the blocks transformed so far
+          if (enabled && (!want || stems !== !!cfg.wordStemEmphasis)) disable();
+          if (want && !enabled) enable();
+          else if (enabled) renderSheet();
+        };
+
+        return {
+          sync: sync,
+          // After a single-page-app navigation rebuilt <head>
+          reattach: function() {
+            if (enabled && !sheet.isConnected) (document.head || document.documentElement).appendChild(sheet);
+          },
+          isEnabled: () => enabled
+        };
+      };
+"""
+
+# Text analysis: paragraphs that come within a viewport of the screen are sent,
+# a batch per idle callback, to the 'analysis' channel object, which works out
+# readability, syllables and rare words in background processes (see
+# core/text_analysis.py) and streams the annotations back as they finish.
+# Rare words are underlined through a CSS custom highlight (no DOM changes),
+# and hovering one shows its syllables. Hidden tabs send nothing until shown.
+TEXT_ANALYSIS_JS = r"""
+      const createTextAnalysis = function(cfg) {
+        const SELECTOR = 'p, li, dd, blockquote, figcaption, td';
+        const SKIP_TEXT = 'script, style, textarea, pre, code, kbd, samp, [contenteditable]';
+        const MIN_CHARS = 80;
+        const BATCH = 24;
+        const OBSERVE_CHUNK = 256;
+        const WORD = /\p{L}+(?:['’]\p{L}+)*/gu;
+        const LETTER = /[\p{L}'’]/u;
+        const idle = window.requestIdleCallback || (cb => setTimeout(() => cb({ timeRemaining: () => 8 }), 16));
+        const highlight = (typeof Highlight !== 'undefined' && window.CSS && CSS.highlights) ? new Highlight() : null;
+
+        const sheet = document.createElement('style');
+        sheet.setAttribute('data-dyslexim', '1');
+        sheet.textContent = `
+          ::highlight(dyslexim-rare) {
+            text-decoration: underline dotted currentColor;
+            text-decoration-thickness: 2px;
+            text-underline-offset: 3px;
+          }
+          .__dyslexim_syllables {
+            position: fixed; z-index: 2147483647; pointer-events: none;
+            padding: 2px 8px; border-radius: 4px;
+            background: #222; color: #fff; font: 16px/1.4 sans-serif; letter-spacing: 0.08em;
+          }
+        `;
+        const tip = document.createElement('div');
+        tip.className = '__dyslexim_syllables';
+        tip.setAttribute('data-dyslexim', '1');
+
+        let service = null;
+        let enabled = false;
+        let nextId = 1;
+        let seen = new WeakSet();
+        const sent = new Map();      // paragraph id -> element, until its annotations arrive
+        const queued = new Set();    // near the viewport, waiting for idle time
+        const marking = [];          // [element, Set of rare words] waiting to be underlined
+        const rare = new Map();      // rare word (lowercase) -> 'syl·la·bles'
+        let toObserve = null;
+        let idleScheduled = false;
+
+        const paragraphText = el => el.textContent.replace(/\s+/g, ' ').trim();
+
+        // Underlines `words` in `el`; a word may span text nodes ('<b>pho</b>tosynthesis')
+        const markRare = function(el, words) {
+          if (!el.isConnected) return;
+          const nodes = [], starts = [];
+          let text = '';
+          const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+          for (let node; (node = walker.nextNode());) {
+            const parent = node.parentElement;
+            if (parent && parent.closest(SKIP_TEXT)) continue;
+            nodes.push(node);
+            starts.push(text.length);
+            text += node.data;
+          }
+          let i = 0;
+          WORD.lastIndex = 0;
+          for (let m; (m = WORD.exec(text));) {
+            if (!words.has(m[0].toLowerCase())) continue;
+            const end = m.index + m[0].length;
+            while (i + 1 < nodes.length && starts[i + 1] <= m.index) i++;
+            let j = i;
+            while (j + 1 < nodes.length && starts[j + 1] < end) j++;
+            const range = new Range();
+            range.setStart(nodes[i], m.index - starts[i]);
+            range.setEnd(nodes[j], end - starts[j]);
+            highlight.add(range);
+            window.__dyslexim_stats.rareWords++;
+          }
+        };
+
+        const send = function(deadline) {
+          let batch = [];
+          for (const el of queued) {
+            if (deadline.timeRemaining() <= 1) break;
+            queued.delete(el);
+            intersection.unobserve(el);
+            if (!el.isConnected || seen.has(el) || el.closest(SKIP_TEXT)) continue;
+            seen.add(el);
+            const text = paragraphText(el);
+            if (text.length < MIN_CHARS) continue;
+            const id = nextId++;
+            sent.set(id, el);
+            batch.push([id, text]);
+            if (batch.length === BATCH) {
+              service.analyze(batch);
+              batch = [];
+            }
+          }
+          if (batch.length) service.analyze(batch);
+        };
+
+        const step = function(deadline) {
+          idleScheduled = false;
+          if (!enabled) return;
+          const visible = document.visibilityState === 'visible';
+          if (visible) send(deadline);
+          while (marking.length && deadline.timeRemaining() > 1) markRare(...marking.shift());
+          while (toObserve && deadline.timeRemaining() > 1) {
+            const end = Math.min(toObserve.index + OBSERVE_CHUNK, toObserve.list.length);
+            for (let i = toObserve.index; i < end; i++) intersection.observe(toObserve.list[i]);
+            toObserve = end < toObserve.list.length ? { list: toObserve.list, index: end } : null;
+          }
+          if ((visible && queued.size) || marking.length || toObserve) schedule();
+        };
+        const schedule = function() {
+          if (idleScheduled) return;
+          idleScheduled = true;
+          idle(step, { timeout: 500 });
+        };
+
+        const onAnnotated = function(annotations) {
+          if (!enabled) return;
+          annotations.forEach(a => {
+            const el = sent.get(a.id);
+            if (!el) return;
+            sent.delete(a.id);
+            window.__dyslexim_stats.analyzedBlocks++;
+            if (!highlight || !a.rare.length) return;
+            const words = new Set();
+            a.rare.forEach(([word, parts]) => {
+              rare.set(word, parts.join('·'));
+              words.add(word);
+            });
+            marking.push([el, words]);
+          });
+          if (marking.length) schedule();
+        };
+
+        // Syllables of the rare word under the pointer, once per frame at most
+        let pointer = null;
+        const showSyllables = function() {
+          const { x, y } = pointer;
+          pointer = null;
+          const caret = document.caretRangeFromPoint ? document.caretRangeFromPoint(x, y) : null;
+          const node = caret && caret.startContainer;
+          if (node && node.nodeType === Node.TEXT_NODE) {
+            const data = node.data;
+            let start = caret.startOffset, end = start;
+            while (start > 0 && LETTER.test(data[start - 1])) start--;
+            while (end < data.length && LETTER.test(data[end])) end++;
+            const parts = end > start ? rare.get(data.slice(start, end).toLowerCase()) : null;
+            if (parts) {
+              const word = document.createRange();
+              word.setStart(node, start);
+              word.setEnd(node, end);
+              const rect = word.getBoundingClientRect();
+              tip.textContent = parts;
+              tip.style.left = `${Math.round(rect.left)}px`;
+              tip.style.top = `${Math.round(Math.max(0, rect.top - 34))}px`;
+              if (!tip.isConnected) document.documentElement.appendChild(tip);
+              return;
+            }
+          }
+          tip.remove();
+        };
+        const onPointerMove = function(e) {
+          if (!rare.size) return;
+          if (!pointer) requestAnimationFrame(showSyllables);
+          pointer = { x: e.clientX, y: e.clientY };
+        };
+        const onVisibilityChange = function() {
+          if (document.visibilityState === 'visible' && queued.size) schedule();
+        };
+
+        const intersection = new IntersectionObserver(entries => {
+          entries.forEach(e => {
+            if (e.isIntersecting && !seen.has(e.target)) queued.add(e.target);
+          });
+          if (queued.size) schedule();
+        }, { rootMargin: '100% 0px' });
+
+        const observeTree = function(node) {
+          if (node.nodeType !== 1 || node.tagName.startsWith('DYSLEXIM-')) return;
+          if (node.matches(SELECTOR)) intersection.observe(node);
+          if (node.firstElementChild) node.querySelectorAll(SELECTOR).forEach(el => intersection.observe(el));
+        };
+        const mutations = new MutationObserver(records => {
+          if (enabled) records.forEach(m => m.addedNodes.forEach(observeTree));
+        });
+
+        const enable = function() {
+          enabled = true;
+          // Drops anything still on its way from before
+          service.reset();
+          (document.head || document.documentElement).appendChild(sheet);
+          if (highlight) CSS.highlights.set('dyslexim-rare', highlight);
+          toObserve = { list: document.querySelectorAll(SELECTOR), index: 0 };
+          mutations.observe(document.documentElement, { childList: true, subtree: true });
+          document.addEventListener('mousemove', onPointerMove, { passive: true });
+          document.addEventListener('visibilitychange', onVisibilityChange);
+          schedule();
+        };
+
+        const disable = function() {
+          enabled = false;
+          intersection.disconnect();
+          mutations.disconnect();
+          document.removeEventListener('mousemove', onPointerMove);
+          document.removeEventListener('visibilitychange', onVisibilityChange);
+          queued.clear();
+          sent.clear();
+          marking.length = 0;
+          rare.clear();
+          toObserve = null;
+          seen = new WeakSet();
+          if (highlight) {
+            highlight.clear();
+            CSS.highlights.delete('dyslexim-rare');
+          }
+          window.__dyslexim_stats.analyzedBlocks = 0;
+          window.__dyslexim_stats.rareWords = 0;
+          tip.remove();
+          sheet.remove();
+        };
+
+        // Follows cfg.textAnalysis, once the page has the 'analysis' channel object
+        const sync = function() {
+          const want = !!cfg.textAnalysis && !!service;
+          if (want && !enabled) enable();
+          else if (!want && enabled) disable();
+        };
+
+        return {
+          sync: sync,
+          connect: function(analysis) {
+            if (!analysis || !analysis.annotated) return;
+            service = analysis;
+            analysis.annotated.connect(onAnnotated);
+            sync();
+          },
+          reattach: function() {
+            if (enabled && !sheet.isConnected) (document.head || document.documentElement).appendChild(sheet);
+          }
+        };
+      };
+"""
+
+
+def get_js_gaze_handler(initial_config):
+    """
+    Returns the JavaScript gaze handler. Settings are not baked into the code:
+    `initial_config` only seeds window.__dyslexim_config, which is replaced
+    live whenever the settings change (see handler.settingsChanged).
+    """
     return f"""
     (function(){{
       if (window.__dyslexim_handler_installed) return;
       window.__dyslexim_handler_installed = true;
+      const installStart = performance.now();
       window.__dyslexim_prevEl = null;
-      let debounceTimeout;
+      let throttleTimeout = null;
       let ttsTimeout;
 
+      const cfg = window.__dyslexim_config = Object.assign({{
+        highlightColor: 'rgba(255, 200, 0, 0.35)',
+        font: 'Poppins',
+        highlightAlignment: 'center',
+        readingMask: true,
+        ttsHoverTime: 1.0,
+        hitTestMode: 'point',
+        snapTolerancePx: 24,
+        maskRenderer: 'auto',
+        highlightMode: 'typography',
+        pageTypography: false,
+        wordStemEmphasis: false,
+        textAnalysis: false
+      }}, {json.dumps(initial_config)});
+
       const TEXT_TAGS = ['P', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'SPAN', 'A', 'LI', 'TD', 'TH', 'CAPTION', 'PRE', 'CODE', 'BLOCKQUOTE'];
+      const TEXT_SELECTOR = TEXT_TAGS.map(t => t.toLowerCase()).join(',');
+
+      // Counters for replay/benchmarks: samples received, handled, and dropped by the throttle
+      // (superseded by a newer sample before their turn);
+      // for the indexed hit test, samples snapped to a nearby block and index rebuilds;
+      // frames that changed the highlight and layout reads forced by our own writes;
+      // how long this handler took to set itself up; blocks given page-wide typography;
+      // paragraphs text analysis has annotated, and rare words underlined in them
+      window.__dyslexim_stats = {{
+        received: 0, handled: 0, dropped: 0, snapped: 0, indexRebuilds: 0, indexBlocks: 0,
+        maskDowngraded: false, highlightFrames: 0, forcedLayouts: 0, installMs: 0, typographyBlocks: 0,
+        analyzedBlocks: 0, rareWords: 0
+      }};
+{METRICS_JS}
+      const metrics = createPageMetrics();
+{FRAME_JS}
+      const frame = createFrameScheduler();
+{TEXT_INDEX_JS}
+      let textIndex = null;
+      const syncTextIndex = function() {{
+        if (cfg.hitTestMode === 'indexed' && !textIndex) {{
+          textIndex = createTextIndex(TEXT_SELECTOR, frame);
+          textIndex.start();
+        }} else if (cfg.hitTestMode !== 'indexed' && textIndex) {{
+          textIndex.stop();
+          textIndex = null;
+        }}
+      }};
 
-      function debounce(func, delay) {{
+      const pointHitTest = function(x, y) {{
+        const el = frame.measure(() => document.elementFromPoint(x, y));
+        if (!el || el.tagName === 'BODY' || el.tagName === 'HTML') return null;
+        return TEXT_TAGS.includes(el.tagName) ? el : el.closest(TEXT_SELECTOR);
+      }};
+
+      // At most one call per `interval` ms: the first sample right away, then the latest
+      // of those that arrived in between. Unlike a trailing debounce, a steady stream of
+      // samples still moves the highlight instead of waiting for the eye to stop.
+      function throttle(func, interval) {{
+          let lastRun = -Infinity;
+          let pendingArgs = null;
+          const run = function() {{
+              throttleTimeout = null;
+              lastRun = performance.now();
+              const args = pendingArgs;
+              pendingArgs = null;
+              func.apply(null, args);
+          }};
           return function(...args) {{
-              clearTimeout(debounceTimeout);
-              debounceTimeout = setTimeout(() => func.apply(this, args), delay);
+              window.__dyslexim_stats.received++;
+              if (pendingArgs) window.__dyslexim_stats.dropped++;
+              pendingArgs = args;
+              if (throttleTimeout !== null) return;
+              throttleTimeout = setTimeout(run, Math.max(0, lastRun + interval - performance.now()));
           }};
       }}
 
-      const handleGaze = function(normX, normY) {{
-        try {{
-          const w = document.documentElement.clientWidth || window.innerWidth;
-          const h = document.documentElement.clientHeight || window.innerHeight;
-          const x = Math.round(Math.max(0, Math.min(1, normX)) * w);
-          const y = Math.round(Math.max(0, Math.min(1, normY)) * h);
-
-          let el = document.elementFromPoint(x, y);
+{READING_MASK_JS}
+      const readingMask = createReadingMask(cfg);
+{HIGHLIGHTER_JS}
+      const highlighter = createHighlighter(cfg, frame, readingMask);
+{TEXT_ANALYSIS_JS}
+      const textAnalysis = createTextAnalysis(cfg);
 
-          if (!el || el.tagName === 'BODY' || el.tagName === 'HTML') return;
+      // Speech goes to the offline engine (channel object 'tts') when Python has one,
+      // otherwise to the page's speechSynthesis
+      let ttsBackend = null;
+      let speaking = false;
+      const speak = function(text) {{
+        speaking = true;
+        if (ttsBackend) ttsBackend.speak(text);
+        else speechSynthesis.speak(new SpeechSynthesisUtterance(text));
+      }};
+      const cancelSpeech = function() {{
+        if (!speaking) return;
+        speaking = false;
+        if (ttsBackend) ttsBackend.stop();
+        else speechSynthesis.cancel();
+      }};
 
-          if (!TEXT_TAGS.includes(el.tagName)) {{
-              el = el.closest(TEXT_TAGS.map(t => t.toLowerCase()).join(','));
-          }}
+      const handleGaze = function(normX, normY) {{
+        try {{
+          // innerWidth/innerHeight don't need layout, unlike clientWidth/clientHeight
+          const x = Math.round(Math.max(0, Math.min(1, normX)) * window.innerWidth);
+          const y = Math.round(Math.max(0, Math.min(1, normY)) * window.innerHeight);
 
-          if (!el) return;
+          // Fall back to the point test until the index has measured something
+          let el = (textIndex && textIndex.size() > 0)
+            ? textIndex.hitTest(x, y, cfg.snapTolerancePx)
+            : pointHitTest(x, y);
 
-          if (window.__dyslexim_prevEl === el) return;
+          if (!el) return false;
 
-          if (window.__dyslexim_prevEl) {{
-            window.__dyslexim_prevEl.classList.remove('__dyslexim_highlight');
-            if (window.__dyslexim_prevEl.__dyslexim_prevStyles) {{
-              const prev = window.__dyslexim_prevEl.__dyslexim_prevStyles;
-              for (const k in prev) {{
-                window.__dyslexim_prevEl.style[k] = prev[k];
-              }}
-              window.__dyslexim_prevEl.__dyslexim_prevStyles = null;
-            }}
-          }}
+          if (window.__dyslexim_prevEl === el) return false;
 
           clearTimeout(ttsTimeout);
-          speechSynthesis.cancel();
+          cancelSpeech();
 
-          el.classList.add('__dyslexim_highlight');
-          el.__dyslexim_prevStyles = {{
-            lineHeight: el.style.lineHeight || '',
-            letterSpacing: el.style.letterSpacing || '',
-            backgroundColor: el.style.backgroundColor || '',
-            fontFamily: el.style.fontFamily || '',
-            textAlign: el.style.textAlign || ''
-          }};
-          el.style.transition = 'all 0.12s ease';
-          el.style.lineHeight = '1.8';
-          el.style.letterSpacing = '0.04em';
-          el.style.backgroundColor = 'rgba(255,255,0,0.03)';
-          el.style.fontFamily = `'{font}'`;
-          el.style.textAlign = '{alignment}';
+          highlighter.show(el);
 
           ttsTimeout = setTimeout(() => {{
             const text = el.innerText || el.textContent;
-            if (text) {{
-              const utterance = new SpeechSynthesisUtterance(text);
-              speechSynthesis.speak(utterance);
-            }}
-          }}, {tts_hover_time * 1000});
-
-          const rect = el.getBoundingClientRect();
-          if ({str(reading_mask).lower()}) {{
-            let readingMask = document.getElementById('__dyslexim_reading_mask');
-            if (!readingMask) {{
-                readingMask = document.createElement('div');
-                readingMask.id = '__dyslexim_reading_mask';
-                readingMask.style.position = 'fixed';
-                readingMask.style.top = '0';
-                readingMask.style.left = '0';
-                readingMask.style.width = '100vw';
-                readingMask.style.height = '100vh';
-                readingMask.style.pointerEvents = 'none';
-                readingMask.style.zIndex = '999999';
-                readingMask.style.transition = 'all 0.2s ease-in-out';
-                readingMask.style.boxShadow = '0 0 0 9999px rgba(0,0,0,0.7)';
-                readingMask.style.backdropFilter = 'blur(5px)';
-                document.body.appendChild(readingMask);
-            }}
-            const padding = 10;
-            readingMask.style.clipPath = `polygon(0 0, 100% 0, 100% 100%, 0 100%, 0 0, ${{rect.left - padding}}px ${{rect.top - padding}}px, ${{rect.left - padding}}px ${{rect.bottom + padding}}px, ${{rect.right + padding}}px ${{rect.bottom + padding}}px, ${{rect.right + padding}}px ${{rect.top - padding}}px, ${{rect.left - padding}}px ${{rect.top - padding}}px)`;
-
-          }} else {{
-            let readingMask = document.getElementById('__dyslexim_reading_mask');
-            if (readingMask) {{
-                readingMask.remove();
-            }}
-          }}
-
-          if (rect.top < 24 || rect.bottom > h - 24) {{
-            el.scrollIntoView({{behavior:'smooth', block:'center'}});
-          }}
+            if (text && text.trim()) speak(text);
+          }}, cfg.ttsHoverTime * 1000);
 
           window.__dyslexim_prevEl = el;
+          return true;
         }} catch (e) {{
           // console.error('Dyslexim gaze handler error', e);
+          return false;
         }}
       }};
 
-      window.__dyslexim_handleGaze = debounce(handleGaze, 50);
+      // Acks are only sent when Python asked for latency reporting (gaze.latencyReporting)
+      window.__dyslexim_gazeAck = null;
 
-      window.__dyslexim_clearHighlight = function() {{
-        if (window.__dyslexim_prevEl) {{
-          window.__dyslexim_prevEl.classList.remove('__dyslexim_highlight');
-          if (window.__dyslexim_prevEl.__dyslexim_prevStyles) {{
-            const prev = window.__dyslexim_prevEl.__dyslexim_prevStyles;
-            for (const k in prev) {{
-              window.__dyslexim_prevEl.style[k] = prev[k];
-            }}
-            window.__dyslexim_prevEl.__dyslexim_prevStyles = null;
+      const handleGazeSample = function(normX, normY, sampleTime) {{
+        window.__dyslexim_stats.handled++;
+        if (!metrics.on) {{
+          handleGaze(normX, normY);
+        }} else {{
+          const start = performance.now();
+          const changed = handleGaze(normX, normY);
+          metrics.record('handleGaze', performance.now() - start);
+          if (changed) {{
+            requestAnimationFrame(() => setTimeout(() => metrics.record('highlightToPaint', performance.now() - start), 0));
           }}
         }}
-        let readingMask = document.getElementById('__dyslexim_reading_mask');
-        if (readingMask) {{
-          readingMask.remove();
+        const ack = window.__dyslexim_gazeAck;
+        if (ack && sampleTime) {{
+          // Report once the frame with the new highlight has been produced
+          requestAnimationFrame(() => setTimeout(() => ack(sampleTime), 0));
+        }}
+      }};
+
+      window.__dyslexim_handleGaze = throttle(handleGazeSample, {GAZE_THROTTLE_MS});
+      // Unthrottled, for bench/suite.py: returns true if the highlight moved
+      window.__dyslexim_handleGazeNow = handleGaze;
+
+      // --- Gaze stream: batched [x, y, t, ...] samples pushed from Python over QWebChannel ---
+      window.__dyslexim_onGazeBatch = function(batch) {{
+        for (let i = 0; i + 2 < batch.length; i += 3) {{
+          window.__dyslexim_handleGaze(batch[i], batch[i + 1], batch[i + 2]);
         }}
-        speechSynthesis.cancel();
+      }};
+
+      window.__dyslexim_withChannel = function(cb) {{
+        if (window.__dyslexim_channel) {{ cb(window.__dyslexim_channel); return; }}
+        (window.__dyslexim_channelWaiters = window.__dyslexim_channelWaiters || []).push(cb);
+        if (window.__dyslexim_channelPending) return;
+        // Pages that open their own QWebChannel publish it as __dyslexim_channel instead
+        if (document.querySelector('script[src$="qwebchannel.js"]')) return;
+        if (typeof qt === 'undefined' || !qt.webChannelTransport || typeof QWebChannel === 'undefined') return;
+        window.__dyslexim_channelPending = true;
+        new QWebChannel(qt.webChannelTransport, function(channel) {{
+          window.__dyslexim_channel = channel;
+          window.__dyslexim_channelWaiters.forEach(w => w(channel));
+          window.__dyslexim_channelWaiters = [];
+        }});
+      }};
+
+      window.__dyslexim_clearHighlight = function() {{
+        highlighter.clear();
+        clearTimeout(ttsTimeout);
+        cancelSpeech();
         window.__dyslexim_prevEl = null;
       }};
 
-      (function() {{
-        const style = document.createElement('style');
-        style.setAttribute('data-dyslexim', '1');
-        style.textContent = `
+      const highlightStyle = document.createElement('style');
+      highlightStyle.setAttribute('data-dyslexim', '1');
+      const renderHighlightStyle = function() {{
+        highlightStyle.textContent = `
           .__dyslexim_highlight {{
-            outline: 3px solid {highlight_color} !important;
+            outline: 3px solid ${{cfg.highlightColor}} !important;
             outline-offset: 3px !important;
             background-color: rgba(255,255,0,0.04) !important;
             transition: outline 0.12s ease, background-color 0.12s ease !important;
-            box-shadow: 0 0 15px {highlight_color};
+            box-shadow: 0 0 15px ${{cfg.highlightColor}};
+          }}
+          .__dyslexim_highlight_stable {{
+            outline: 3px solid ${{cfg.highlightColor}} !important;
+            outline-offset: 3px !important;
+            background-color: rgba(255,255,0,0.04) !important;
+          }}
+          ::highlight(dyslexim) {{
+            background-color: ${{cfg.highlightColor}};
           }}
         `;
-        document.head && document.head.appendChild(style);
-      }})();
+      }};
+      renderHighlightStyle();
+      (document.head || document.documentElement).appendChild(highlightStyle);
+
+      // Bundled fonts (OpenDyslexic) come from dyslexim://, linked only once the user picks one
+      const BUNDLED_FONTS = {json.dumps(sorted(BUNDLED_FONT_FAMILIES))};
+      let fontsLink = null;
+      const syncFontsLink = function() {{
+        if (BUNDLED_FONTS.indexOf(cfg.font) < 0 || (fontsLink && fontsLink.isConnected)) return;
+        if (!fontsLink) {{
+          fontsLink = document.createElement('link');
+          fontsLink.rel = 'stylesheet';
+          fontsLink.href = {json.dumps(FONTS_CSS_URL)};
+          fontsLink.setAttribute('data-dyslexim', '1');
+        }}
+        (document.head || document.documentElement).appendChild(fontsLink);
+      }};
+      syncFontsLink();
+
+{FOCUS_MODE_JS}
+      window.__dyslexim_focusMode = createFocusMode();
+{PAGE_TYPOGRAPHY_JS}
+      const pageTypography = createPageTypography(cfg);
+
+      // --- Live settings: restyle the current highlight in place, no reload ---
+      window.__dyslexim_applyConfig = function(next) {{
+        if (!next) return;
+        Object.assign(cfg, next);
+        syncTextIndex();
+        renderHighlightStyle();
+        syncFontsLink();
+        pageTypography.sync();
+        textAnalysis.sync();
+        highlighter.refresh();
+      }};
+
+      // --- Re-attach after single-page-app route changes ---
+      // The document survives, but the app may have swapped out the highlighted
+      // element or rebuilt <head>; restore our state instead of re-injecting.
+      const reattach = function() {{
+        if (window.__dyslexim_prevEl && !document.contains(window.__dyslexim_prevEl)) {{
+          window.__dyslexim_clearHighlight();
+        }}
+        if (!highlightStyle.isConnected) {{
+          (document.head || document.documentElement).appendChild(highlightStyle);
+        }}
+        syncFontsLink();
+        pageTypography.reattach();
+        textAnalysis.reattach();
+      }};
+      if (window.navigation) {{
+        window.navigation.addEventListener('navigatesuccess', reattach);
+      }}
+      window.addEventListener('popstate', reattach);
+      window.addEventListener('hashchange', reattach);
 
+      syncTextIndex();
+      pageTypography.sync();
+      // Reported once the channel is up (metrics only start then)
+      const installDuration = performance.now() - installStart;
+      window.__dyslexim_stats.installMs = installDuration;
+
+      // Subscribed last: the channel may already be connected (a page that
+      // opened its own), and then the callback runs right away and needs
+      // everything above, including __dyslexim_applyConfig
+      window.__dyslexim_withChannel(function(channel) {{
+        const gaze = channel.objects.gaze;
+        if (gaze && gaze.samples) gaze.samples.connect(window.__dyslexim_onGazeBatch);
+        if (gaze && gaze.latencyReporting) window.__dyslexim_gazeAck = t => gaze.sampleHandled(t);
+        if (gaze && gaze.handlerInstalled) gaze.handlerInstalled(installDuration);
+        if (channel.objects.tts && channel.objects.tts.available) ttsBackend = channel.objects.tts;
+        if (channel.objects.metrics) {{
+          metrics.start(channel.objects.metrics);
+          metrics.record('handlerInstall', installDuration);
+        }}
+        textAnalysis.connect(channel.objects.analysis);
+
+        // One settingsChanged emit in Python reaches every open tab
+        const handler = channel.objects.handler;
+        if (handler && handler.settingsChanged) {{
+          window.__dyslexim_applyConfig(handler.settings);
+          handler.settingsChanged.connect(window.__dyslexim_applyConfig);
+        }}
+      }});
     }})();
     """
 
 def get_focus_mode_js(is_enabled):
-    """Returns JavaScript to toggle focus mode (removing/restoring styles)."""
-    if is_enabled:
-        return """
-        (function() {
-            document.querySelectorAll('style, link[rel="stylesheet"]').forEach(el => {
-                if (el.getAttribute('data-dyslexim') !== '1') {
-                    el.setAttribute('data-dyslexim-disabled', 'true');
-                    el.disabled = true;
-                }
-            });
-        })();
-        """
-    else:
-        return """
-        (function() {
-            document.querySelectorAll('[data-dyslexim-disabled="true"]').forEach(el => {
-                el.disabled = false;
-                el.removeAttribute('data-dyslexim-disabled');
-            });
-        })();
-        """
\ No newline at end of file
+    """Returns JavaScript that turns the page's Focus Mode component on or off."""
+    state = 'true' if is_enabled else 'false'
+    return f"window.__dyslexim_focusMode && window.__dyslexim_focusMode.set({state});"
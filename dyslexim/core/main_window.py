@@ -1,42 +1,74 @@
 from functools import partial
 import json
+import os
+import time
 
-from PyQt6.QtCore import Qt, QTimer, QUrl, QObject, pyqtSlot, QSize
-from PyQt6.QtGui import QAction, QIcon, QCursor, QPixmap, QImage
+from PyQt6.QtCore import Qt, QTimer, QUrl, QObject, pyqtSlot, pyqtSignal, pyqtProperty, QSize, QEvent, QPointF
+from PyQt6.QtGui import QAction, QGuiApplication, QStandardItem, QStandardItemModel
 from PyQt6.QtWidgets import (
     QMainWindow, QToolBar, QLineEdit, QTabWidget, QWidget,
-    QPushButton, QSizePolicy, QStyle, QStatusBar
+    QPushButton, QSizePolicy, QStyle, QStatusBar, QCompleter
 )
 from PyQt6.QtWebEngineCore import QWebEnginePage
 from PyQt6.QtWebChannel import QWebChannel
 
 from .browser_tab import BrowserTab, BrowserView
 from .config import (
-    HOME_URL, INJECT_DELAY_MS, GAZE_UPDATE_INTERVAL_MS,
-    load_config, save_config, config, POST_ONBOARDING_URL,
-    SETTINGS_URL, SEARCH_ENGINES
+    HOME_URL, GAZE_UPDATE_INTERVAL_MS,
+    GAZE_IDLE_INTERVAL_MS, GAZE_IDLE_AFTER_MS, DEFAULT_GAZE_MOVE_THRESHOLD,
+    DEFAULT_PROFILE_MODE, DEFAULT_HTTP_CACHE_SIZE_MB,
+    DEFAULT_TAB_MEMORY_BUDGET_MB, TAB_FREEZE_AFTER_S, TAB_LIFECYCLE_CHECK_MS,
+    DEFAULT_RESTORE_SESSION, DEFAULT_CONTENT_BLOCKING, get_user_data_dir, get_asset_path,
+    config_store, config, POST_ONBOARDING_URL,
+    SETTINGS_URL, SEARCH_ENGINES, DEFAULT_TTS_ENGINE, DEFAULT_TTS_VOICE, DEFAULT_TTS_RATE
 )
-from .js_handler import get_js_gaze_handler, get_focus_mode_js
+from .gaze_dispatcher import GazeDispatcher
+from .gaze_sources import create_gaze_source
+from .gaze_trace import GazeTraceRecorder
+from .profiles import ProfileManager
+from .startup import startup_timeline
+from .tab_lifecycle import TabLifecycleManager
+from .tts import TTSService
+from .reader import ReaderExtractor, render_reader_document
+from .text_analysis import TextAnalyzer, TextAnalysisStream
+from .assets import load_icon, load_theme_qss
+from .js_handler import get_focus_mode_js, get_runtime_config, RUNTIME_CONFIG_KEYS
+from .scripts import install_gaze_scripts
+from .scheme import SCHEME, DysleximSchemeHandler
+from .session import SessionStore
+from .history import History
+from .adblock import ContentBlocker, find_filter_lists
+from .metrics import metrics, PageMetricsReceiver, render_metrics_page
 
 
 class WebChannelHandler(QObject):
     """Handles JS-to-Python communication for settings."""
-    
+
+    # Broadcast to every open tab's gaze handler when the settings change
+    settingsChanged = pyqtSignal('QVariantMap')
+
+    @pyqtProperty('QVariantMap', notify=settingsChanged)
+    def settings(self):
+        """The settings the page-side gaze handler reads (see get_runtime_config)."""
+        return get_runtime_config(config)
+
     @pyqtSlot(str, str, str, bool, float, str)
     def saveSettings(self, color, font, alignment, readingMask, ttsHoverTime, searchEngine):
         """Called by JS from the onboarding/settings page."""
-        config['highlightColor'] = color
-        config['font'] = font
-        config['highlightAlignment'] = alignment
-        config['readingMask'] = readingMask
-        config['ttsHoverTime'] = ttsHoverTime
-        config['searchEngine'] = searchEngine
-        config['onboarding_complete'] = True
-        save_config(config)
-        load_config() # Reload the config
-        
+        # Subscribers (the window, and through it every open tab) hear about it right away;
+        # the file is written in the background
+        config_store.update({
+            'highlightColor': color,
+            'font': font,
+            'highlightAlignment': alignment,
+            'readingMask': readingMask,
+            'ttsHoverTime': ttsHoverTime,
+            'searchEngine': searchEngine,
+            'onboarding_complete': True,
+        })
+
         if self.parent():
-            self.parent().reload_all_tabs_after_settings_change()
+            self.parent().leave_settings_pages()
 
     @pyqtSlot(result=str)
     def loadSettings(self):
@@ -56,13 +88,35 @@ class WebChannelHandler(QObject):
 class DysleximMainWindow(QMainWindow):
     """The main application window, managing tabs and the toolbar."""
 
-    def __init__(self):
+    def __init__(self, gaze_source=None, start_urls=None, record_trace=None, latency_reporting=False):
         super().__init__()
         self.setWindowTitle("Dyslexim")
         self.resize(1366, 768)
-        
-        # Load custom SVG icons
-        self.load_icons()
+
+        # Toolbar icons and the theme are loaded after the first paint (see _start_deferred_services)
+        self.icons_loaded = False
+
+        # Where gaze samples come from: the mouse, an eye tracker socket or a trace file
+        screen = QGuiApplication.primaryScreen().geometry()
+        self.gaze_source = create_gaze_source(
+            gaze_source, (screen.x(), screen.y(), screen.width(), screen.height())
+        )
+
+        # Optional gaze trace recording (--record-trace) and latency acks for replay
+        self.record_trace_path = record_trace
+        self.gaze_recorder = GazeTraceRecorder() if record_trace else None
+        # With metrics on, every tab acks painted samples so sample-to-paint time is recorded
+        self.latency_reporting = latency_reporting or metrics.enabled
+
+        # Gaze samples are change-detected and the polling rate adapts to movement
+        self.gaze_dispatcher = GazeDispatcher(
+            self.dispatch_gaze_to_active_tab,
+            threshold=config.get('gazeMoveThreshold', DEFAULT_GAZE_MOVE_THRESHOLD),
+            active_interval_ms=GAZE_UPDATE_INTERVAL_MS,
+            idle_interval_ms=GAZE_IDLE_INTERVAL_MS,
+            idle_after_ms=GAZE_IDLE_AFTER_MS,
+            parent=self,
+        )
 
         self.tabs = QTabWidget()
         self.tabs.setDocumentMode(True)
@@ -70,10 +124,44 @@ class DysleximMainWindow(QMainWindow):
         self.tabs.setMovable(True) # Allow re-ordering tabs
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.tabs.tabBar().tabMoved.connect(lambda _from, _to: self.save_tab_order())
         self.setCentralWidget(self.tabs)
+
+        # Tabs share profiles from the manager; created after the tab widget so
+        # pages are torn down before the profiles they use
+        self.profile_manager = ProfileManager(
+            mode=config.get('profileMode', DEFAULT_PROFILE_MODE),
+            http_cache_size_mb=config.get('httpCacheSizeMb', DEFAULT_HTTP_CACHE_SIZE_MB),
+            parent=self,
+        )
+        # The gaze handler is registered once per profile instead of injected per load
+        self.profile_manager.profileCreated.connect(lambda profile: install_gaze_scripts(profile, config))
+        # Local pages, fonts and reader documents are served from memory over dyslexim://
+        self.scheme_handler = DysleximSchemeHandler(self)
+        self.profile_manager.profileCreated.connect(
+            lambda profile: profile.installUrlSchemeHandler(SCHEME, self.scheme_handler)
+        )
+        self.scheme_handler.register_page('metrics', self.serve_metrics_page)
+        # Ads and trackers are blocked by an interceptor on each tab's page (so
+        # counts are per tab); the filter lists are compiled in the background
+        self.content_blocker = ContentBlocker(
+            find_filter_lists([get_asset_path(os.path.join('assets', 'filters')), get_user_data_dir('filters')]),
+            os.path.join(get_user_data_dir('adblock'), 'compiled.pickle'),
+            enabled=config.get('contentBlocking', DEFAULT_CONTENT_BLOCKING),
+            parent=self,
+        )
+
+        # Idle background tabs are frozen, then discarded (LRU) when over the memory budget
+        self.tab_lifecycle = TabLifecycleManager(
+            self.tabs,
+            memory_budget_mb=config.get('tabMemoryBudgetMb', DEFAULT_TAB_MEMORY_BUDGET_MB),
+            freeze_after_s=TAB_FREEZE_AFTER_S,
+            check_interval_ms=TAB_LIFECYCLE_CHECK_MS,
+            parent=self,
+        )
         
         # --- NEW: Add "+" button to tab bar corner ---
-        self.new_tab_btn = QPushButton(self.plus_icon, "")
+        self.new_tab_btn = QPushButton("")
         self.new_tab_btn.setToolTip("New Tab")
         self.new_tab_btn.setObjectName("newtab_corner_btn")
         self.new_tab_btn.clicked.connect(lambda: self.add_new_tab(POST_ONBOARDING_URL, "New Tab"))
@@ -89,237 +177,111 @@ class DysleximMainWindow(QMainWindow):
         self.setStatusBar(self.status)
         self.status.showMessage("Welcome to Dyslexim.")
 
-        # Set up the web channel
-        self.channel = QWebChannel(self)
+        # Shared JS-to-Python handler, registered on every tab's web channel
         self.handler = WebChannelHandler(self)
-        self.channel.registerObject('handler', self.handler)
-
-        # Always open home.html first, then Google page
-        self.add_new_tab(HOME_URL, "Welcome")
-        self.add_new_tab(POST_ONBOARDING_URL, "Home")
-        # Switch back to the first tab (home.html)
-        self.tabs.setCurrentIndex(0)
-
-        self.gaze_timer = QTimer(self)
-        self.gaze_timer.timeout.connect(self.dispatch_gaze_to_active_tab)
-        self.gaze_timer.start(GAZE_UPDATE_INTERVAL_MS)
 
+        # Settings changes (from any page, or anything else that updates the store)
+        config_store.subscribe(self.on_settings_changed)
+
+        # Reader view: article extraction runs in a worker process, results are cached
+        self.reader = ReaderExtractor(self)
+        self.reader.ready.connect(self.on_reader_article_ready)
+
+        # Readability, syllables and rare words for every tab, in a pool of worker processes
+        self.text_analyzer = TextAnalyzer(parent=self)
+
+        # Offline TTS shared by all tabs; None leaves pages on speechSynthesis
+        self.tts = None
+        if config.get('ttsEngine', DEFAULT_TTS_ENGINE) != 'browser':
+            self.tts = TTSService(
+                voice=config.get('ttsVoice', DEFAULT_TTS_VOICE),
+                rate=config.get('ttsRate', DEFAULT_TTS_RATE),
+                parent=self,
+            )
+
+        # Open tabs are saved as they change; explicit start URLs (bench runs) and
+        # private mode leave the saved session alone
+        self.session = None
+        if start_urls is None and config.get('profileMode', DEFAULT_PROFILE_MODE) != 'private':
+            self.session = SessionStore(os.path.join(get_user_data_dir('session'), 'session.sqlite3'))
+
+        # Visited pages feed the address bar suggestions; same rules as the session
+        self.history = None
+        if start_urls is None and config.get('profileMode', DEFAULT_PROFILE_MODE) != 'private':
+            self.history = History(os.path.join(get_user_data_dir('history'), 'history.sqlite3'), parent=self)
+
+        if not self.restore_session():
+            # Always open home.html first, then Google page; only the first tab loads now,
+            # the others are placeholders until they are shown
+            for i, (url, label) in enumerate(start_urls or [(HOME_URL, "Welcome"), (POST_ONBOARDING_URL, "Home")]):
+                self.add_new_tab(url, label, lazy=i > 0)
+            # Switch back to the first tab (home.html)
+            self.tabs.setCurrentIndex(0)
+
+        # Work not needed for the first paint runs once the event loop is up
+        QTimer.singleShot(0, self._start_deferred_services)
+
+    def _start_deferred_services(self):
+        """Loads the theme and icons and starts gaze input and dispatch, after the window has been shown."""
         self.set_stylesheet()
+        self.load_icons()
+        startup_timeline.mark('theme and icons loaded')
+        self.gaze_source.start()
+        self.gaze_dispatcher.start()
 
     def load_icons(self):
-        """Loads and stores custom SVG icons from hardcoded data with white color for dark theme."""
-        self.back_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><line x1="19" y1="12" x2="5" y2="12"></line><polyline points="12 19 5 12 12 5"></polyline></svg>')
-        self.fwd_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><line x1="5" y1="12" x2="19" y2="12"></line><polyline points="12 5 19 12 12 19"></polyline></svg>')
-        self.reload_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M21 12a9 9 0 1 1-9-9c2.52 0 4.93 1 6.74 2.74L21 8"/><path d="M21 3v5h-5"/></svg>')
-        self.home_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M15 21v-8a1 1 0 0 0-1-1h-4a1 1 0 0 0-1 1v8"/><path d="M3 10a2 2 0 0 1 .709-1.528l7-6a2 2 0 0 1 2.582 0l7 6A2 2 0 0 1 21 10v9a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2z"/></svg>')
-        self.settings_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M9.671 4.136a2.34 2.34 0 0 1 4.659 0 2.34 2.34 0 0 0 3.319 1.915 2.34 2.34 0 0 1 2.33 4.033 2.34 2.34 0 0 0 0 3.831 2.34 2.34 0 0 1-2.33 4.033 2.34 2.34 0 0 0-3.319 1.915 2.34 2.34 0 0 1-4.659 0 2.34 2.34 0 0 0-3.32-1.915 2.34 2.34 0 0 1-2.33-4.033 2.34 2.34 0 0 0 0-3.831A2.34 2.34 0 0 1 6.35 6.051a2.34 2.34 0 0 0 3.319-1.915"/><circle cx="12" cy="12" r="3"/></svg>')
-        self.gaze_on_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M2.062 12.348a1 1 0 0 1 0-.696 10.75 10.75 0 0 1 19.876 0 1 1 0 0 1 0 .696 10.75 10.75 0 0 1-19.876 0"/><circle cx="12" cy="12" r="3"/></svg>')
-        self.gaze_off_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M10.733 5.076a10.744 10.744 0 0 1 11.205 6.575 1 1 0 0 1 0 .696 10.747 10.747 0 0 1-1.444 2.49"/><path d="M14.084 14.158a3 3 0 0 1-4.242-4.242"/><path d="M17.479 17.499a10.75 10.75 0 0 1-15.417-5.151 1 1 0 0 1 0-.696 10.75 10.75 0 0 1 4.446-5.143"/><path d="m2 2 20 20"/></svg>')
-        self.focus_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="12" cy="12" r="10"/><circle cx="12" cy="12" r="6"/><circle cx="12" cy="12" r="2"/></svg>')
-        self.plus_icon = self._create_icon_from_svg('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#c9d1d9" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M5 12h14"/><path d="M12 5v14"/></svg>')
-
-    def _create_icon_from_svg(self, svg_data):
-        """Creates a QIcon from SVG data."""
-        image = QImage.fromData(svg_data.encode('utf-8'))
-        pixmap = QPixmap.fromImage(image)
-        return QIcon(pixmap)
-
+        """Loads the toolbar icons (pre-rendered per device-pixel-ratio and cached on disk) and puts them on the buttons."""
+        self.back_icon = load_icon('arrow-left')
+        self.fwd_icon = load_icon('arrow-right')
+        self.reload_icon = load_icon('rotate-cw')
+        self.home_icon = load_icon('home')
+        self.settings_icon = load_icon('settings')
+        self.gaze_on_icon = load_icon('eye')
+        self.gaze_off_icon = load_icon('eye-off')
+        self.reader_icon = load_icon('book-open')
+        self.focus_icon = load_icon('target')
+        self.plus_icon = load_icon('plus')
+        self.icons_loaded = True
+        for button, icon in (
+            (self.act_back, self.back_icon), (self.act_fwd, self.fwd_icon), (self.act_reload, self.reload_icon),
+            (self.act_home, self.home_icon), (self.focus_btn, self.focus_icon), (self.reader_btn, self.reader_icon),
+            (self.settings_btn, self.settings_icon), (self.new_tab_btn, self.plus_icon),
+        ):
+            button.setIcon(icon)
+        self.update_gaze_button(self.current_tab())
+
+    def update_gaze_button(self, tab):
+        """Shows the open or crossed-out eye for `tab`'s gaze highlighting."""
+        if self.icons_loaded and tab is not None:
+            self.gaze_btn.setIcon(self.gaze_on_icon if tab.gaze_enabled else self.gaze_off_icon)
 
     def set_stylesheet(self):
-        """Sets the modern dark-mode stylesheet based on design tokens."""
-        self.setStyleSheet("""
-            /* --- Modern Design System (Edge-inspired Dark Theme) --- */
-            
-            /* --- Base Window --- */
-            QMainWindow { 
-                background: #0d1117;
-            }
-            QStatusBar {
-                background: #161b22;
-                border-top: 1px solid #30363d;
-                color: #8b949e;
-                padding: 4px 8px;
-                font-size: 12px;
-            }
-
-            /* --- Toolbar --- */
-            QToolBar { 
-                background: #0d1117;
-                border-bottom: 1px solid #30363d;
-                spacing: 4px; 
-                padding: 8px 12px;
-                margin: 0px;
-            }
-            
-            /* --- URL Bar (Address Bar) --- */
-            QLineEdit { 
-                background: #161b22;
-                color: #c9d1d9;
-                border: 1px solid #30363d;
-                padding: 10px 14px; 
-                border-radius: 8px;
-                font-size: 13px;
-                selection-background-color: #0a84ff;
-                selection-color: #ffffff;
-                margin: 0px 2px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0a84ff;
-                background: #1f2937;
-            }
-            QLineEdit:hover {
-                border: 1px solid #424a53;
-            }
-            
-            /* --- Tab Widget --- */
-            QTabWidget::pane { 
-                border-top: 1px solid #30363d;
-                background: #0d1117;
-                margin-top: -1px;
-            }
-            QTabBar {
-                background: #0d1117;
-                border-bottom: 1px solid #30363d;
-            }
-            QTabBar::tab { 
-                background: #161b22;
-                color: #8b949e;
-                padding: 10px 16px; 
-                border: 1px solid #30363d;
-                border-bottom: none; 
-                border-top-left-radius: 8px; 
-                border-top-right-radius: 8px;
-                margin-right: 2px;
-                font-weight: 500;
-                font-size: 13px;
-            }
-            QTabBar::tab:hover {
-                background: #1f2937;
-                color: #c9d1d9;
-            }
-            QTabBar::tab:selected { 
-                background: #0d1117;
-                color: #f0f6fc;
-                border-bottom: 2px solid #0d1117;
-                font-weight: 600;
-            }
-            QTabBar::close-button {
-                margin-left: 6px;
-            }
-            QTabBar::close-button:hover {
-                background: #30363d;
-                border-radius: 3px;
-            }
-            
-            /* --- Tab Bar Scrollers --- */
-            QTabBar QToolButton {
-                background: transparent;
-                border: none;
-                padding: 4px;
-                border-radius: 4px;
-            }
-            QTabBar QToolButton:hover {
-                background: #1f2937;
-            }
-            
-            /* --- New Tab Button in Corner --- */
-            QTabBar::corner-widget {
-                padding-right: 8px;
-                padding-top: 2px;
-            }
-            QPushButton#newtab_corner_btn {
-                background: transparent;
-                border: none;
-                padding: 6px;
-                border-radius: 6px;
-                color: #8b949e;
-            }
-            QPushButton#newtab_corner_btn:hover {
-                background: #1f2937;
-                color: #c9d1d9;
-            }
-            QPushButton#newtab_corner_btn:pressed {
-                background: #30363d;
-            }
-            
-            /* --- Toolbar Buttons (Icons) --- */
-            QToolBar > QPushButton {
-                background: transparent;
-                border: none;
-                padding: 6px 8px;
-                border-radius: 6px;
-                color: #8b949e;
-            }
-            QToolBar > QPushButton:hover {
-                background: #1f2937;
-                color: #c9d1d9;
-            }
-            QToolBar > QPushButton:pressed {
-                background: #30363d;
-            }
-            QToolBar > QPushButton:checked {
-                background: #0a84ff;
-                color: #ffffff;
-            }
-            
-            /* --- Scrollbars --- */
-            QScrollBar:vertical {
-                background: #0d1117;
-                width: 12px;
-                border: none;
-            }
-            QScrollBar::handle:vertical {
-                background: #30363d;
-                border-radius: 6px;
-                min-height: 40px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #424a53;
-            }
-            
-            QScrollBar:horizontal {
-                background: #0d1117;
-                height: 12px;
-                border: none;
-            }
-            QScrollBar::handle:horizontal {
-                background: #30363d;
-                border-radius: 6px;
-                min-width: 40px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: #424a53;
-            }
-            
-            QScrollBar::sub-line, QScrollBar::add-line {
-                border: none;
-                background: none;
-            }
-        """)
+        """Sets the modern dark-mode stylesheet (resources/theme.qss)."""
+        self.setStyleSheet(load_theme_qss())
 
 
     def add_toolbar_items(self):
         """Creates and adds all items to the main toolbar."""
         # Back
-        self.act_back = QPushButton(self.back_icon, "")
+        self.act_back = QPushButton("")
         self.act_back.setToolTip("Back")
         self.act_back.clicked.connect(lambda: self.current_view().back())
         self.toolbar.addWidget(self.act_back)
 
         # Forward
-        self.act_fwd = QPushButton(self.fwd_icon, "")
+        self.act_fwd = QPushButton("")
         self.act_fwd.setToolTip("Forward")
         self.act_fwd.clicked.connect(lambda: self.current_view().forward())
         self.toolbar.addWidget(self.act_fwd)
 
         # Reload
-        self.act_reload = QPushButton(self.reload_icon, "")
+        self.act_reload = QPushButton("")
         self.act_reload.setToolTip("Reload")
         self.act_reload.clicked.connect(lambda: self.current_view().reload())
         self.toolbar.addWidget(self.act_reload)
 
         # Home
-        self.act_home = QPushButton(self.home_icon, "")
+        self.act_home = QPushButton("")
         self.act_home.setToolTip("Home")
         self.act_home.clicked.connect(self.navigate_home)
         self.toolbar.addWidget(self.act_home)
@@ -331,58 +293,219 @@ class DysleximMainWindow(QMainWindow):
         self.url_edit.focusInEvent = self.on_url_focus
         self.toolbar.addWidget(self.url_edit)
 
+        # History suggestions. The index already filters and ranks, so the
+        # completer just shows its model as is and is refreshed on every keystroke
+        self.url_suggestions = QStandardItemModel(self)
+        self.url_completer = QCompleter(self.url_suggestions, self)
+        self.url_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.url_completer.setCompletionRole(Qt.ItemDataRole.UserRole)
+        self.url_completer.setWidget(self.url_edit)
+        self.url_completer.activated[str].connect(self.on_suggestion_activated)
+        self.url_edit.textEdited.connect(self.update_url_suggestions)
+
         # Spacer
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         self.toolbar.addWidget(spacer)
 
         # Gaze toggle (eye icon)
-        self.gaze_btn = QPushButton(self.gaze_on_icon, "")
+        self.gaze_btn = QPushButton("")
         self.gaze_btn.setToolTip("Toggle gaze highlighting (per tab)")
         self.gaze_btn.clicked.connect(self.toggle_gaze_for_current_tab)
         self.toolbar.addWidget(self.gaze_btn)
 
         # Focus Mode
-        self.focus_btn = QPushButton(self.focus_icon, "")
+        self.focus_btn = QPushButton("")
         self.focus_btn.setToolTip("Toggle Focus Mode (removes styles)")
         self.focus_btn.setCheckable(True)
         self.focus_btn.clicked.connect(self.toggle_focus_mode)
         self.toolbar.addWidget(self.focus_btn)
 
+        # Reader view
+        self.reader_btn = QPushButton("")
+        self.reader_btn.setToolTip("Toggle reader view (article text only)")
+        self.reader_btn.setCheckable(True)
+        self.reader_btn.clicked.connect(self.toggle_reader_mode)
+        self.toolbar.addWidget(self.reader_btn)
+
         # Settings
-        self.settings_btn = QPushButton(self.settings_icon, "")
+        self.settings_btn = QPushButton("")
         self.settings_btn.setToolTip("Settings")
         self.settings_btn.clicked.connect(self.open_settings)
         self.toolbar.addWidget(self.settings_btn)
 
-    def add_new_tab(self, url, label):
-        # ... (same as before)
-        tab = BrowserTab(start_url=url)
-        tab.view.page().setWebChannel(self.channel)
+    def add_new_tab(self, url, label, lazy=False, saved=None):
+        """
+        Adds a tab and switches to it. A lazy tab is added in the background as a
+        titled placeholder; its view is only built and loaded when first shown.
+        `saved` is the tab's row from the session store when it is being restored.
+        """
+        tab = BrowserTab(start_url=url, profile_manager=self.profile_manager, lazy=True,
+                         latency_reporting=self.latency_reporting,
+                         session_id=saved['id'] if saved else None)
+        if saved:
+            tab.gaze_enabled = bool(saved['gaze_enabled'])
+            tab.focus_mode_enabled = bool(saved['focus_mode_enabled'])
+            tab.zoom_factor = saved['zoom'] or 1.0
+            tab.saved_scroll = QPointF(saved['scroll_x'], saved['scroll_y'])
+        tab.materialized.connect(self._wire_tab)
+        if not lazy:
+            tab.materialize()
         
+        self.tab_lifecycle.touch(tab)
         index = self.tabs.addTab(tab, label)
-        self.tabs.setCurrentIndex(index)
-
-        tab.view.titleChanged.connect(partial(self.on_title_changed, tab))
-        tab.view.urlChanged.connect(partial(self.on_url_changed, tab))
-        tab.view.loadFinished.connect(partial(self.on_load_finished_inject, tab))
+        if not lazy:
+            self.tabs.setCurrentIndex(index)
 
         if self.tabs.currentIndex() == index:
              self.url_edit.setText(url)
+
+        if self.session and not saved:
+            self.session.update_tab(
+                tab.session_id, url=url, title=label, scroll_x=0.0, scroll_y=0.0, zoom=1.0,
+                gaze_enabled=int(tab.gaze_enabled), focus_mode_enabled=int(tab.focus_mode_enabled),
+            )
+            self.save_tab_order()
         return tab
 
+    # --- Metrics ---
+    def metrics_snapshot(self):
+        """Histograms and counters plus gaze dispatch stats and per-tab memory."""
+        snapshot = metrics.snapshot()
+        snapshot['dispatch'] = self.gaze_dispatcher.stats()
+        memory = self.tab_lifecycle.renderer_memory_kb() if metrics.enabled else {}
+        tabs = []
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if not tab:
+                continue
+            entry = {'title': self.tabs.tabText(i), 'url': tab.url_string(), 'state': 'Placeholder'}
+            if tab.is_materialized():
+                page = tab.view.page()
+                entry['state'] = page.lifecycleState().name
+                rss = memory.get(page.renderProcessPid())
+                entry['rendererMb'] = round(rss / 1024.0, 1) if rss is not None else None
+            page_report = metrics.pages.get(tab.session_id) or {}
+            entry['blocked'] = tab.request_interceptor.blocked if tab.is_materialized() else 0
+            heap = page_report.get('heapKb')
+            entry['heapMb'] = round(heap / 1024.0, 1) if heap is not None else None
+            entry['stats'] = page_report.get('stats') or {}
+            tabs.append(entry)
+        snapshot['tabs'] = tabs
+        return snapshot
+
+    def serve_metrics_page(self, path):
+        """dyslexim://metrics (HTML) and dyslexim://metrics/json."""
+        snapshot = self.metrics_snapshot()
+        if path == 'json':
+            return json.dumps(snapshot, indent=2).encode('utf-8'), b"application/json"
+        return render_metrics_page(snapshot).encode('utf-8'), b"text/html"
+
+    # --- Session ---
+    def restore_session(self):
+        """
+        Reopens the last session's tabs. Only the tab that was active loads; the
+        rest are titled placeholders until shown. Returns False if there was
+        nothing to restore.
+        """
+        if not self.session or not config.get('restoreSession', DEFAULT_RESTORE_SESSION):
+            return False
+        saved_tabs, current_id = self.session.load()
+        if not saved_tabs:
+            return False
+
+        # Adding the first tab would make it current (and load it); pick the tab ourselves
+        self.tabs.blockSignals(True)
+        try:
+            for saved in saved_tabs:
+                self.add_new_tab(saved['url'], (saved['title'] or saved['url'])[:30], lazy=True, saved=saved)
+            ids = [saved['id'] for saved in saved_tabs]
+            self.tabs.setCurrentIndex(ids.index(current_id) if current_id in ids else 0)
+        finally:
+            self.tabs.blockSignals(False)
+        self.on_tab_changed(self.tabs.currentIndex())
+        return True
+
+    def save_tab_order(self):
+        if not self.session:
+            return
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if tab:
+                self.session.update_tab(tab.session_id, position=i)
+
+    def _session_url(self, tab, url):
+        # The reader view's dyslexim:// document only lives in memory; save the article's URL
+        if tab.reader_url and url == tab.reader_view_url:
+            return tab.reader_url
+        return url
+
+    def on_scroll_changed(self, tab, position):
+        # A discarded page reports the top of an empty document; keep the real position
+        if self.session and tab.page.lifecycleState() != QWebEnginePage.LifecycleState.Discarded:
+            self.session.update_tab(tab.session_id, scroll_x=position.x(), scroll_y=position.y())
+
+    def on_zoom_changed(self, tab, factor):
+        tab.zoom_factor = factor
+        if self.session:
+            self.session.update_tab(tab.session_id, zoom=factor)
+
+    def _wire_tab(self, tab):
+        """Connects a tab's freshly built view and page to the window."""
+        # Each tab gets its own channel so gaze batches only reach that tab
+        tab.channel = QWebChannel(tab)
+        tab.channel.registerObject('handler', self.handler)
+        tab.channel.registerObject('gaze', tab.gaze_stream)
+        # Reported by the page itself once the handler is in and its channel is up
+        tab.gaze_stream.installed.connect(lambda install_ms: startup_timeline.mark('gaze handler injected'))
+        if self.tts:
+            tab.channel.registerObject('tts', self.tts)
+        if metrics.enabled:
+            tab.channel.registerObject('metrics', PageMetricsReceiver(tab.session_id, tab))
+            tab.gaze_stream.handled.connect(
+                lambda sample_ms, handled_ms: metrics.record_ms('gaze.sampleToPaint', handled_ms - sample_ms)
+            )
+        # Registered whatever the setting; the page only uses it while textAnalysis is on
+        tab.analysis_stream = TextAnalysisStream(self.text_analyzer, tab.page)
+        tab.analysis_stream.finished.connect(partial(self.show_reading_level, tab))
+        tab.channel.registerObject('analysis', tab.analysis_stream)
+        tab.page.set_channel(tab.channel)
+        # Parented to the page, so it lives exactly as long as the page uses it
+        tab.request_interceptor = self.content_blocker.interceptor_for(tab.page)
+        tab.page.setUrlRequestInterceptor(tab.request_interceptor)
+
+        tab.view.titleChanged.connect(partial(self.on_title_changed, tab))
+        tab.view.urlChanged.connect(partial(self.on_url_changed, tab))
+        tab.view.loadFinished.connect(partial(self.on_load_finished_inject, tab))
+        tab.page.scrollPositionChanged.connect(partial(self.on_scroll_changed, tab))
+        tab.page.zoomFactorChanged.connect(partial(self.on_zoom_changed, tab))
+
     def close_tab(self, idx):
         if self.tabs.count() == 1:
             return 
         
         tab_to_remove = self.tabs.widget(idx)
+        self.tab_lifecycle.forget(tab_to_remove)
         self.tabs.removeTab(idx)
         tab_to_remove.deleteLater() 
+        metrics.forget_page(tab_to_remove.session_id)
+        if self.session:
+            self.session.remove_tab(tab_to_remove.session_id)
+            self.save_tab_order()
 
     def current_tab(self) -> BrowserTab | None:
         # ... (same as before)
         return self.tabs.currentWidget()
 
+    def view_to_global(self, x, y):
+        """Global screen pixels for (x, y) normalized to the current tab's web view."""
+        tab = self.current_tab()
+        if tab is None or tab.view is None:
+            # Off every view, so the dispatcher skips the sample
+            return -1.0, -1.0
+        pt = tab.view.mapToGlobal(QPointF(x * tab.view.width(), y * tab.view.height()))
+        return pt.x(), pt.y()
+
     def current_view(self) -> BrowserView | None:
         t = self.current_tab()
         return t.view if t else None
@@ -424,82 +547,165 @@ class DysleximMainWindow(QMainWindow):
         text = self.url_edit.text().strip()
         if not text:
             return
-        
-        # Simple check: if it has a dot or '://' or 'qrc:', treat as URL.
-        # Otherwise, treat as search.
-        if "." in text or "://" in text or text.startswith("qrc:"):
+        self.url_completer.popup().hide()
+
+        # Anything with a scheme is a URL; otherwise a single word with a dot
+        # (example.com, localhost.lan/x) is one too, and everything else -
+        # including 'dr. seuss' - is a search
+        if "://" in text or text.startswith("qrc:") or ("." in text and " " not in text):
             self.navigate_to(text)
         else:
             self.navigate_to_search(text)
 
+    def update_url_suggestions(self, text):
+        """Fills the address bar's suggestion popup from history as the user types."""
+        results = self.history.search(text) if self.history else []
+        self.url_suggestions.clear()
+        if not results:
+            self.url_completer.popup().hide()
+            return
+        for url, title in results:
+            item = QStandardItem(f"{title} \u2014 {url}" if title else url)
+            item.setData(url, Qt.ItemDataRole.UserRole)
+            item.setToolTip(url)
+            self.url_suggestions.appendRow(item)
+        self.url_completer.complete()
+
+    def on_suggestion_activated(self, url):
+        self.url_edit.setText(url)
+        self.navigate_to(url)
+
     def on_title_changed(self, tab, title):
         """Updates the tab title when the page title changes."""
         idx = self.tabs.indexOf(tab)
-        if idx >= 0:
+        # Discarded tabs can report an empty title; keep the last one shown
+        if idx >= 0 and title:
             self.tabs.setTabText(idx, title[:30])
+            if self.session:
+                self.session.update_tab(tab.session_id, title=title)
+            if self.history:
+                self.history.set_title(tab.view.url().toString(), title)
 
     def on_url_changed(self, tab, url):
         """Updates the address bar when the URL changes."""
+        # Following a link out of the reader view leaves reader mode
+        if tab.reader_url and url.toString() != tab.reader_view_url:
+            tab.reader_url = None
+            tab.reader_view_url = None
+            if tab is self.current_tab():
+                self.reader_btn.setChecked(False)
         if tab is self.current_tab():
             self.url_edit.setText(url.toString())
+        if self.session:
+            self.session.update_tab(tab.session_id, url=self._session_url(tab, url.toString()))
+        # Only real web pages go into history, not dyslexim:// pages or reader views
+        if self.history and url.scheme() in ('http', 'https'):
+            # The title still belongs to the previous page here; on_title_changed fills it in
+            self.history.record_visit(url.toString())
 
     def on_load_finished_inject(self, tab, ok):
-        """Injects the gaze handler JavaScript after a page has loaded."""
+        """Finishes setting up a page after it has loaded (the gaze handler is already in via its profile script)."""
         if not ok:
             return
+        start = time.perf_counter() if metrics.enabled else None
+        startup_timeline.mark('first tab load finished')
+
+        try:
+            # --- FIX: Re-apply focus mode if it's on for this tab ---
+            if tab.focus_mode_enabled:
+                tab.run_js(get_focus_mode_js(True))
 
-        def do_inject():
-            try:
-                current_url = tab.view.url().toString()
-                
-                # Inject CSS for onboarding/settings pages
-                if HOME_URL in current_url or SETTINGS_URL in current_url:
-                    self.inject_css_for_local_pages(tab)
-                
-                # 1. Inject Gaze Handler
-                highlight_color = config.get('highlightColor', 'rgba(255, 200, 0, 0.35)')
-                font = config.get('font', 'Poppins')
-                alignment = config.get('highlightAlignment', 'center')
-                reading_mask = config.get('readingMask', True)
-                tts_hover_time = config.get('ttsHoverTime', 1.0)
-                js = get_js_gaze_handler(highlight_color, font, alignment, reading_mask, tts_hover_time)
-                tab.view.page().runJavaScript(js)
-
-                # --- FIX: Re-apply focus mode if it's on for this tab ---
-                if tab.focus_mode_enabled:
-                    focus_js = get_focus_mode_js(True)
-                    tab.view.page().runJavaScript(focus_js)
-
-            except Exception as e:
-                print(f"Error injecting JS: {e}")
-
-        # Delay injection slightly to ensure page JS is loaded
-        QTimer.singleShot(INJECT_DELAY_MS, do_inject)
+        except Exception as e:
+            print(f"Error injecting JS: {e}")
+
+        if tab is self.current_tab():
+            self.show_blocked_count(tab)
+        if start is not None:
+            metrics.record_ms('python.loadFinished', (time.perf_counter() - start) * 1000.0)
+
+    def show_blocked_count(self, tab):
+        """Tells the user in the status bar how many requests were blocked on the tab's page."""
+        blocked = tab.request_interceptor.blocked if tab.is_materialized() else 0
+        if blocked:
+            self.status.showMessage(f"Blocked {blocked} ad and tracker request{'s' if blocked != 1 else ''} on this page", 5000)
+
+    def show_reading_level(self, tab, summary):
+        """Tells the user how hard the current page reads, once text analysis has caught up with it."""
+        if tab is self.current_tab():
+            grade = max(1, round(summary['grade']))
+            self.status.showMessage(f"Reading level: {summary['label']} (about grade {grade})", 5000)
 
     def dispatch_gaze_to_active_tab(self):
-        """Dispatches the current gaze position to the active tab's web view."""
+        """Drains the gaze source and dispatches samples that moved to the active tab's web view."""
+        samples = self.gaze_source.drain()
         tab = self.current_tab()
-        if not tab or not tab.gaze_enabled:
+        if not samples or not tab or not tab.gaze_enabled or not tab.view.isVisible():
+            self.gaze_dispatcher.skip()
             return
+        start = time.perf_counter() if metrics.enabled else None
 
-        global_pos = QCursor.pos()
-        local_pt = tab.view.mapFromGlobal(global_pos)
         vw = tab.view.width() or 1
         vh = tab.view.height() or 1
-        
-        # Only dispatch if cursor is inside the view
-        if 0 <= local_pt.x() <= vw and 0 <= local_pt.y() <= vh:
+
+        for gx, gy, timestamp_ms in samples:
+            local_pt = tab.view.mapFromGlobal(QPointF(gx, gy))
+
+            # Only dispatch if the gaze is inside the view
+            if not (0 <= local_pt.x() <= vw and 0 <= local_pt.y() <= vh):
+                self.gaze_dispatcher.skip()
+                continue
+
             norm_x = max(0.0, min(1.0, local_pt.x() / vw))
             norm_y = max(0.0, min(1.0, local_pt.y() / vh))
 
-            js = f"""
-            (function(){{
-                if (window.__dyslexim_handleGaze && typeof window.__dyslexim_handleGaze === 'function') {{
-                    try {{ window.__dyslexim_handleGaze({norm_x:.4f}, {norm_y:.4f}); }} catch(e){{ }}
-                }}
-            }})();
-            """
-            tab.view.page().runJavaScript(js)
+            # Coalesce samples that did not move past the threshold
+            if not self.gaze_dispatcher.submit(tab, norm_x, norm_y):
+                continue
+
+            # Delivered as a batched QWebChannel signal, no per-sample script compilation
+            tab.gaze_stream.push(norm_x, norm_y, timestamp_ms)
+
+            if self.gaze_recorder:
+                self.gaze_recorder.record(norm_x, norm_y, tab.view.url().toString())
+
+        if start is not None:
+            metrics.record_ms('python.dispatchGaze', (time.perf_counter() - start) * 1000.0)
+            metrics.count('gaze.samplesDrained', len(samples))
+
+    # --- Pause gaze sampling while the window can't be looked at ---
+    def changeEvent(self, event):
+        """Pauses gaze dispatch when the window is minimized or loses focus."""
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.gaze_dispatcher.set_paused('minimized', self.isMinimized())
+        elif event.type() == QEvent.Type.ActivationChange:
+            self.gaze_dispatcher.set_paused('inactive', not self.isActiveWindow())
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        stats = self.gaze_dispatcher.stats()
+        print(f"Gaze dispatch: {stats['sent']} sent, {stats['skipped']} skipped ({stats['skipRatio']:.0%} saved)")
+        self.gaze_source.stop()
+        if self.tts:
+            self.tts.shutdown()
+        self.reader.shutdown()
+        self.text_analyzer.shutdown()
+        if self.session:
+            self.session.flush()
+        if self.history:
+            self.history.flush()
+        if self.gaze_recorder:
+            self.gaze_recorder.save(self.record_trace_path)
+            print(f"Gaze trace saved to {self.record_trace_path} ({len(self.gaze_recorder.trace)} samples)")
+        super().closeEvent(event)
+
+    def hideEvent(self, event):
+        self.gaze_dispatcher.set_paused('hidden', True)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        startup_timeline.mark('window shown')
+        self.gaze_dispatcher.set_paused('hidden', False)
+        super().showEvent(event)
 
     def toggle_gaze_for_current_tab(self):
         """Toggles the gaze highlighting feature for the current tab."""
@@ -509,11 +715,13 @@ class DysleximMainWindow(QMainWindow):
         
         # --- FIX: Store state on the tab ---
         tab.gaze_enabled = not tab.gaze_enabled
+        if self.session:
+            self.session.update_tab(tab.session_id, gaze_enabled=int(tab.gaze_enabled))
         
         self.status.showMessage(f"Gaze highlighting {'enabled' if tab.gaze_enabled else 'disabled'} for this tab.", 3000)
         
         # --- FIX: Update icon based on state ---
-        self.gaze_btn.setIcon(self.gaze_on_icon if tab.gaze_enabled else self.gaze_off_icon)
+        self.update_gaze_button(tab)
 
     def toggle_focus_mode(self):
         """Toggles the focus mode for the current tab."""
@@ -523,9 +731,51 @@ class DysleximMainWindow(QMainWindow):
 
         # --- FIX: Store state on the tab ---
         tab.focus_mode_enabled = self.focus_btn.isChecked()
+        if self.session:
+            self.session.update_tab(tab.session_id, focus_mode_enabled=int(tab.focus_mode_enabled))
 
         js = get_focus_mode_js(tab.focus_mode_enabled)
-        tab.view.page().runJavaScript(js)
+        tab.run_js(js)
+
+    def toggle_reader_mode(self):
+        """Shows the current page's article in a clean reader document, or goes back to the page."""
+        tab = self.current_tab()
+        if not tab:
+            return
+
+        if tab.reader_pending_url:
+            # Still extracting; just stop waiting for it
+            tab.reader_pending_url = None
+            self.reader_btn.setChecked(False)
+            return
+        if tab.reader_url:
+            url = tab.reader_url
+            tab.reader_url = None
+            tab.reader_view_url = None
+            self.reader_btn.setChecked(False)
+            tab.view.setUrl(QUrl(url))
+            return
+
+        url = tab.view.url().toString()
+        tab.reader_pending_url = url
+        self.reader_btn.setChecked(True)
+        self.status.showMessage("Preparing reader view...", 2000)
+        # toHtml serializes the live DOM, so pages built by scripts work too
+        tab.page.toHtml(lambda page_html, u=url: self.reader.request(u, page_html))
+
+    def on_reader_article_ready(self, url, article, cached):
+        """Puts an extracted article into every tab waiting for (or showing) its reader view."""
+        document = render_reader_document(article, url, config)
+        view_url = self.scheme_handler.put_reader_document(url, document)
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if not tab or url not in (tab.reader_pending_url, tab.reader_url):
+                continue
+            tab.reader_pending_url = None
+            tab.reader_url = url
+            tab.reader_view_url = view_url
+            # Served over dyslexim:// rather than setHtml, which is capped at 2 MB
+            tab.view.setUrl(QUrl(view_url))
 
     def open_settings(self):
         """Opens the settings page in a new tab."""
@@ -538,11 +788,23 @@ class DysleximMainWindow(QMainWindow):
         if not tab:
             return
 
+        # Placeholder tabs are built and start loading the first time they are shown
+        tab.materialize()
+        if self.session:
+            self.session.set_current(tab.session_id)
+
+        # Make sure the newly shown tab gets the next gaze sample
+        self.gaze_dispatcher.reset()
+
+        # Wake the tab up if it was frozen or discarded in the background
+        self.tab_lifecycle.activate(tab)
+
         # Update Gaze Button
-        self.gaze_btn.setIcon(self.gaze_on_icon if tab.gaze_enabled else self.gaze_off_icon)
+        self.update_gaze_button(tab)
 
         # Update Focus Button
         self.focus_btn.setChecked(tab.focus_mode_enabled)
+        self.reader_btn.setChecked(bool(tab.reader_url or tab.reader_pending_url))
 
         # Update URL bar
         self.url_edit.setText(tab.view.url().toString())
@@ -554,59 +816,41 @@ class DysleximMainWindow(QMainWindow):
         # Propagate the event
         QLineEdit.focusInEvent(self.url_edit, event)
 
-    # --- NEW: Helper for WebChannel ---
-    def reload_all_tabs_after_settings_change(self):
-        """Called by WebChannelHandler after settings are saved."""
-        home_url = POST_ONBOARDING_URL # Onboarding is now complete
-        
-        # Collect tabs to update (avoid modifying during iteration)
-        tabs_to_update = []
+    # --- NEW: Settings change notifications ---
+    def on_settings_changed(self, changed):
+        """Called by the config store with the settings that just changed."""
+        if 'gazeMoveThreshold' in changed:
+            self.gaze_dispatcher.threshold = changed['gazeMoveThreshold']
+        if self.tts and ('ttsVoice' in changed or 'ttsRate' in changed):
+            self.tts.voice = config_store.get('ttsVoice')
+            self.tts.rate = int(config_store.get('ttsRate'))
+        if 'contentBlocking' in changed:
+            self.content_blocker.enabled = bool(changed['contentBlocking'])
+        if any(key in changed for key in RUNTIME_CONFIG_KEYS):
+            self.apply_settings_to_open_tabs()
+
+    def apply_settings_to_open_tabs(self):
+        """
+        Open pages are restyled in place through handler.settingsChanged, so no
+        tab reloads and nobody loses their scroll position, form input or media state.
+        """
+        # New documents pick up the new settings from the profile scripts
+        for profile in self.profile_manager.profiles():
+            install_gaze_scripts(profile, config)
+
+        self.handler.settingsChanged.emit(get_runtime_config(config))
+
+    def leave_settings_pages(self):
+        """After onboarding/settings are saved, those pages move on to the regular home page."""
         for i in range(self.tabs.count()):
             tab = self.tabs.widget(i)
-            if tab:
-                current_url = tab.view.url().toString()
-                tabs_to_update.append((tab, current_url))
-        
-        # Schedule updates with delays to allow proper page cleanup
-        for idx, (tab, current_url) in enumerate(tabs_to_update):
-            delay = 300 * (idx + 1)  # Stagger the updates with longer delay
-            if current_url == HOME_URL or current_url == SETTINGS_URL:
-                # Re-point home tabs to new home page
-                QTimer.singleShot(delay, lambda t=tab, url=home_url: self._navigate_tab(t, url))
-            else:
-                # Reload other tabs to apply new JS settings
-                QTimer.singleShot(delay, lambda t=tab: self._reload_tab(t))
-    
+            if tab and tab.url_string() in (HOME_URL, SETTINGS_URL):
+                self._navigate_tab(tab, POST_ONBOARDING_URL)
+
     def _navigate_tab(self, tab, url):
         """Helper to navigate a specific tab."""
         if tab and tab.view:
             tab.view.setUrl(QUrl(url))
-    
-    def _reload_tab(self, tab):
-        """Helper to reload a specific tab."""
-        if tab and tab.view:
-            tab.view.reload()
-    
-    def inject_css_for_local_pages(self, tab):
-        """Injects modern.css content directly into local HTML pages."""
-        try:
-            from .config import get_asset_path
-            import os
-            
-            css_path = get_asset_path(os.path.join('web', 'modern.css'))
-            if os.path.exists(css_path):
-                with open(css_path, 'r', encoding='utf-8') as f:
-                    css_content = f.read()
-                
-                # Inject CSS via JavaScript
-                js_inject = f"""
-                (function() {{
-                    var style = document.createElement('style');
-                    style.textContent = `{css_content}`;
-                    document.head.appendChild(style);
-                    console.log('✓ CSS injected successfully');
-                }})();
-                """
-                tab.view.page().runJavaScript(js_inject)
-        except Exception as e:
-            print(f"Error injecting CSS: {e}")
\ No newline at end of file
+        elif tab:
+            # Placeholder: just change what it will load when shown
+            tab.start_url = url
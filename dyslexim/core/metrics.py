@@ -0,0 +1,235 @@
+# dyslexim/core/metrics.py
+import html
+import json
+import time
+
+from PyQt6.QtCore import QObject, pyqtSlot
+
+# Log-linear buckets, as in HdrHistogram: values (in microseconds) below 2 * SUB_BUCKETS get a
+# bucket each; above that every power of two is split into SUB_BUCKETS buckets, so any
+# recorded value is within 1/SUB_BUCKETS (~6%) of its bucket. METRICS_JS buckets the same way.
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = SUB_BUCKETS * 2
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value_us):
+    value_us = max(0, int(value_us))
+    if value_us < _LINEAR_LIMIT:
+        return value_us
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return _LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + ((value_us >> shift) - SUB_BUCKETS)
+
+
+def bucket_range(index):
+    """The (lowest, highest) microsecond values that land in bucket `index`."""
+    if index < _LINEAR_LIMIT:
+        return index, index
+    shift = (index - _LINEAR_LIMIT) // SUB_BUCKETS + 1
+    top = (index - _LINEAR_LIMIT) % SUB_BUCKETS + SUB_BUCKETS
+    return top << shift, ((top + 1) << shift) - 1
+
+
+class Histogram:
+    """Latency histogram with bounded relative error and a few hundred buckets at most."""
+
+    __slots__ = ('counts', 'count', 'total_us', 'min_us', 'max_us')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record_us(self, value_us, count=1):
+        value_us = max(0, int(value_us))
+        index = bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def record_ms(self, value_ms):
+        self.record_us(value_ms * 1000.0)
+
+    def add_buckets(self, flat):
+        """Merges [bucket index, count, ...] pairs (a page's report) into this histogram."""
+        for i in range(0, len(flat) - 1, 2):
+            index, count = int(flat[i]), int(flat[i + 1])
+            if count <= 0:
+                continue
+            low, high = bucket_range(index)
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.count += count
+            self.total_us += (low + high) // 2 * count
+            self.min_us = low if self.min_us is None else min(self.min_us, low)
+            self.max_us = max(self.max_us, high)
+
+    def percentile_us(self, p):
+        if not self.count:
+            return 0
+        rank = max(1, int(round(p / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(bucket_range(index)[1], self.max_us)
+        return self.max_us
+
+    def summary(self):
+        """Count, mean, min, max and percentiles, in milliseconds."""
+        if not self.count:
+            return {'count': 0}
+        result = {
+            'count': self.count,
+            'mean': self.total_us / self.count / 1000.0,
+            'min': self.min_us / 1000.0,
+            'max': self.max_us / 1000.0,
+        }
+        for p in PERCENTILES:
+            result[f'p{p:g}'] = self.percentile_us(p) / 1000.0
+        return result
+
+
+class Metrics:
+    """
+    Process-wide latency histograms and counters.
+
+    Off unless switched on (--metrics or --metrics-json); every call site
+    checks `enabled` first, so a disabled build doesn't even read the clock.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.counters = {}
+        self.pages = {}     # page key -> its latest report (stats, JS heap)
+        self.started = time.monotonic()
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        return hist
+
+    def record_ms(self, name, value_ms):
+        self.histogram(name).record_ms(value_ms)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed_callback(self, name, callback=None):
+        """Wraps `callback` so the time until Qt calls it is recorded under `name`."""
+        start = time.perf_counter()
+
+        def done(*args):
+            self.record_ms(name, (time.perf_counter() - start) * 1000.0)
+            if callback is not None:
+                callback(*args)
+        return done
+
+    def merge_page_report(self, key, report):
+        for name, flat in (report.get('histograms') or {}).items():
+            self.histogram(f"page.{name}").add_buckets(flat)
+        self.pages[key] = {'stats': report.get('stats') or {}, 'heapKb': report.get('heapKb')}
+
+    def forget_page(self, key):
+        self.pages.pop(key, None)
+
+    def snapshot(self):
+        return {
+            'enabled': self.enabled,
+            'uptimeS': round(time.monotonic() - self.started, 1),
+            'histograms': {name: hist.summary() for name, hist in sorted(self.histograms.items())},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+
+metrics = Metrics()
+
+
+class PageMetricsReceiver(QObject):
+    """
+    Per-tab QWebChannel object ('metrics') the gaze handler sends its
+    histograms to. Only registered while metrics are on; the page skips all
+    of its timing work when the object isn't there.
+    """
+
+    def __init__(self, key, parent=None):
+        super().__init__(parent)
+        self.key = key
+
+    @pyqtSlot(str)
+    def report(self, payload):
+        try:
+            metrics.merge_page_report(self.key, json.loads(payload))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Bad metrics report from a page: {e}")
+
+
+def write_metrics_json(path, snapshot):
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        print(f"Metrics written to {path}")
+    except OSError as e:
+        print(f"Could not write metrics to {path}: {e}")
+
+
+def _fmt(value):
+    return f"{value:.2f}" if isinstance(value, float) else html.escape(str(value))
+
+
+def render_metrics_page(snapshot):
+    """The dyslexim://metrics page for a snapshot (see DysleximMainWindow.metrics_snapshot)."""
+    if not snapshot.get('enabled'):
+        body = "<p>Metrics are off. Start Dyslexim with <code>--metrics</code> (or <code>--metrics-json PATH</code>).</p>"
+    else:
+        columns = ['count', 'mean', 'min'] + [f'p{p:g}' for p in PERCENTILES] + ['max']
+        rows = []
+        for name, summary in snapshot['histograms'].items():
+            cells = ''.join(f"<td>{_fmt(summary.get(c, ''))}</td>" for c in columns)
+            rows.append(f"<tr><th>{html.escape(name)}</th>{cells}</tr>")
+        counters = ''.join(
+            f"<tr><th>{html.escape(name)}</th><td>{_fmt(value)}</td></tr>"
+            for name, value in snapshot['counters'].items()
+        )
+        tabs = []
+        for tab in snapshot.get('tabs', []):
+            stats = tab.get('stats') or {}
+            tabs.append(
+                "<tr>" + ''.join(f"<td>{_fmt(v)}</td>" for v in (
+                    tab.get('title', ''), tab.get('state', ''), tab.get('rendererMb', ''),
+                    tab.get('heapMb', ''), stats.get('handled', ''), stats.get('dropped', ''), tab.get('blocked', ''),
+                )) + "</tr>"
+            )
+        body = f"""
+<p>Up {snapshot['uptimeS']} s. Latencies in ms. <a href="dyslexim://metrics/json">JSON</a></p>
+<h2>Latency</h2>
+<table><tr><th></th>{''.join(f'<th>{c}</th>' for c in columns)}</tr>{''.join(rows)}</table>
+<h2>Counters</h2>
+<table>{counters}</table>
+<h2>Tabs</h2>
+<table><tr><th>Tab</th><th>State</th><th>Renderer MB</th><th>JS heap MB</th><th>Handled</th><th>Dropped</th><th>Blocked</th></tr>{''.join(tabs)}</table>"""
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="2">
+<title>Dyslexim metrics</title>
+<style>
+  body {{ font-family: sans-serif; margin: 2em; color: #222; }}
+  table {{ border-collapse: collapse; margin-bottom: 1.5em; }}
+  th, td {{ padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }}
+  th:first-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Dyslexim metrics</h1>
+{body}
+</body>
+</html>"""
@@ -0,0 +1,86 @@
+# dyslexim/core/profiles.py
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+
+from .config import get_user_data_dir, PROFILE_MODES, DEFAULT_PROFILE_MODE
+
+
+class ProfileManager(QObject):
+    """
+    Hands out QWebEngineProfiles to tabs.
+
+    Modes:
+      'shared'   - one persistent profile with an on-disk HTTP cache and cookies,
+                   shared by every tab (warm cache across tabs and launches)
+      'private'  - one off-the-record profile shared by every tab; nothing
+                   touches the disk
+      'isolated' - a fresh off-the-record profile per tab, for users who need
+                   tabs not to share cookies or cache
+
+    Tabs don't build profiles themselves; they ask for a page with `create_page()`.
+    """
+
+    # Emitted once for every profile the manager creates, so other components
+    # (scripts, scheme handlers, interceptors) can configure it in one place
+    profileCreated = pyqtSignal(QWebEngineProfile)
+
+    PERSISTENT_PROFILE_NAME = "dyslexim"
+
+    def __init__(self, mode=DEFAULT_PROFILE_MODE, http_cache_size_mb=256, parent=None):
+        super().__init__(parent)
+        self.mode = mode if mode in PROFILE_MODES else DEFAULT_PROFILE_MODE
+        self.http_cache_size_mb = http_cache_size_mb
+        self._shared = None
+        self._isolated = []
+
+    def _create_shared_profile(self):
+        if self.mode == 'shared':
+            profile = QWebEngineProfile(self.PERSISTENT_PROFILE_NAME, self)
+            profile.setPersistentStoragePath(get_user_data_dir('profile', 'storage'))
+            profile.setCachePath(get_user_data_dir('profile', 'cache'))
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+            profile.setHttpCacheMaximumSize(int(self.http_cache_size_mb) * 1024 * 1024)
+            profile.setPersistentCookiesPolicy(
+                QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies
+            )
+        else:
+            # No storage name means off-the-record: memory cache, no cookies on disk
+            profile = QWebEngineProfile(self)
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+        self.profileCreated.emit(profile)
+        return profile
+
+    def shared_profile(self):
+        """Returns the profile shared by all tabs (created on first use)."""
+        if self._shared is None:
+            self._shared = self._create_shared_profile()
+        return self._shared
+
+    def profiles(self):
+        """Returns every live profile handed out by the manager."""
+        shared = [self._shared] if self._shared is not None else []
+        return shared + self._isolated
+
+    def create_page(self, parent, page_class=QWebEnginePage):
+        """
+        Creates a page for a tab using the profile for the current mode.
+        An isolated profile is parented to its page so the page is always
+        destroyed before the profile it depends on.
+        """
+        if self.mode != 'isolated':
+            return page_class(self.shared_profile(), parent)
+
+        profile = QWebEngineProfile()
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+        self.profileCreated.emit(profile)
+        page = page_class(profile, parent)
+        profile.setParent(page)
+        self._isolated.append(profile)
+        profile.destroyed.connect(lambda _=None, p=profile: self._forget(p))
+        return page
+
+    def _forget(self, profile):
+        try:
+            self._isolated.remove(profile)
+        except ValueError:
+            pass
@@ -0,0 +1,359 @@
+# dyslexim/core/reader.py
+import hashlib
+import html
+import multiprocessing
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .config import FONTS_CSS_URL, READER_CACHE_ITEMS
+
+# Never part of an article
+SKIP_TAGS = {
+    'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe', 'object', 'embed',
+    'form', 'button', 'input', 'select', 'textarea', 'nav', 'footer', 'aside', 'header', 'head',
+}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+# Tags kept in the reader document; everything else is unwrapped to its children
+KEEP_TAGS = {
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'pre', 'code',
+    'em', 'strong', 'b', 'i', 'a', 'img', 'figure', 'figcaption', 'br', 'hr',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td', 'caption', 'dl', 'dt', 'dd', 'sub', 'sup',
+}
+# URL schemes allowed in kept links and images; anything else (javascript:, vbscript:...) is dropped
+LINK_SCHEMES = {'http', 'https', 'mailto'}
+IMAGE_SCHEMES = {'http', 'https'}
+# Containers that can hold the article body
+CANDIDATE_TAGS = {'div', 'article', 'section', 'main', 'td', 'body'}
+PARAGRAPH_TAGS = {'p', 'pre', 'td', 'blockquote', 'li'}
+
+POSITIVE_HINTS = re.compile(r'article|body|content|entry|main|page|post|story|text|blog', re.I)
+NEGATIVE_HINTS = re.compile(
+    r'ad-|ads|banner|breadcrumb|combx|comment|community|cookie|disqus|extra|foot|menu|meta|'
+    r'nav|outbrain|popup|promo|related|remark|rss|share|shoutbox|sidebar|social|sponsor|subscribe|tags|widget',
+    re.I,
+)
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'score')
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+        self.score = 0.0
+
+    def text(self):
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return ' '.join(''.join(parts).split())
+
+    def link_text_length(self):
+        total = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _Node):
+                if node.tag == 'a':
+                    total += len(node.text())
+                else:
+                    stack.extend(node.children)
+        return total
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a small element tree, dropping SKIP_TAGS subtrees as it goes."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('root', {}, None)
+        self.current = self.root
+        self.skip_depth = 0
+        self.title = ''
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title':
+            self._in_title = True
+        if self.skip_depth:
+            if tag not in VOID_TAGS:
+                self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            if tag not in VOID_TAGS:
+                self.skip_depth = 1
+            return
+        node = _Node(tag, dict(attrs), self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        # Close up to the matching open tag, tolerating unclosed children
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if not self.skip_depth and data:
+            self.current.children.append(data)
+
+
+def _class_weight(node):
+    weight = 0
+    for value in (node.attrs.get('class') or '', node.attrs.get('id') or ''):
+        if not value:
+            continue
+        if NEGATIVE_HINTS.search(value):
+            weight -= 25
+        if POSITIVE_HINTS.search(value):
+            weight += 25
+    return weight
+
+
+def _score(root):
+    """Readability-style scoring: paragraphs lend their score to parent and grandparent."""
+    candidates = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            if isinstance(child, _Node):
+                stack.append(child)
+        if node.tag not in PARAGRAPH_TAGS:
+            continue
+        text = node.text()
+        if len(text) < 25:
+            continue
+        points = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = node.parent
+        grandparent = parent.parent if parent is not None else None
+        for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+            if ancestor is None or ancestor.tag not in CANDIDATE_TAGS:
+                continue
+            if ancestor not in candidates:
+                ancestor.score = _class_weight(ancestor)
+                candidates.add(ancestor)
+            ancestor.score += points * share
+
+    best = None
+    for node in candidates:
+        text_length = len(node.text()) or 1
+        # Link-heavy blocks (menus, tag clouds) are worth less
+        node.score *= 1 - node.link_text_length() / text_length
+        if best is None or node.score > best.score:
+            best = node
+    return best
+
+
+def _safe_url(base_url, value, schemes, allow_data_image=False):
+    """Resolves `value` against `base_url`, or returns None if its scheme is not in `schemes`."""
+    url = urljoin(base_url, value.strip())
+    scheme = urlsplit(url).scheme.lower()
+    if scheme in schemes or (allow_data_image and scheme == 'data' and url[5:].lower().startswith('image/')):
+        return url
+    return None
+
+
+def _serialize(node, base_url, out, top_level=False):
+    if isinstance(node, str):
+        out.append(html.escape(node, quote=False))
+        return
+    tag = node.tag
+    # Share bars, related links and the like inside the article body
+    if not top_level and tag in CANDIDATE_TAGS and _class_weight(node) < 0:
+        return
+    keep = tag in KEEP_TAGS
+    if keep:
+        attrs = ''
+        if tag == 'a' and node.attrs.get('href'):
+            href = _safe_url(base_url, node.attrs['href'], LINK_SCHEMES)
+            if href:
+                attrs = f' href="{html.escape(href)}"'
+        elif tag == 'img':
+            src = node.attrs.get('src') or node.attrs.get('data-src')
+            src = src and _safe_url(base_url, src, IMAGE_SCHEMES, allow_data_image=True)
+            if not src:
+                return
+            attrs = f' src="{html.escape(src)}" alt="{html.escape(node.attrs.get("alt") or "")}"'
+        out.append(f'<{tag}{attrs}>')
+    for child in node.children:
+        _serialize(child, base_url, out)
+    if keep and tag not in VOID_TAGS:
+        out.append(f'</{tag}>')
+
+
+def extract_article(page_html, url):
+    """
+    Extracts the main article from `page_html`. Runs in a worker process, so it
+    only takes and returns plain data: {'title', 'content', 'length'}, with
+    `content` being sanitized HTML (or empty if nothing article-like was found).
+    """
+    builder = _TreeBuilder()
+    try:
+        builder.feed(page_html)
+        builder.close()
+    except Exception as e:
+        print(f"Reader: could not parse {url}: {e}")
+        return {'title': '', 'content': '', 'length': 0}
+
+    top = _score(builder.root)
+    if top is None:
+        return {'title': builder.title.strip(), 'content': '', 'length': 0}
+
+    # Siblings that scored close to the winner are part of the same article
+    threshold = max(10.0, top.score * 0.2)
+    parts = []
+    siblings = top.parent.children if top.parent is not None else [top]
+    for sibling in siblings:
+        if sibling is top or (isinstance(sibling, _Node) and sibling.score >= threshold):
+            _serialize(sibling, url, parts, top_level=True)
+    content = ''.join(parts)
+    return {'title': ' '.join(builder.title.split()), 'content': content, 'length': len(top.text())}
+
+
+def content_hash(page_html):
+    return hashlib.sha1(page_html.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def render_reader_document(article, url, config):
+    """Wraps an extracted article in a clean page styled with the user's reading settings."""
+    title = html.escape(article.get('title') or url)
+    font = html.escape(config.get('font', 'Poppins'))
+    body = article.get('content') or '<p>Dyslexim could not find an article on this page.</p>'
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{FONTS_CSS_URL}">
+<style>
+  html {{ background: #fbf8ef; color: #222; }}
+  body {{
+    font-family: '{font}', sans-serif;
+    font-size: 20px;
+    line-height: 1.8;
+    letter-spacing: 0.04em;
+    word-spacing: 0.12em;
+    max-width: 68ch;
+    margin: 3em auto;
+    padding: 0 1.5em;
+  }}
+  h1, h2, h3 {{ line-height: 1.4; }}
+  img {{ max-width: 100%; height: auto; }}
+  pre {{ white-space: pre-wrap; }}
+  a {{ color: #1d5fa8; }}
+  .dyslexim-reader-source {{ font-size: 0.8em; color: #666; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="dyslexim-reader-source"><a href="{html.escape(url)}">{html.escape(url)}</a></p>
+{body}
+</body>
+</html>"""
+
+
+class ReaderCache:
+    """LRU of extraction results keyed by (URL, content hash), plus the latest result per URL."""
+
+    def __init__(self, capacity=READER_CACHE_ITEMS):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._latest = {}
+
+    def get(self, url, digest):
+        article = self._entries.get((url, digest))
+        if article is not None:
+            self._entries.move_to_end((url, digest))
+        return article
+
+    def latest(self, url):
+        return self._latest.get(url)
+
+    def put(self, url, digest, article):
+        self._entries[(url, digest)] = article
+        self._entries.move_to_end((url, digest))
+        self._latest[url] = article
+        while len(self._entries) > self.capacity:
+            (old_url, _), old = self._entries.popitem(last=False)
+            if self._latest.get(old_url) is old:
+                del self._latest[old_url]
+
+
+class ReaderExtractor(QObject):
+    """
+    Runs extract_article in a worker process and caches the results.
+
+    request() answers from the cache right away when it can (`ready` is
+    emitted before it returns); otherwise the page is scored off the GUI
+    thread and `ready` follows when it's done.
+    """
+
+    # (url, article dict, served from cache)
+    ready = pyqtSignal(str, object, bool)
+    _extracted = pyqtSignal(str, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = ReaderCache()
+        self._pool = None
+        self._pending = set()
+        self._extracted.connect(self._on_extracted)
+
+    def request(self, url, page_html):
+        digest = content_hash(page_html)
+        article = self.cache.get(url, digest)
+        if article is not None:
+            self.ready.emit(url, article, True)
+            return
+        # The page changed since last time (ads, timestamps...): show what we had while re-extracting
+        stale = self.cache.latest(url)
+        if stale is not None:
+            self.ready.emit(url, stale, True)
+        if (url, digest) in self._pending:
+            return
+        self._pending.add((url, digest))
+        if self._pool is None:
+            # Spawned, not forked: a fork of this threaded Qt process can inherit a held lock
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        future = self._pool.submit(extract_article, page_html, url)
+        future.add_done_callback(lambda f: self._extracted.emit(url, digest, f))
+
+    def _on_extracted(self, url, digest, future):
+        self._pending.discard((url, digest))
+        try:
+            article = future.result()
+        except Exception as e:
+            print(f"Reader extraction failed for {url}: {e}")
+            return
+        stale = self.cache.latest(url)
+        self.cache.put(url, digest, article)
+        if stale is None or stale.get('content') != article.get('content'):
+            self.ready.emit(url, article, False)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
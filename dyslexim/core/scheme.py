@@ -0,0 +1,168 @@
+# dyslexim/core/scheme.py
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+
+from .config import get_asset_path, APP_URL, BUNDLED_FONT_FAMILIES, READER_CACHE_ITEMS
+from .gaze_stream import load_qwebchannel_js
+
+SCHEME = b"dyslexim"
+APP_HOST = "app"
+READER_HOST = "reader"
+
+# URL path -> file under the app directory. Only these are ever served.
+_BUNDLE_DIRS = {
+    'web/': 'web',
+    'fonts/': os.path.join('assets', 'fonts'),
+}
+_BUNDLE_FILES = {
+    'home.html': 'home.html',
+    'settings.html': 'settings.html',
+}
+_FONT_EXTENSIONS = ('.woff2', '.woff', '.otf')
+
+# Fonts never change for a given build; pages are small and always revalidated
+IMMUTABLE = b"public, max-age=31536000, immutable"
+REVALIDATE = b"no-cache"
+
+
+def register_url_scheme():
+    """Registers dyslexim:// with Chromium; must run before the QApplication is created."""
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Secure + CORS so https pages may load its fonts; our own pages get their CSP waived
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+        | QWebEngineUrlScheme.Flag.FetchApiAllowed
+        | QWebEngineUrlScheme.Flag.ContentSecurityPolicyIgnored
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def _fonts_css():
+    rules = []
+    for family, faces in BUNDLED_FONT_FAMILIES.items():
+        for stem, weight, style in faces:
+            rules.append(
+                f"@font-face {{ font-family: '{family}'; font-weight: {weight}; font-style: {style}; "
+                f"font-display: swap; src: url('{APP_URL}fonts/{stem}.woff2') format('woff2'), "
+                f"url('{APP_URL}fonts/{stem}.woff') format('woff'); }}"
+            )
+    return "\n".join(rules).encode('utf-8')
+
+
+class AppBundle:
+    """
+    The files served under dyslexim://app/. Each file is read from disk once,
+    on first request, and then served from memory for the rest of the session.
+    """
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+        # Generated entries
+        self._files['fonts.css'] = (_fonts_css(), b"text/css", IMMUTABLE)
+        self._files['qwebchannel.js'] = (load_qwebchannel_js().encode('utf-8'), b"application/javascript", IMMUTABLE)
+
+    @staticmethod
+    def _disk_path(path):
+        if path in _BUNDLE_FILES:
+            return get_asset_path(_BUNDLE_FILES[path])
+        for prefix, directory in _BUNDLE_DIRS.items():
+            if path.startswith(prefix):
+                name = path[len(prefix):]
+                # Flat directories only; no way out of them
+                if not name or '/' in name or '\\' in name or name.startswith('.'):
+                    return None
+                if prefix == 'fonts/' and not name.endswith(_FONT_EXTENSIONS):
+                    return None
+                return get_asset_path(os.path.join(directory, name))
+        return None
+
+    def get(self, path):
+        """Returns (data, mime type, cache-control) for a bundle path, or None."""
+        with self._lock:
+            entry = self._files.get(path)
+        if entry is not None:
+            return entry
+        disk_path = self._disk_path(path)
+        if disk_path is None:
+            return None
+        try:
+            with open(disk_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        mime = mimetypes.guess_type(disk_path)[0] or 'application/octet-stream'
+        if disk_path.endswith('.woff2'):
+            mime = 'font/woff2'
+        cache = IMMUTABLE if path.startswith('fonts/') else REVALIDATE
+        entry = (data, mime.encode('ascii'), cache)
+        with self._lock:
+            self._files[path] = entry
+        return entry
+
+
+class DysleximSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Serves dyslexim://app/... (local pages, CSS, JS, fonts) from the AppBundle,
+    dyslexim://reader/<id> (reader view documents) from memory and any page
+    added with register_page(). Installed on every profile by the window.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bundle = AppBundle()
+        self._reader_documents = OrderedDict()
+        self._pages = {}
+
+    def register_page(self, host, render):
+        """Serves dyslexim://<host>/<path> from `render(path)`, which returns (bytes, mime type) or None."""
+        self._pages[host] = render
+
+    def put_reader_document(self, source_url, html):
+        """Stores a rendered reader document and returns the dyslexim:// URL it is served at."""
+        doc_id = hashlib.sha1(source_url.encode('utf-8')).hexdigest()[:16]
+        self._reader_documents[doc_id] = html.encode('utf-8')
+        self._reader_documents.move_to_end(doc_id)
+        while len(self._reader_documents) > READER_CACHE_ITEMS:
+            self._reader_documents.popitem(last=False)
+        return f"dyslexim://{READER_HOST}/{doc_id}?url={quote(source_url, safe='')}"
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        host = url.host()
+        path = url.path().lstrip('/')
+
+        if host == APP_HOST:
+            entry = self.bundle.get(path)
+        elif host == READER_HOST and path in self._reader_documents:
+            entry = (self._reader_documents[path], b"text/html", REVALIDATE)
+        elif host in self._pages:
+            rendered = self._pages[host](path)
+            entry = (rendered[0], rendered[1], b"no-store") if rendered else None
+        else:
+            entry = None
+
+        if entry is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        data, mime, cache_control = entry
+        if hasattr(job, 'setAdditionalResponseHeaders'):  # Qt 6.7+
+            headers = {QByteArray(b"Cache-Control"): [QByteArray(cache_control)]}
+            if host == APP_HOST:
+                # Web pages may use the bundled fonts; nothing else is readable cross-origin
+                headers[QByteArray(b"Access-Control-Allow-Origin")] = [QByteArray(b"*")]
+            job.setAdditionalResponseHeaders(headers)
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(QByteArray(mime), buffer)
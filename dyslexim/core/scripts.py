@@ -0,0 +1,78 @@
+# dyslexim/core/scripts.py
+import json
+import time
+
+from PyQt6.QtWebEngineCore import QWebEngineScript
+
+from .config import LOCAL_PAGE_PREFIXES
+from .gaze_stream import load_qwebchannel_js
+from .js_handler import get_js_gaze_handler, get_runtime_config
+from .metrics import metrics
+
+# Web pages get the gaze handler (and the web channel) in an isolated world so
+# page scripts can neither see nor clobber it. Dyslexim's own pages already
+# open a QWebChannel in the main world, so their handler lives there instead.
+GAZE_WORLD_ID = QWebEngineScript.ScriptWorldId.ApplicationWorld.value
+LOCAL_PAGE_WORLD_ID = QWebEngineScript.ScriptWorldId.MainWorld.value
+
+GAZE_SCRIPT_NAME = "dyslexim-gaze"
+LOCAL_GAZE_SCRIPT_NAME = "dyslexim-gaze-local"
+
+
+def is_local_page(url):
+    """True for Dyslexim's bundled pages (onboarding, settings, home)."""
+    return any(url.startswith(prefix) for prefix in LOCAL_PAGE_PREFIXES)
+
+
+def script_world_for_url(url):
+    """The JS world the gaze handler runs in for `url`."""
+    return LOCAL_PAGE_WORLD_ID if is_local_page(url) else GAZE_WORLD_ID
+
+
+def _gaze_script_source(handler_js, for_local_pages):
+    # Both scripts are registered on every profile; each one only runs on the
+    # pages that belong to its world
+    return f"""
+    (function(){{
+      const isLocal = {json.dumps(list(LOCAL_PAGE_PREFIXES))}.some(p => location.href.startsWith(p));
+      if (isLocal !== {str(for_local_pages).lower()}) return;
+      {load_qwebchannel_js()}
+      {handler_js}
+    }})();
+    """
+
+
+def _make_script(name, source, world_id):
+    script = QWebEngineScript()
+    script.setName(name)
+    script.setSourceCode(source)
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+    script.setWorldId(world_id)
+    script.setRunsOnSubFrames(False)
+    return script
+
+
+def build_gaze_scripts(config):
+    """Builds the gaze handler scripts, seeded with the current settings."""
+    handler_js = get_js_gaze_handler(get_runtime_config(config))
+    return [
+        _make_script(GAZE_SCRIPT_NAME, _gaze_script_source(handler_js, False), GAZE_WORLD_ID),
+        _make_script(LOCAL_GAZE_SCRIPT_NAME, _gaze_script_source(handler_js, True), LOCAL_PAGE_WORLD_ID),
+    ]
+
+
+def install_gaze_scripts(profile, config):
+    """
+    Registers (or replaces) the gaze handler in `profile`'s script collection.
+    Every document loaded with the profile then gets it at DocumentReady, with
+    no post-load delay and no re-sending of the source from Python.
+    """
+    start = time.perf_counter() if metrics.enabled else None
+    collection = profile.scripts()
+    for name in (GAZE_SCRIPT_NAME, LOCAL_GAZE_SCRIPT_NAME):
+        for script in collection.find(name):
+            collection.remove(script)
+    for script in build_gaze_scripts(config):
+        collection.insert(script)
+    if start is not None:
+        metrics.record_ms('python.installScripts', (time.perf_counter() - start) * 1000.0)
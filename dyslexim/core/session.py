@@ -0,0 +1,137 @@
+# dyslexim/core/session.py
+import atexit
+import sqlite3
+import threading
+
+from .config import SESSION_WRITE_DELAY_S
+from .debounced_writer import DebouncedWriter
+
+# Per-tab columns; update_tab() only accepts these
+TAB_FIELDS = (
+    'position', 'url', 'title', 'scroll_x', 'scroll_y', 'zoom', 'gaze_enabled', 'focus_mode_enabled',
+)
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tabs (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL DEFAULT 0,
+    url TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    scroll_x REAL NOT NULL DEFAULT 0,
+    scroll_y REAL NOT NULL DEFAULT 0,
+    zoom REAL NOT NULL DEFAULT 1,
+    gaze_enabled INTEGER NOT NULL DEFAULT 1,
+    focus_mode_enabled INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SessionStore:
+    """
+    The open tabs, kept in a small SQLite database (one row per tab).
+
+    Changes are queued per tab and field: update_tab() just records the new
+    value, so a burst of scroll events costs a dict write each. A writer
+    thread applies everything queued after `write_delay_s` of quiet in one
+    transaction that touches only the changed rows and columns. flush() (also
+    run at exit) writes pending changes immediately.
+    """
+
+    def __init__(self, path, write_delay_s=SESSION_WRITE_DELAY_S):
+        self.path = path
+        self.write_delay_s = write_delay_s
+        self._lock = threading.Lock()
+        self._tabs = {}         # tab id -> {field: value} not yet written
+        self._removed = set()
+        self._meta = {}
+        self._writer = DebouncedWriter(self._lock, self._pending, self._write_pending, write_delay_s, 'dyslexim-session')
+        self._io_lock = threading.Lock()
+        self._db = None
+        atexit.register(self.flush)
+
+    def _connect(self):
+        # Called with _io_lock held; the connection is shared by the writer thread and flush()
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        return self._db
+
+    # --- Reading ---
+    def load(self):
+        """
+        Returns (tabs, current tab id) from the last session. Each tab is a dict
+        with an 'id' and every TAB_FIELDS column, in tab-bar order.
+        """
+        with self._io_lock:
+            try:
+                db = self._connect()
+                rows = db.execute(f"SELECT id, {', '.join(TAB_FIELDS)} FROM tabs ORDER BY position").fetchall()
+                current = db.execute("SELECT value FROM meta WHERE key = 'current'").fetchone()
+            except sqlite3.Error as e:
+                print(f"Could not read the session from {self.path}: {e}")
+                return [], None
+        tabs = [dict(zip(('id',) + TAB_FIELDS, row)) for row in rows]
+        return tabs, current[0] if current else None
+
+    # --- Changing ---
+    def update_tab(self, tab_id, **fields):
+        """Queues new values for some of a tab's fields (creating its row if needed)."""
+        unknown = set(fields) - set(TAB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown session fields: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self._removed.discard(tab_id)
+            self._tabs.setdefault(tab_id, {}).update(fields)
+        self._schedule_write()
+
+    def remove_tab(self, tab_id):
+        with self._lock:
+            self._tabs.pop(tab_id, None)
+            self._removed.add(tab_id)
+        self._schedule_write()
+
+    def set_current(self, tab_id):
+        with self._lock:
+            self._meta['current'] = tab_id
+        self._schedule_write()
+
+    # --- Writing ---
+    def _schedule_write(self):
+        with self._lock:
+            self._writer.schedule()
+
+    def _pending(self):
+        # Called with the lock held
+        return bool(self._tabs or self._removed or self._meta)
+
+    def _write_pending(self):
+        # Batches are taken under _io_lock so they reach the database in order
+        with self._io_lock:
+            with self._lock:
+                tabs, removed, meta = self._tabs, self._removed, self._meta
+                self._tabs, self._removed, self._meta = {}, set(), {}
+            if not (tabs or removed or meta):
+                return
+            try:
+                db = self._connect()
+                with db:
+                    for tab_id, fields in tabs.items():
+                        db.execute("INSERT OR IGNORE INTO tabs (id) VALUES (?)", (tab_id,))
+                        columns = ', '.join(f"{name} = ?" for name in fields)
+                        db.execute(f"UPDATE tabs SET {columns} WHERE id = ?", (*fields.values(), tab_id))
+                    db.executemany("DELETE FROM tabs WHERE id = ?", [(tab_id,) for tab_id in removed])
+                    db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+            except sqlite3.Error as e:
+                print(f"Could not save the session to {self.path}: {e}")
+
+    def flush(self):
+        """Writes pending changes now (called on exit)."""
+        self._write_pending()
@@ -0,0 +1,64 @@
+# dyslexim/core/startup.py
+import os
+import time
+
+
+def _process_age_s():
+    """Seconds since this process was started by the OS (Linux /proc), else 0."""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # Field 22 (starttime) comes after the parenthesised command name
+            fields = f.read().rsplit(')', 1)[1].split()
+        start_ticks = int(fields[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+class StartupTimeline:
+    """
+    Records named milestones from process start to an interactive first tab.
+
+    Each milestone is kept only the first time it is marked. When the
+    `final` milestone arrives, the timeline is printed if `print_on_complete`
+    was switched on (see `--startup-timeline`).
+    """
+
+    final = 'gaze handler injected'
+
+    def __init__(self):
+        now = time.perf_counter()
+        self._origin = now - _process_age_s()
+        self.marks = [('process start', 0.0)]
+        self._seen = {'process start'}
+        self.print_on_complete = False
+        self.mark('python ready', now)
+
+    def mark(self, name, at=None):
+        if name in self._seen:
+            return
+        self._seen.add(name)
+        t = (at if at is not None else time.perf_counter()) - self._origin
+        self.marks.append((name, t * 1000.0))
+        if name == self.final and self.print_on_complete:
+            print(self.report())
+
+    def elapsed_ms(self, name):
+        for mark_name, ms in self.marks:
+            if mark_name == name:
+                return ms
+        return None
+
+    def report(self):
+        lines = ["Startup timeline:"]
+        prev = 0.0
+        for name, ms in self.marks:
+            lines.append(f"  {ms:8.1f} ms  (+{ms - prev:7.1f})  {name}")
+            prev = ms
+        return "\n".join(lines)
+
+
+# Created at first import; main.py imports this before anything heavy
+startup_timeline = StartupTimeline()
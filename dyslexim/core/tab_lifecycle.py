@@ -0,0 +1,149 @@
+# dyslexim/core/tab_lifecycle.py
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+
+def read_process_rss_kb(pid):
+    """Returns the resident set size of `pid` in KiB from /proc, or None if unavailable."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class TabLifecycleManager(QObject):
+    """
+    Moves background tabs through the Active -> Frozen -> Discarded lifecycle.
+
+    Tabs that haven't been shown for `freeze_after_s` are frozen (no script
+    or timers run). If the renderers together use more than the memory budget,
+    the least recently used background tabs are discarded (renderer released).
+    A discarded tab keeps its URL, title and per-tab flags; its scroll
+    position is captured on discard and restored after it reloads.
+    """
+
+    def __init__(self, tabs, memory_budget_mb, freeze_after_s, check_interval_ms, parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+        self.memory_budget_kb = int(memory_budget_mb) * 1024
+        self.freeze_after_s = freeze_after_s
+        self._last_active = {}
+        self._current = None
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.check)
+        self._timer.start(check_interval_ms)
+
+    # --- Bookkeeping driven by the window ---
+    def touch(self, tab):
+        """Marks `tab` as just used."""
+        self._last_active[tab] = time.monotonic()
+
+    def forget(self, tab):
+        self._last_active.pop(tab, None)
+        if self._current is tab:
+            self._current = None
+
+    def activate(self, tab):
+        """Called when `tab` becomes the current tab; brings it back to Active."""
+        # The tab being left was in use until now, however long ago it was opened
+        if self._current is not None and self._current is not tab:
+            self.touch(self._current)
+        self._current = tab
+        self.touch(tab)
+        page = tab.view.page()
+        state = page.lifecycleState()
+        if state == LifecycleState.Active:
+            return
+        if state == LifecycleState.Discarded:
+            tab.restore_scroll_on_load()
+        page.setLifecycleState(LifecycleState.Active)
+
+    # --- Policy ---
+    def _background_tabs(self):
+        current = self.tabs.currentWidget()
+        tabs = [self.tabs.widget(i) for i in range(self.tabs.count())]
+        # Placeholder tabs have no renderer yet, so there is nothing to freeze
+        return [t for t in tabs if t is not None and t is not current and t.is_materialized()]
+
+    def check(self):
+        """Freezes idle background tabs, then discards LRU tabs while over budget."""
+        now = time.monotonic()
+        background = self._background_tabs()
+
+        for tab in background:
+            page = tab.view.page()
+            idle = now - self._last_active.get(tab, now)
+            if (page.lifecycleState() == LifecycleState.Active and idle >= self.freeze_after_s
+                    and self._allows(page, LifecycleState.Frozen)):
+                page.setLifecycleState(LifecycleState.Frozen)
+
+        usage = self.renderer_memory_kb()
+        if not usage:
+            return
+        total = sum(usage.values())
+        if total <= self.memory_budget_kb:
+            return
+
+        # Least recently used first
+        for tab in sorted(background, key=lambda t: self._last_active.get(t, 0)):
+            if total <= self.memory_budget_kb:
+                break
+            page = tab.view.page()
+            if (page.lifecycleState() == LifecycleState.Discarded
+                    or not self._allows(page, LifecycleState.Discarded)):
+                continue
+            pid = page.renderProcessPid()
+            self.discard(tab)
+            # Only count the renderer as freed if no other live tab shares it
+            if pid in usage and not self._pid_shared(pid, tab):
+                total -= usage.pop(pid)
+
+    def _pid_shared(self, pid, excluding):
+        for i in range(self.tabs.count()):
+            other = self.tabs.widget(i)
+            if other is not None and other is not excluding and other.is_materialized():
+                page = other.view.page()
+                if page.lifecycleState() != LifecycleState.Discarded and page.renderProcessPid() == pid:
+                    return True
+        return False
+
+    def renderer_memory_kb(self):
+        """Returns {renderer pid: RSS in KiB} for every live tab's renderer process."""
+        usage = {}
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if tab is None or not tab.is_materialized():
+                continue
+            pid = tab.view.page().renderProcessPid()
+            if pid and pid not in usage:
+                rss = read_process_rss_kb(pid)
+                if rss is not None:
+                    usage[pid] = rss
+        return usage
+
+    @staticmethod
+    def _allows(page, state):
+        """
+        True if Qt's recommended limit permits `state`. Going past it could stop
+        background audio or lose form input, so those tabs are left alone.
+        """
+        return page.recommendedState().value >= state.value
+
+    def discard(self, tab):
+        """Releases the tab's renderer, remembering where the user had scrolled to."""
+        page = tab.view.page()
+        tab.saved_scroll = page.scrollPosition()
+        if page.lifecycleState() == LifecycleState.Active:
+            page.setLifecycleState(LifecycleState.Frozen)
+        page.setLifecycleState(LifecycleState.Discarded)
@@ -0,0 +1,429 @@
+# dyslexim/core/text_analysis.py
+import multiprocessing
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .config import get_asset_path, TEXT_ANALYSIS_CHUNK, TEXT_ANALYSIS_WORKERS, TEXT_ANALYSIS_CACHE_ITEMS
+from .metrics import metrics
+from .reader import content_hash
+
+COMMON_WORDS_PATH = get_asset_path(os.path.join('assets', 'words', 'common-en.txt'))
+
+_WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+_SENTENCE_END = re.compile(r'[.!?]+(?=\s|$)')
+_VOWEL_GROUP = re.compile(r'[aeiouy]+')
+
+# Consonant pairs that are never split (the syllable break goes before them)...
+_DIGRAPHS = {'ch', 'sh', 'th', 'ph', 'wh', 'gh'}
+# ...or after them
+_CLOSING_PAIRS = {'ck', 'ng', 'gn'}
+# Pairs that start the next syllable even on their own: 'se-cret', 'pa-ra-graph'
+_BLENDS = {'bl', 'br', 'cl', 'cr', 'dr', 'fl', 'fr', 'gl', 'gr', 'pl', 'pr', 'tr'}
+# Onsets a syllable can start with when a longer consonant cluster is split
+_ONSETS = {
+    'sc', 'sk', 'sl', 'sm', 'sn', 'sp', 'st', 'sw', 'tw',
+    'chr', 'sch', 'scr', 'shr', 'spl', 'spr', 'str', 'thr',
+} | _BLENDS | _DIGRAPHS
+# Where a vowel group is said as two syllables (checked at each position inside a group)
+_HIATUS_SPLIT = re.compile(
+    r'(?<=[aeiouy])(?=ing)'                                  # go-ing, be-ing, play-ing
+    r'|(?<=^cre)(?=at[eio])|(?<=^re)(?=act)|(?<=the)(?=at)'  # cre-ate, re-act, the-a-ter
+    r'|(?<=[aeiouy][^aeiouy]e)(?=a$)'                        # i-de-a, a-re-a (but not 'sea')
+    r'|(?<=[^tcsx]i)(?=en[tc]|et)|(?<=^sci)(?=en)'           # in-gre-di-ent, qui-et, sci-ence
+    r'|(?<=i)(?=ety)'                                        # va-ri-e-ty, so-ci-e-ty
+    r'|(?<=o)(?=e[mt])|(?<=o)(?=ic(?:$|al))'                 # po-em, po-et, he-ro-ic
+    r'|(?<=[dr]e)(?=o)|(?<=the)(?=o)'                        # vi-de-o, ste-re-o, the-o-ry
+    r'|(?<=[rl]u)(?=i[nd])|(?<=tu)(?=it)'                    # ru-in, flu-id, in-tu-i-tion
+)
+# Vowel pairs said separately, unless after these: 'na-tion', 'spe-cial', 'mil-lion', 'guard'
+_HIATUS = {
+    'ia': ('t', 's', 'c', 'x', 'g', 'll'), 'io': ('t', 's', 'c', 'x', 'g', 'll'),
+    'iu': ('t', 's', 'c', 'x', 'g', 'll'), 'ua': ('g',), 'uo': ('g',),
+}
+_E_SUFFIXES = ('ly', 'ment', 'ness', 'ful', 'less')
+
+# A word is only called rare when it isn't common and is long or has many syllables
+RARE_MIN_SYLLABLES = 3
+RARE_MIN_LETTERS = 9
+
+_common_words = None
+
+
+def common_words():
+    """The bundled common word list, loaded once per process."""
+    global _common_words
+    if _common_words is None:
+        words = set()
+        try:
+            with open(COMMON_WORDS_PATH, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        words.add(line.lower())
+        except OSError as e:
+            print(f"Could not read common words from {COMMON_WORDS_PATH}: {e}")
+        _common_words = frozenset(words)
+    return _common_words
+
+
+def _vowel_groups(word):
+    """(start, end) of each vowel sound in lowercase `word`, leaving out silent endings."""
+    groups = []
+    for m in _VOWEL_GROUP.finditer(word):
+        start, end = m.span()
+        # 'y' starting a word is a consonant: 'yes', 'you'
+        if start == 0 and word[0] == 'y' and end > 1:
+            start = 1
+        # The 'u' of 'qu' belongs to the consonant: 'queen', 'quickly'
+        if start > 0 and word[start - 1] == 'q' and word[start] == 'u':
+            if end - start == 1:
+                continue
+            start += 1
+        # Two vowels said separately: 'po-em', 'go-ing', 'li-on', 'ac-tu-al'
+        split = next((i for i in range(start + 1, end) if _HIATUS_SPLIT.match(word, i)), None)
+        keep_after = _HIATUS.get(word[start:end]) if end - start == 2 else None
+        if split is not None:
+            groups.append((start, split))
+            start = split
+        elif keep_after and not word[:start].endswith(keep_after):
+            groups.append((start, start + 1))
+            start += 1
+        groups.append((start, end))
+    # Silent 'e' before a suffix: 'lovely', 'statement', 'careful'
+    groups = [
+        (start, end) for start, end in groups
+        if not (word[start:end] == 'e' and word.endswith(_E_SUFFIXES, end) and word[end:] in _E_SUFFIXES
+                and start >= 2 and word[start - 1] not in 'aeiouy' and word[start - 2] in 'aeiouy')
+    ]
+    if len(groups) > 1:
+        start, end = groups[-1]
+        ending = word[start:]
+        before = word[start - 1]
+        after_consonant = start > 1 and word[start - 2] not in 'aeiouy'
+        silent = (
+            # 'make', 'hope', but not 'table', 'be'
+            (ending == 'e' and not (before == 'l' and after_consonant))
+            # 'jumped', 'loved', but not 'wanted', 'hundred'
+            or (ending == 'ed' and before not in 'td' and not (before == 'r' and after_consonant))
+            # 'makes', but not 'boxes', 'wishes', 'pages'
+            or (ending == 'es' and before not in 'sxzhcg')
+        )
+        if silent:
+            groups.pop()
+    return groups
+
+
+def syllabify(word):
+    """
+    Splits `word` into syllables, e.g. 'paragraph' -> ['pa', 'ra', 'graph'].
+
+    A heuristic for English: silent endings are dropped, a single consonant
+    between vowels starts the next syllable, and longer clusters are split
+    so the next syllable starts with a pronounceable onset.
+    """
+    lower = word.lower()
+    groups = _vowel_groups(lower)
+    if len(groups) < 2:
+        return [word]
+    cuts = []
+    for (_, end), (start, _) in zip(groups, groups[1:]):
+        cluster = lower[end:start]
+        if not cluster:
+            cut = start
+        elif 'e' in cluster:
+            # A silent 'e' stays with its syllable: 'love-ly', 'state-ment'
+            cut = end + cluster.rindex('e') + 1
+        elif len(cluster) == 1:
+            # 'ex-it', otherwise 'ti-ger'
+            cut = start if cluster == 'x' else end
+        elif start == len(lower) - 1 and lower.endswith('le'):
+            # 'ta-ble', 'lit-tle'
+            cut = start - 2
+        elif cluster[:2] in _CLOSING_PAIRS and cluster[1:] not in _BLENDS:
+            # 'sing-er', 'back-pack', but 'in-gre-di-ent', 'hun-gry'
+            cut = end + 2
+        else:
+            cut = end + 1
+            for onset in (cluster[-3:], cluster[-2:]):
+                if onset in _ONSETS and (len(onset) < len(cluster) or onset in _BLENDS or onset in _DIGRAPHS):
+                    cut = start - len(onset)
+                    break
+        cuts.append(cut)
+    parts, last = [], 0
+    for cut in cuts:
+        if last < cut < len(word):
+            parts.append(word[last:cut])
+            last = cut
+    parts.append(word[last:])
+    return parts
+
+
+def count_syllables(word):
+    return len(syllabify(word))
+
+
+def _base_forms(word):
+    """`word` and what it could be an inflection of: 'studies' -> 'study', 'running' -> 'run'."""
+    yield word
+    for suffix, replacements in (
+        ('ies', ('y',)), ('ied', ('y',)), ('ier', ('y',)), ('iest', ('y',)), ('ily', ('y',)),
+        ('es', ('', 'e')), ('s', ('',)), ('ed', ('', 'e')), ('ing', ('', 'e')),
+        ('ly', ('', 'le')), ('er', ('', 'e')), ('est', ('', 'e')), ('ness', ('',)),
+    ):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)]
+            for replacement in replacements:
+                yield stem + replacement
+            # 'running', 'bigger'
+            if len(stem) > 2 and stem[-1] == stem[-2]:
+                yield stem[:-1]
+
+
+def is_rare(word, syllables):
+    lower = word.lower()
+    if len(lower) < RARE_MIN_LETTERS and syllables < RARE_MIN_SYLLABLES:
+        return False
+    common = common_words()
+    # Two levels deep, for 'researchers' -> 'researcher' -> 'research'
+    return not any(
+        form in common or any(base in common for base in _base_forms(form))
+        for form in _base_forms(lower)
+    )
+
+
+def reading_ease(words, sentences, syllables):
+    """Flesch reading ease: 100 is very easy, below 30 is very difficult."""
+    return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+
+
+def grade_level(words, sentences, syllables):
+    """Flesch-Kincaid grade level: roughly the US school year the text suits."""
+    return 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
+
+
+def readability_label(ease):
+    for floor, label in ((90, 'very easy'), (80, 'easy'), (70, 'fairly easy'), (60, 'plain'),
+                         (50, 'fairly difficult'), (30, 'difficult')):
+        if ease >= floor:
+            return label
+    return 'very difficult'
+
+
+def analyze_paragraph(text):
+    """
+    Readability counts and scores for one paragraph, plus its rare words as
+    [lowercase word, [syllables]] pairs (each word once).
+    """
+    words = syllables = 0
+    rare, seen = [], set()
+    sentence_start = True
+    position = 0
+    for match in _WORD.finditer(text):
+        word = match.group()
+        # A sentence ended between the previous word and this one
+        if _SENTENCE_END.search(text, position, match.start()):
+            sentence_start = True
+        position = match.end()
+        parts = syllabify(word)
+        words += 1
+        syllables += len(parts)
+        lower = word.lower()
+        # Names and acronyms are left alone; a capital at a sentence start means nothing
+        proper = word[0].isupper() and (not sentence_start or word.isupper())
+        sentence_start = False
+        if lower in seen or proper or not is_rare(word, len(parts)):
+            continue
+        seen.add(lower)
+        rare.append([lower, [p.lower() for p in parts]])
+    if not words:
+        return {'words': 0, 'sentences': 0, 'syllables': 0, 'rare': []}
+    sentences = max(1, len(_SENTENCE_END.findall(text)))
+    return {
+        'words': words,
+        'sentences': sentences,
+        'syllables': syllables,
+        'ease': round(reading_ease(words, sentences, syllables), 1),
+        'grade': round(grade_level(words, sentences, syllables), 1),
+        'rare': rare,
+    }
+
+
+def analyze_batch(texts):
+    """Worker-process entry point: analyze_paragraph for each text."""
+    return [analyze_paragraph(text) for text in texts]
+
+
+class TextAnalysisCache:
+    """LRU of paragraph analyses keyed by the paragraph's content hash."""
+
+    def __init__(self, capacity=TEXT_ANALYSIS_CACHE_ITEMS):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+    def get(self, digest):
+        result = self._entries.get(digest)
+        if result is not None:
+            self._entries.move_to_end(digest)
+        return result
+
+    def put(self, digest, result):
+        self._entries[digest] = result
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+class TextAnalyzer(QObject):
+    """
+    Runs analyze_batch in a pool of worker processes, shared by all tabs.
+
+    submit() hands cached paragraphs back right away; the rest are split into
+    chunks of TEXT_ANALYSIS_CHUNK that run in parallel, and each chunk's
+    results go back to the tabs that asked as soon as it finishes. A paragraph
+    already being analyzed for one tab isn't analyzed again for another.
+    """
+
+    # (digests, future, submit time), from a worker thread to the GUI thread
+    _analyzed = pyqtSignal(object, object, float)
+
+    def __init__(self, workers=TEXT_ANALYSIS_WORKERS, parent=None):
+        super().__init__(parent)
+        self.workers = workers
+        self.cache = TextAnalysisCache()
+        self._pool = None
+        self._waiting = {}   # digest -> [(stream, generation, paragraph id), ...]
+        self._analyzed.connect(self._on_analyzed)
+
+    def submit(self, stream, paragraphs):
+        """Analyzes (id, text) pairs for `stream`; results arrive through stream.deliver()."""
+        ready, todo = [], []
+        for paragraph_id, text in paragraphs:
+            digest = content_hash(text)
+            result = self.cache.get(digest)
+            if result is not None:
+                ready.append(dict(result, id=paragraph_id))
+                continue
+            waiters = self._waiting.get(digest)
+            if waiters is None:
+                waiters = self._waiting[digest] = []
+                todo.append((digest, text))
+            waiters.append((stream, stream.generation, paragraph_id))
+            stream.pending += 1
+        if ready:
+            stream.deliver(ready)
+        if not todo:
+            return
+        if self._pool is None:
+            # Spawned like the reader's worker: forking the threaded GUI process can deadlock
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        for i in range(0, len(todo), TEXT_ANALYSIS_CHUNK):
+            chunk = todo[i:i + TEXT_ANALYSIS_CHUNK]
+            digests = [digest for digest, _ in chunk]
+            submitted = time.perf_counter()
+            future = self._pool.submit(analyze_batch, [text for _, text in chunk])
+            future.add_done_callback(lambda f, d=digests, t=submitted: self._analyzed.emit(d, f, t))
+
+    def _on_analyzed(self, digests, future, submitted):
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Text analysis failed: {e}")
+            results = [None] * len(digests)
+        if metrics.enabled:
+            metrics.record_ms('textAnalysis.chunk', (time.perf_counter() - submitted) * 1000.0)
+        by_stream = {}
+        for digest, result in zip(digests, results):
+            if result is not None:
+                self.cache.put(digest, result)
+            for stream, generation, paragraph_id in self._waiting.pop(digest, ()):
+                if stream.generation != generation:
+                    continue
+                stream.pending -= 1
+                annotations = by_stream.setdefault(stream, [])
+                if result is not None:
+                    annotations.append(dict(result, id=paragraph_id))
+        for stream, annotations in by_stream.items():
+            try:
+                stream.deliver(annotations)
+            except RuntimeError:
+                # The tab closed while its paragraphs were being analyzed
+                pass
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class TextAnalysisStream(QObject):
+    """
+    Per-tab QWebChannel object ('analysis'). The page sends batches of
+    [id, text] paragraphs to analyze() and gets their annotations back
+    through `annotated`, a chunk at a time as the workers finish. Whenever
+    nothing is outstanding, `finished` carries the page's overall
+    readability (see summary()) if its label or grade changed.
+    """
+
+    # [{'id', 'words', 'sentences', 'syllables', 'ease', 'grade', 'rare'}, ...]
+    annotated = pyqtSignal(list)
+    finished = pyqtSignal(object)
+
+    def __init__(self, analyzer, parent=None):
+        super().__init__(parent)
+        self.analyzer = analyzer
+        self.generation = 0
+        self.pending = 0
+        self._totals = [0, 0, 0]   # words, sentences, syllables
+        self._reported = None
+
+    @pyqtSlot()
+    def reset(self):
+        """A new document (or analysis switched back on): results still on their way are dropped."""
+        self.generation += 1
+        self.pending = 0
+        self._totals = [0, 0, 0]
+        self._reported = None
+
+    @pyqtSlot(list)
+    def analyze(self, batch):
+        paragraphs = [
+            (item[0], item[1]) for item in batch
+            if isinstance(item, list) and len(item) == 2 and isinstance(item[1], str)
+        ]
+        if paragraphs:
+            self.analyzer.submit(self, paragraphs)
+
+    def deliver(self, annotations):
+        for annotation in annotations:
+            self._totals[0] += annotation['words']
+            self._totals[1] += annotation['sentences']
+            self._totals[2] += annotation['syllables']
+        if annotations:
+            self.annotated.emit(annotations)
+        if self.pending:
+            return
+        summary = self.summary()
+        if summary is None:
+            return
+        reported = (summary['label'], round(summary['grade']))
+        if reported != self._reported:
+            self._reported = reported
+            self.finished.emit(summary)
+
+    def summary(self):
+        """Readability of everything analyzed on the page so far, or None."""
+        words, sentences, syllables = self._totals
+        if not words or not sentences:
+            return None
+        ease = reading_ease(words, sentences, syllables)
+        return {
+            'words': words,
+            'ease': round(ease, 1),
+            'grade': round(grade_level(words, sentences, syllables), 1),
+            'label': readability_label(ease),
+        }
@@ -0,0 +1,280 @@
+# dyslexim/core/tts.py
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, QBuffer, QByteArray, QIODevice, pyqtSignal, pyqtSlot, pyqtProperty
+
+try:
+    from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+except ImportError:
+    # Without QtMultimedia (or its system audio libraries) pages fall back to speechSynthesis
+    QMediaPlayer = None
+    QAudioOutput = None
+
+from .config import get_user_data_dir, TTS_MEMORY_CACHE_ITEMS, TTS_DISK_CACHE_MB, TTS_PREFETCH_CHUNKS
+
+# Sentence ends, keeping the punctuation with its sentence
+_SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+|\n{2,}')
+# Long sentences are cut at the last comma or space before this many characters
+MAX_CHUNK_CHARS = 220
+# ...and the first chunk is kept short so speech starts right away
+FIRST_CHUNK_CHARS = 100
+
+
+def _split_long(sentence, limit):
+    parts = []
+    while len(sentence) > limit:
+        cut = max(sentence.rfind(', ', 0, limit), sentence.rfind(' ', 0, limit))
+        if cut <= 0:
+            cut = limit
+        parts.append(sentence[:cut + 1].strip())
+        sentence = sentence[cut + 1:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def split_into_chunks(text):
+    """Splits `text` into sentence-sized chunks; the first one is short so it synthesizes fast."""
+    chunks = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = ' '.join(sentence.split())
+        if not sentence:
+            continue
+        limit = FIRST_CHUNK_CHARS if not chunks else MAX_CHUNK_CHARS
+        chunks.extend(_split_long(sentence, limit))
+    return chunks
+
+
+def find_tts_engine():
+    """Returns the path of a local espeak-ng (or espeak) binary, or None."""
+    return shutil.which('espeak-ng') or shutil.which('espeak')
+
+
+class AudioCache:
+    """
+    Two-level LRU cache of synthesized WAV audio: a small in-memory level and
+    a size-capped directory on disk. Keys are sha256(text|voice|rate).
+    """
+
+    def __init__(self, directory, memory_items=TTS_MEMORY_CACHE_ITEMS, disk_mb=TTS_DISK_CACHE_MB):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk_bytes = int(disk_mb) * 1024 * 1024
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text, voice, rate):
+        return hashlib.sha256(f"{text}|{voice}|{rate}".encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.wav')
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime doubles as the disk level's LRU clock
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        self._remember(key, data)
+        tmp = self._path(key) + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"TTS cache write failed: {e}")
+        self._trim_disk()
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _trim_disk(self):
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith('.wav')]
+        except OSError:
+            return
+        total = sum(e.stat().st_size for e in entries)
+        if total <= self.disk_bytes:
+            return
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total <= self.disk_bytes:
+                break
+            try:
+                total -= entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class TTSService(QObject):
+    """
+    Offline text-to-speech for the page handlers (registered as 'tts' on each
+    tab's web channel).
+
+    speak() splits the text into sentences and synthesizes them one by one in
+    espeak-ng worker processes (run from a small thread pool), starting
+    playback as soon as the first sentence is ready and keeping the next
+    TTS_PREFETCH_CHUNKS sentences synthesized ahead. Audio is cached by text,
+    voice and rate, so rereading a paragraph plays straight from the cache.
+    """
+
+    # (generation, chunk index, wav bytes or None) - emitted from worker threads
+    _chunkSynthesized = pyqtSignal(int, int, object)
+
+    def __init__(self, voice='en', rate=175, parent=None):
+        super().__init__(parent)
+        self.voice = voice
+        self.rate = int(rate)
+        self.engine = find_tts_engine()
+        self._available = bool(self.engine and QMediaPlayer is not None)
+        self.cache = AudioCache(get_user_data_dir('tts-cache'))
+        self._pool = None
+
+        self._generation = 0
+        self._chunks = []
+        self._audio = {}        # chunk index -> wav bytes, for the current generation
+        self._requested = set()
+        self._playing = -1
+        self._buffer = None
+
+        # The audio stack is only brought up the first time something is spoken
+        self._player = None
+        self._output = None
+        self._chunkSynthesized.connect(self._on_chunk)
+
+    @pyqtProperty(bool, constant=True)
+    def available(self):
+        """False when no local engine or audio output exists; pages then use speechSynthesis."""
+        return self._available
+
+    @pyqtSlot(str)
+    def speak(self, text):
+        """Stops whatever is playing and reads `text` aloud."""
+        self.stop()
+        if not self._available:
+            return
+        self._chunks = split_into_chunks(text)
+        self._request_ahead(0)
+
+    @pyqtSlot()
+    def stop(self):
+        """Stops playback; synthesis already running for the old text is discarded."""
+        self._generation += 1
+        self._chunks = []
+        self._audio = {}
+        self._requested = set()
+        self._playing = -1
+        if self._player is not None:
+            self._player.stop()
+
+    def shutdown(self):
+        self.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # --- Synthesis ---
+    def _request_ahead(self, start):
+        for index in range(start, min(start + 1 + TTS_PREFETCH_CHUNKS, len(self._chunks))):
+            if index in self._requested:
+                continue
+            self._requested.add(index)
+            text = self._chunks[index]
+            key = self.cache.key(text, self.voice, self.rate)
+            data = self.cache.get(key)
+            if data is not None:
+                self._on_chunk(self._generation, index, data)
+                continue
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='dyslexim-tts')
+            self._pool.submit(self._synthesize, self._generation, index, text, key)
+
+    def _synthesize(self, generation, index, text, key):
+        # Runs on a pool thread; the engine itself is a separate process
+        data = None
+        if generation == self._generation:
+            try:
+                result = subprocess.run(
+                    [self.engine, '--stdout', '-v', self.voice, '-s', str(self.rate), text],
+                    capture_output=True, timeout=30,
+                )
+                if result.returncode == 0 and result.stdout:
+                    data = result.stdout
+                    self.cache.put(key, data)
+                else:
+                    print(f"TTS engine failed: {result.stderr.decode(errors='replace').strip()}")
+            except (OSError, subprocess.TimeoutExpired) as e:
+                print(f"TTS engine failed: {e}")
+        self._chunkSynthesized.emit(generation, index, data)
+
+    # --- Playback ---
+    def _on_chunk(self, generation, index, data):
+        if generation != self._generation:
+            return
+        self._audio[index] = data
+        if self._playing < 0 and index == 0:
+            self._play(0)
+        elif index == self._playing and not self._is_playing():
+            # Playback reached this chunk before it was ready
+            self._play(index)
+
+    def _is_playing(self):
+        return self._player is not None and self._player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+
+    def _ensure_player(self):
+        if self._player is None:
+            self._output = QAudioOutput(self)
+            self._player = QMediaPlayer(self)
+            self._player.setAudioOutput(self._output)
+            self._player.mediaStatusChanged.connect(self._on_media_status)
+        return self._player
+
+    def _play(self, index):
+        self._playing = index
+        if index >= len(self._chunks):
+            return
+        self._request_ahead(index + 1)
+        data = self._audio.get(index)
+        if data is None:
+            if index in self._audio:
+                # Synthesis failed for this chunk; skip it
+                self._play(index + 1)
+            return
+        buffer = QBuffer(self)
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        player = self._ensure_player()
+        player.setSourceDevice(buffer)
+        # The player has let go of the previous chunk's buffer now
+        if self._buffer is not None:
+            self._buffer.deleteLater()
+        self._buffer = buffer
+        player.play()
+
+    def _on_media_status(self, status):
+        if status == QMediaPlayer.MediaStatus.EndOfMedia and self._playing >= 0:
+            self._audio.pop(self._playing, None)
+            self._play(self._playing + 1)
@@ -1,21 +1,59 @@
 # dyslexim/main.py
 
+import argparse
 import sys
 
+from core.startup import startup_timeline
+from core.gaze_trace import TraceGazeSource, is_gaze_trace_file, load_gaze_trace
+from core.metrics import metrics, write_metrics_json
+
 from PyQt6.QtWidgets import QApplication
 
 from core.main_window import DysleximMainWindow
+from core.scheme import register_url_scheme
 
 
 def main():
     """Initializes and runs the Dyslexim application."""
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog="dyslexim")
+    parser.add_argument(
+        "--gaze-source", default="mouse",
+        help="mouse (default), udp://host:port, tcp://host:port, a trace recorded with --record-trace, "
+             "or a text file of 't x y' lines"
+    )
+    parser.add_argument("--record-trace", metavar="PATH", help="record dispatched gaze samples to a trace file")
+    parser.add_argument("--startup-timeline", action="store_true", help="print startup milestones once the first tab is interactive")
+    parser.add_argument("--metrics", action="store_true", help="record latency histograms and counters (see dyslexim://metrics)")
+    parser.add_argument("--metrics-json", metavar="PATH", help="record metrics and write them to PATH as JSON on exit")
+    args, qt_args = parser.parse_known_args()
+    gaze_source = args.gaze_source
+    if is_gaze_trace_file(gaze_source):
+        try:
+            gaze_source = TraceGazeSource(load_gaze_trace(gaze_source), to_global=None)
+        except (OSError, ValueError, EOFError) as e:
+            parser.error(f"could not read gaze trace {args.gaze_source}: {e}")
+    startup_timeline.print_on_complete = args.startup_timeline
+    # Off by default: every instrumented call site checks this flag first
+    metrics.enabled = args.metrics or bool(args.metrics_json)
+
+    # Custom schemes must be known to Chromium before the application starts
+    register_url_scheme()
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Dyslexim")
+    startup_timeline.mark('QApplication created')
 
-    window = DysleximMainWindow()
+    window = DysleximMainWindow(gaze_source=gaze_source, record_trace=args.record_trace)
+    startup_timeline.mark('window constructed')
     window.show()
-
-    sys.exit(app.exec())
+    if isinstance(gaze_source, TraceGazeSource):
+        # Recorded positions are relative to the web view; replay them onto the current tab
+        gaze_source.to_global = window.view_to_global
+        gaze_source.begin()
+
+    exit_code = app.exec()
+    if args.metrics_json:
+        write_metrics_json(args.metrics_json, window.metrics_snapshot())
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+# dyslexim/tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# The app imports its modules as core.*, relative to dyslexim/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """A QCoreApplication for tests that need Qt objects (timers, signals)."""
+    from PyQt6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
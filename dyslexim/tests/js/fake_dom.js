@@ -0,0 +1,68 @@
+// Just enough DOM to run the generated gaze handler under node.
+// Usage: node fake_dom.js HANDLER.js SCENARIO.js
+// The scenario runs after the handler with `dom` in scope and prints its result as JSON.
+const fs = require('fs');
+const handler = fs.readFileSync(process.argv[2], 'utf8');
+const scenario = fs.readFileSync(process.argv[3], 'utf8');
+
+let rafQueue = [];
+function makeElement(tag, text) {
+  const classes = new Set();
+  return {
+    tagName: tag, nodeType: 1, isConnected: true, style: {}, children: [],
+    textContent: text || '', innerText: text || '',
+    classList: {
+      add: (...c) => c.forEach(x => classes.add(x)),
+      remove: (...c) => c.forEach(x => classes.delete(x)),
+      contains: c => classes.has(c),
+    },
+    getBoundingClientRect: () => ({ left: 10, top: 100, right: 300, bottom: 140, width: 290, height: 40 }),
+    closest: () => null, matches: () => tag === 'P', querySelectorAll: () => [], querySelector: () => null,
+    appendChild(c) { this.children.push(c); c.isConnected = true; return c; },
+    remove() { this.isConnected = false; },
+    setAttribute() {}, getAttribute() {}, addEventListener() {}, removeEventListener() {},
+  };
+}
+
+// Ten paragraphs side by side: gaze x in [0, 1) picks one
+const paragraphs = Array.from({ length: 10 }, (_, i) => makeElement('P', `paragraph ${i}`));
+
+global.window = global;
+global.innerWidth = 1000;
+global.innerHeight = 600;
+global.scrollX = 0;
+global.scrollY = 0;
+global.requestAnimationFrame = fn => rafQueue.push(fn);
+global.performance = { now: () => Date.now() };
+global.speechSynthesis = { cancel() {}, speak() {} };
+global.SpeechSynthesisUtterance = function () {};
+global.addEventListener = () => {};
+global.document = {
+  documentElement: makeElement('HTML'), body: makeElement('BODY'), head: makeElement('HEAD'),
+  createElement: t => makeElement(t.toUpperCase()),
+  elementFromPoint: x => paragraphs[Math.min(paragraphs.length - 1, Math.floor(x / 100))],
+  querySelectorAll: () => paragraphs, querySelector: () => null, contains: () => true,
+  createRange: () => ({ selectNodeContents() {} }),
+  addEventListener() {}, removeEventListener() {}, visibilityState: 'visible',
+};
+global.IntersectionObserver = function () { this.observe = () => {}; this.unobserve = () => {}; this.disconnect = () => {}; };
+global.ResizeObserver = function () { this.observe = () => {}; this.unobserve = () => {}; this.disconnect = () => {}; };
+global.MutationObserver = function () { this.observe = () => {}; this.disconnect = () => {}; };
+global.CSS = { highlights: new Map() };
+global.Highlight = function () { this.add = () => {}; this.clear = () => {}; };
+
+const dom = {
+  paragraphs,
+  sleep: ms => new Promise(resolve => setTimeout(resolve, ms)),
+  // Runs queued animation frames, as the renderer would
+  frame() { const q = rafQueue; rafQueue = []; q.forEach(fn => fn(performance.now())); },
+  done(result) { console.log(JSON.stringify(result)); },
+};
+
+try {
+  eval(handler);
+} catch (e) {
+  dom.done({ installError: String(e) });
+  process.exit(0);
+}
+eval(`(async () => { ${scenario} })().catch(e => dom.done({ scenarioError: String(e) }));`);
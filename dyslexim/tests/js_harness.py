@@ -0,0 +1,27 @@
+# dyslexim/tests/js_harness.py
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+FAKE_DOM = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'js', 'fake_dom.js')
+
+
+def run_in_fake_dom(handler_js, scenario_js, timeout=20):
+    """Runs the handler then `scenario_js` under node with a stand-in DOM; returns what it passed to dom.done()."""
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip("node is not installed")
+    with tempfile.TemporaryDirectory() as tmp:
+        handler_path = os.path.join(tmp, 'handler.js')
+        scenario_path = os.path.join(tmp, 'scenario.js')
+        with open(handler_path, 'w', encoding='utf-8') as f:
+            f.write(handler_js)
+        with open(scenario_path, 'w', encoding='utf-8') as f:
+            f.write(scenario_js)
+        out = subprocess.run([node, FAKE_DOM, handler_path, scenario_path],
+                             capture_output=True, text=True, timeout=timeout, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
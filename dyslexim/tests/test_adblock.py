@@ -0,0 +1,138 @@
+# dyslexim/tests/test_adblock.py
+import pytest
+
+# QtWebEngine needs system libraries (X11, NSS...) that headless CI boxes may lack
+pytest.importorskip("PyQt6.QtWebEngineCore", exc_type=ImportError)
+
+from core.adblock import (
+    FIRST_PARTY, THIRD_PARTY, TYPE_BITS, FilterEngine, Request, RuleSet, load_engine, parse_filter,
+)
+
+LISTS = """\
+! Title: test list
+[Adblock Plus 2.0]
+||doubleclick.net^
+||ads.example.com/banner/
+/tracker.js$script,third-party
+-advert-$image,domain=news.example.org|~sports.news.example.org
+@@||doubleclick.net/allowed^
+@@||trusted.example^$document
+example.net##.ad-box
+||popup.example$popup
+||csp.example^$csp=script-src 'none'
+"""
+
+
+def make_engine():
+    engine = FilterEngine()
+    engine.add_lines(LISTS.splitlines())
+    engine.build()
+    return engine
+
+
+def check(engine, url, source='https://site.example/', type_name='script'):
+    host = url.split('/')[2]
+    source_host = source.split('/')[2] if source else ''
+    blocked = engine.check(url, host, source, source_host, type_name)
+    return blocked.text if blocked is not None else None
+
+
+def test_parse_filter_options():
+    exception, flt, host, keyword = parse_filter('||cdn.example.com^$script,~third-party,match-case')
+    assert (exception, host, keyword) == (False, 'cdn.example.com', None)
+    assert flt.types == TYPE_BITS['script']
+    assert flt.party == FIRST_PARTY
+    assert flt.regex is None  # decided by the domain trie alone
+
+    exception, flt, host, keyword = parse_filter('@@/ads/banner.$image,domain=a.example|~b.a.example')
+    assert exception and host is None and keyword == '/ads/banner.'
+    assert flt.include == {'a.example'} and flt.exclude == {'b.a.example'}
+
+
+def test_parse_filter_skips_what_it_cannot_apply():
+    assert parse_filter('! comment') is None
+    assert parse_filter('example.net##.ad-box') is None
+    assert parse_filter('||popup.example$popup') is None
+    assert parse_filter("||csp.example^$csp=script-src 'none'") is None
+
+
+def test_skipped_lines_are_counted():
+    assert make_engine().skipped == 3
+
+
+def test_domain_anchor_matches_the_host_and_its_subdomains_only():
+    engine = make_engine()
+    assert check(engine, 'https://doubleclick.net/ad.js') == '||doubleclick.net^'
+    assert check(engine, 'https://stats.g.doubleclick.net/ad.js') == '||doubleclick.net^'
+    assert check(engine, 'https://notdoubleclick.net/ad.js') is None
+    assert check(engine, 'https://doubleclick.network/ad.js') is None
+
+
+def test_domain_anchor_with_a_path():
+    engine = make_engine()
+    assert check(engine, 'https://ads.example.com/banner/1.png', type_name='image') == '||ads.example.com/banner/'
+    assert check(engine, 'https://ads.example.com/other/1.png', type_name='image') is None
+
+
+def test_third_party_option():
+    engine = make_engine()
+    assert check(engine, 'https://cdn.other.example/tracker.js') == '/tracker.js$script,third-party'
+    # Same site, other subdomain: first party
+    assert check(engine, 'https://cdn.site.example/tracker.js') is None
+    # Only scripts
+    assert check(engine, 'https://cdn.other.example/tracker.js', type_name='image') is None
+
+
+def test_domain_option_and_exceptions():
+    engine = make_engine()
+    url = 'https://img.cdn.example/x-advert-1.png'
+    assert check(engine, url, 'https://news.example.org/a', 'image') is not None
+    assert check(engine, url, 'https://sports.news.example.org/a', 'image') is None
+    assert check(engine, url, 'https://elsewhere.example/a', 'image') is None
+    assert check(engine, 'https://doubleclick.net/allowed/x.js') is None
+    # @@...$document turns blocking off for the whole page
+    assert check(engine, 'https://doubleclick.net/ad.js', 'https://trusted.example/') is None
+
+
+def test_request_party_is_compared_by_base_domain():
+    assert Request('https://a.bbc.co.uk/', 'a.bbc.co.uk', 'news.bbc.co.uk', 1).party == FIRST_PARTY
+    assert Request('https://x.co.uk/', 'x.co.uk', 'bbc.co.uk', 1).party == THIRD_PARTY
+
+
+def test_rule_set_indexes_filters_by_host_keyword_or_neither():
+    rules = RuleSet()
+    for line in ('||doubleclick.net^', '/tracker.js', '*$ping'):
+        rules.add(*parse_filter(line)[1:])
+    rules.build()
+    assert len(rules) == 3
+    assert rules.domains['net']['doubleclick'][''] == [0]
+    assert rules.keywords.search(b'https://x.example/tracker.js?v=1') == [1]
+    assert rules.generic == [2]
+
+
+def test_load_engine_caches_the_compiled_lists(tmp_path, monkeypatch):
+    list_path = tmp_path / 'easylist.txt'
+    list_path.write_text(LISTS, encoding='utf-8')
+    cache_path = str(tmp_path / 'compiled.pickle')
+
+    built = load_engine([str(list_path)], cache_path)
+    # The second load must come from the cache, not from parsing the lists again
+    monkeypatch.setattr(FilterEngine, 'add_lines', lambda self, lines: pytest.fail("lists parsed again"))
+    cached = load_engine([str(list_path)], cache_path)
+
+    assert (len(cached.block), len(cached.allow)) == (len(built.block), len(built.allow))
+    assert [f.text for f in cached.block.filters] == [f.text for f in built.block.filters]
+    assert check(cached, 'https://doubleclick.net/ad.js') == '||doubleclick.net^'
+    assert check(cached, 'https://notdoubleclick.net/ad.js') is None
+    assert check(cached, 'https://cdn.other.example/tracker.js') == '/tracker.js$script,third-party'
+
+
+def test_load_engine_rebuilds_when_a_list_changes(tmp_path):
+    list_path = tmp_path / 'easylist.txt'
+    list_path.write_text('||one.example^\n', encoding='utf-8')
+    cache_path = str(tmp_path / 'compiled.pickle')
+    load_engine([str(list_path)], cache_path)
+
+    list_path.write_text('||one.example^\n||two.example^\n', encoding='utf-8')
+    engine = load_engine([str(list_path)], cache_path)
+    assert len(engine.block) == 2
@@ -0,0 +1,34 @@
+# dyslexim/tests/test_config_store.py
+import json
+import os
+import time
+
+from core import config_store
+from core.config_store import ConfigStore
+
+
+def wait_for(condition, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / 'config.json')
+    store = ConfigStore(path, {'font': 'Poppins'}, write_delay_s=0.01)
+    real_replace = os.replace
+    failures = []
+
+    def flaky_replace(src, dst):
+        if not failures:
+            failures.append(dst)
+            raise OSError(28, 'No space left on device')
+        real_replace(src, dst)
+    monkeypatch.setattr(config_store.os, 'replace', flaky_replace)
+
+    store.update(font='OpenDyslexic')
+    assert wait_for(lambda: os.path.exists(path))
+    assert failures == [path]
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['font'] == 'OpenDyslexic'
@@ -0,0 +1,58 @@
+# dyslexim/tests/test_debounced_writer.py
+import threading
+import time
+
+from core.debounced_writer import DebouncedWriter
+
+
+def make_writer(delay_s=0.0):
+    lock = threading.Lock()
+    pending, written = [], []
+    idle = threading.Event()
+
+    def has_pending():
+        if not pending:
+            idle.set()
+        return bool(pending)
+
+    def write():
+        with lock:
+            batch = pending[:]
+            pending.clear()
+        written.extend(batch)
+
+    writer = DebouncedWriter(lock, has_pending, write, delay_s, 'test-writer')
+
+    def queue(item):
+        with lock:
+            pending.append(item)
+            writer.schedule()
+    return queue, written, idle
+
+
+def wait_for(condition, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_changes_queued_as_the_thread_goes_idle_are_written():
+    queue, written, idle = make_writer()
+    for i in range(200):
+        idle.clear()
+        queue(i)
+        # Queue the next change while the thread is on its way out
+        idle.wait(1.0)
+    assert wait_for(lambda: len(written) == 200)
+    assert written == list(range(200))
+
+
+def test_writes_wait_for_a_quiet_period():
+    queue, written, idle = make_writer(delay_s=0.2)
+    queue('a')
+    time.sleep(0.1)
+    queue('b')
+    time.sleep(0.15)
+    assert written == []
+    assert wait_for(lambda: written == ['a', 'b'])
@@ -0,0 +1,52 @@
+# dyslexim/tests/test_gaze_handler.py
+from core.config import GAZE_THROTTLE_MS
+from core.js_handler import get_js_gaze_handler
+
+from js_harness import run_in_fake_dom
+
+
+def test_steady_33ms_stream_keeps_moving_the_highlight():
+    # A 30 Hz stream sweeping left to right across the ten paragraphs for ~1 s.
+    # The highlight must follow while samples keep coming, not only once they stop.
+    result = run_in_fake_dom(get_js_gaze_handler({}), """
+        const seen = [];
+        for (let i = 0; i < 30; i++) {
+          window.__dyslexim_handleGaze(i / 30, 0.2, Date.now());
+          await dom.sleep(33);
+          dom.frame();
+          const el = window.__dyslexim_prevEl;
+          if (el && seen[seen.length - 1] !== el.textContent) seen.push(el.textContent);
+        }
+        dom.done({ seen: seen, stats: window.__dyslexim_stats });
+    """)
+    # Handled while streaming, at about one sample per throttle interval
+    assert len(result['seen']) >= 5
+    assert result['stats']['handled'] >= 1000 // GAZE_THROTTLE_MS // 2
+    assert result['stats']['received'] == 30
+
+
+def test_single_sample_is_handled_right_away():
+    result = run_in_fake_dom(get_js_gaze_handler({}), """
+        window.__dyslexim_handleGaze(0.55, 0.2, Date.now());
+        await dom.sleep(5);
+        dom.done({ el: window.__dyslexim_prevEl && window.__dyslexim_prevEl.textContent });
+    """)
+    assert result['el'] == 'paragraph 5'
+
+
+def test_handler_subscribes_to_an_already_connected_channel():
+    # A page that opened its own QWebChannel has __dyslexim_channel set before the
+    # handler runs, so the subscription callback fires during install.
+    preset_channel = """
+        window.__installed = null;
+        window.__dyslexim_channel = { objects: {
+          gaze: { samples: { connect() {} }, latencyReporting: false, handlerInstalled: ms => { window.__installed = ms; } },
+          handler: { settings: { highlightColor: '#00ff00' }, settingsChanged: { connect() {} } },
+        } };
+    """
+    result = run_in_fake_dom(preset_channel + get_js_gaze_handler({}), """
+        dom.done({ color: window.__dyslexim_config.highlightColor, installed: window.__installed });
+    """)
+    assert 'installError' not in result
+    assert result['color'] == '#00ff00'
+    assert result['installed'] is not None
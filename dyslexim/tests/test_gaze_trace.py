@@ -0,0 +1,70 @@
+# dyslexim/tests/test_gaze_trace.py
+import struct
+
+from core.gaze_sources import FileGazeSource, create_gaze_source
+from core.gaze_trace import GazeTraceRecorder, TraceGazeSource, is_gaze_trace_file, load_gaze_trace
+
+
+def _record(path):
+    recorder = GazeTraceRecorder()
+    recorder.record(0.25, 0.5, 'https://example.com/')
+    recorder.record(0.75, 0.5, 'https://example.com/')
+    recorder.save(path)
+
+
+def test_recorded_trace_round_trips_and_is_detected(tmp_path):
+    path = str(tmp_path / 'session.dxgt')
+    _record(path)
+    assert is_gaze_trace_file(path)
+    trace = load_gaze_trace(path)
+    assert [(x, y, url) for _, x, y, url in trace.samples()] == [
+        (0.25, 0.5, 'https://example.com/'), (0.75, 0.5, 'https://example.com/'),
+    ]
+
+    source = TraceGazeSource(trace, to_global=lambda x, y: (x * 100, y * 100))
+    source.begin()
+    assert [(x, y) for x, y, _ in source.drain()][0] == (25.0, 50.0)
+
+
+def test_text_trace_is_not_mistaken_for_a_recording(tmp_path):
+    path = tmp_path / 'gaze.txt'
+    path.write_text("0.0 0.1 0.2\n0.1 0.3 0.4\n", encoding='utf-8')
+    assert not is_gaze_trace_file(str(path))
+    assert isinstance(create_gaze_source(str(path), (0, 0, 100, 100)), FileGazeSource)
+
+
+def test_file_source_reports_binary_input_instead_of_dying(tmp_path, capsys):
+    path = str(tmp_path / 'session.dxgt')
+    with open(path, 'wb') as f:
+        f.write(b'DXGT\x01\x00\xff\xfe\x80\x81 not text')
+    source = FileGazeSource(path, (0, 0, 100, 100))
+    source._run()
+    assert "Gaze file source error" in capsys.readouterr().out
+    assert source.drain() == []
+
+
+def test_long_urls_and_many_pages_survive_saving(tmp_path):
+    path = str(tmp_path / 'session.dxgt')
+    recorder = GazeTraceRecorder()
+    data_url = 'data:text/html,' + 'x' * 70000
+    recorder.record(0.1, 0.2, data_url)
+    for i in range(70000):
+        recorder.record(0.5, 0.5, f'https://example.com/{i}')
+    recorder.record(0.3, 0.4, data_url)
+    recorder.save(path)
+
+    samples = list(load_gaze_trace(path).samples())
+    assert len(samples) == 70002
+    assert samples[0][3] == data_url
+    assert samples[-2][3] == 'https://example.com/69999'
+    assert samples[-1][3] == data_url
+
+
+def test_version_1_traces_still_load(tmp_path):
+    path = tmp_path / 'old.dxgt'
+    url = b'https://example.com/'
+    path.write_bytes(
+        struct.pack('<4sHIH', b'DXGT', 1, 1, 1) + struct.pack('<H', len(url)) + url
+        + struct.pack('<fffH', 0.0, 0.25, 0.5, 0)
+    )
+    assert [(x, y, u) for _, x, y, u in load_gaze_trace(str(path)).samples()] == [(0.25, 0.5, 'https://example.com/')]
@@ -0,0 +1,67 @@
+# dyslexim/tests/test_history.py
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from core import history
+from core.history import History, HistoryIndex
+
+ROWS = [
+    (f"https://site{i}.example.com/page", f"Page number {i}", 1, 1000.0 + i, 1.0 + i / 1000.0)
+    for i in range(500)
+]
+
+
+def test_visits_leave_the_built_arrays_alone():
+    index = HistoryIndex(ROWS)
+    built = list(index.exact.keys)
+    index.visit("https://wikipedia.org/wiki/Dyslexia", "Dyslexia - Wikipedia", time.time())
+    assert index.exact.keys == built
+    assert index.search("dyslexia") == [("https://wikipedia.org/wiki/Dyslexia", "Dyslexia - Wikipedia")]
+    assert index.search("wikpedia")[0][0] == "https://wikipedia.org/wiki/Dyslexia"
+
+
+def test_retitled_new_entry_is_found_by_its_new_title_only():
+    index = HistoryIndex(ROWS)
+    index.visit("https://news.example.org/a", "Loading", time.time())
+    index.set_title("https://news.example.org/a", "Typography matters")
+    assert index.search("loading") == []
+    assert index.search("typography") == [("https://news.example.org/a", "Typography matters")]
+
+
+def wait_for(condition, timeout_s=10.0):
+    deadline = time.monotonic() + timeout_s
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_index_is_rebuilt_in_the_background_keeping_new_visits(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(history, 'REBUILD_AFTER_KEYS', 20)
+    hist = History(str(tmp_path / "history.db"))
+    assert wait_for(lambda: hist.index is not None)
+    first = hist.index
+
+    for i in range(10):
+        hist.record_visit(f"https://example.com/article/{i}", f"Article {i}")
+    assert hist._touched is not None  # a rebuild is running
+    # Changed while the rebuild runs: must not be lost when the new index takes over
+    hist.record_visit("https://example.com/article/3")
+    hist.set_title("https://example.com/article/3", "Article three")
+
+    assert wait_for(lambda: hist.index is not first)
+    entry = hist.index.by_url["https://example.com/article/3"]
+    assert (entry.visit_count, entry.title) == (2, "Article three")
+    assert len(hist.index) == 10
+    assert hist.search("three") == [("https://example.com/article/3", "Article three")]
+    hist.flush()
+
+
+def test_index_sorted_in_runs_matches_one_sort(monkeypatch):
+    whole = HistoryIndex(ROWS)
+    monkeypatch.setattr(history, 'SORT_RUN_KEYS', 97)
+    in_runs = HistoryIndex(ROWS)
+    assert in_runs.exact.keys == whole.exact.keys
+    assert [e.url for e in in_runs.fuzzy.entries] == [e.url for e in whole.fuzzy.entries]
+    assert in_runs.search("page number 42") == whole.search("page number 42")
@@ -0,0 +1,29 @@
+# dyslexim/tests/test_reader.py
+from core.reader import extract_article
+
+PARAGRAPH = "<p>" + "Reading is easier with a clean page and large, calm letters, and this one says so at length. " * 4 + "</p>"
+
+
+def article_with(snippet):
+    page = f"<html><body><article>{PARAGRAPH}<p>{snippet}, then more text to keep it in.</p>{PARAGRAPH}</article></body></html>"
+    return extract_article(page, "https://example.com/story/")['content']
+
+
+def test_script_links_lose_their_href():
+    content = article_with('<a href="javascript:alert(1)">one</a> <a href=" VBScript:msgbox(1)">two</a>')
+    assert '<a>one</a>' in content
+    assert '<a>two</a>' in content
+    assert 'script:' not in content.lower()
+
+
+def test_web_and_mail_links_are_kept_and_resolved():
+    content = article_with('<a href="../about">about</a> <a href="mailto:me@example.com">mail</a>')
+    assert 'href="https://example.com/about"' in content
+    assert 'href="mailto:me@example.com"' in content
+
+
+def test_images_keep_only_web_and_inline_image_sources():
+    content = article_with('<img src="javascript:alert(1)"><img src="pic.png"><img src="data:image/png;base64,AAAA">')
+    assert content.count('<img') == 2
+    assert 'src="https://example.com/story/pic.png"' in content
+    assert 'src="data:image/png;base64,AAAA"' in content
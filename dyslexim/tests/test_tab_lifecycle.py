@@ -0,0 +1,89 @@
+# dyslexim/tests/test_tab_lifecycle.py
+import pytest
+
+# QtWebEngine needs system libraries (X11, NSS...) that headless CI boxes may lack
+pytest.importorskip("PyQt6.QtWebEngineCore", exc_type=ImportError)
+
+from core import tab_lifecycle
+from core.tab_lifecycle import LifecycleState, TabLifecycleManager
+
+
+class FakePage:
+    def __init__(self, pid):
+        self.pid = pid
+        self.state = LifecycleState.Active
+
+    def lifecycleState(self):
+        return self.state
+
+    def setLifecycleState(self, state):
+        self.state = state
+
+    def recommendedState(self):
+        return LifecycleState.Discarded
+
+    def renderProcessPid(self):
+        return self.pid
+
+    def scrollPosition(self):
+        return None
+
+
+class FakeView:
+    def __init__(self, pid):
+        self._page = FakePage(pid)
+
+    def page(self):
+        return self._page
+
+
+class FakeTab:
+    def __init__(self, pid):
+        self.view = FakeView(pid)
+        self.saved_scroll = None
+
+    def is_materialized(self):
+        return True
+
+    def restore_scroll_on_load(self):
+        pass
+
+
+class FakeTabWidget:
+    def __init__(self, tabs):
+        self._tabs = tabs
+        self.current = None
+
+    def count(self):
+        return len(self._tabs)
+
+    def widget(self, i):
+        return self._tabs[i]
+
+    def currentWidget(self):
+        return self.current
+
+
+def test_tab_read_for_a_long_time_is_not_discarded_first(qapp, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(tab_lifecycle.time, 'monotonic', lambda: clock[0])
+    # Every renderer uses 100 MB; the budget fits two of the three
+    monkeypatch.setattr(tab_lifecycle, 'read_process_rss_kb', lambda pid: 100 * 1024)
+
+    reading, other, untouched = FakeTab(1), FakeTab(2), FakeTab(3)
+    widget = FakeTabWidget([reading, other, untouched])
+    manager = TabLifecycleManager(widget, memory_budget_mb=250, freeze_after_s=300, check_interval_ms=60_000)
+    for tab in (reading, other, untouched):
+        manager.touch(tab)
+
+    # Read the first tab for ten minutes, then switch to another
+    widget.current = reading
+    manager.activate(reading)
+    clock[0] = 600.0
+    widget.current = other
+    manager.activate(other)
+
+    clock[0] = 601.0
+    manager.check()
+    assert untouched.view.page().state == LifecycleState.Discarded
+    assert reading.view.page().state == LifecycleState.Active
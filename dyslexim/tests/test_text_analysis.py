@@ -0,0 +1,67 @@
+# dyslexim/tests/test_text_analysis.py
+import pytest
+
+from core.text_analysis import analyze_paragraph, is_rare, syllabify
+
+
+@pytest.mark.parametrize('word, parts', [
+    ('paragraph', ['pa', 'ra', 'graph']),
+    ('table', ['ta', 'ble']),
+    ('lovely', ['love', 'ly']),
+    ('jumped', ['jumped']),
+    ('wanted', ['wan', 'ted']),
+    ('nation', ['na', 'tion']),
+    ('hungry', ['hun', 'gry']),
+    ('backpack', ['back', 'pack']),
+])
+def test_syllabify_common_patterns(word, parts):
+    assert syllabify(word) == parts
+
+
+@pytest.mark.parametrize('word, parts', [
+    ('create', ['cre', 'ate']),
+    ('going', ['go', 'ing']),
+    ('being', ['be', 'ing']),
+    ('poem', ['po', 'em']),
+    ('quiet', ['qui', 'et']),
+    ('ingredient', ['in', 'gre', 'di', 'ent']),
+    ('idea', ['i', 'de', 'a']),
+    ('variety', ['va', 'ri', 'e', 'ty']),
+])
+def test_syllabify_splits_vowels_said_separately(word, parts):
+    assert syllabify(word) == parts
+
+
+@pytest.mark.parametrize('word', ['read', 'great', 'sea', 'friend', 'field', 'coin', 'voice', 'build', 'fruit', 'team'])
+def test_syllabify_keeps_vowel_teams_together(word):
+    assert syllabify(word) == [word]
+
+
+def test_syllabify_keeps_the_original_case():
+    assert syllabify('Paragraph') == ['Pa', 'ra', 'graph']
+
+
+def test_rare_words_are_long_and_uncommon():
+    assert is_rare('photosynthesis', 5)
+    assert not is_rare('cat', 1)
+    assert not is_rare('understanding', 4)
+    # Inflections of common words count as common
+    assert not is_rare('researchers', 3)
+    assert not is_rare('studies', 2)
+
+
+def test_analyze_paragraph_counts_and_rare_words():
+    result = analyze_paragraph(
+        "Photosynthesis is quiet. The researchers studied photosynthesis in Pasadena! NASA helped."
+    )
+    assert result['words'] == 11
+    assert result['sentences'] == 3
+    # pho-to-syn-the-sis is qui-et the re-sear-chers stu-died ... Pa-sa-de-na NA-SA helped
+    assert result['syllables'] == 27
+    # Each rare word once; names and acronyms are skipped
+    assert result['rare'] == [['photosynthesis', ['pho', 'to', 'syn', 'the', 'sis']]]
+    assert 0 < result['grade'] and result['ease'] < 60
+
+
+def test_analyze_paragraph_without_words():
+    assert analyze_paragraph("  42 ... ") == {'words': 0, 'sentences': 0, 'syllables': 0, 'rare': []}
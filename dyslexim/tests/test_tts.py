@@ -0,0 +1,35 @@
+# dyslexim/tests/test_tts.py
+from PyQt6.QtCore import QBuffer, QCoreApplication, QEvent
+
+from core.tts import TTSService
+
+
+class FakePlayer:
+    def __init__(self):
+        self.source = None
+
+    def setSourceDevice(self, device):
+        self.source = device
+
+    def play(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def test_playing_chunks_keeps_one_buffer_alive(qapp):
+    tts = TTSService()
+    player = FakePlayer()
+    tts._ensure_player = lambda: player
+    tts._chunks = [f"sentence {i}." for i in range(5)]
+    tts._audio = {i: b"RIFF" for i in range(5)}
+    tts._requested = set(range(5))
+
+    for index in range(5):
+        tts._play(index)
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    buffers = tts.findChildren(QBuffer)
+    assert buffers == [player.source]
+    assert bytes(player.source.data()) == b"RIFF"
@@ -0,0 +1,49 @@
+# dyslexim/tools/build_resources.py
+"""
+Compiles resources.qrc into the binary bundle resources.rcc that Dyslexim
+registers at startup (icons, theme QSS, local pages).
+
+PyQt6 ships no resource compiler, so this uses Qt's `rcc` (or `pyside6-rcc`,
+which accepts the same options) from PATH or from the Qt installation.
+
+    python tools/build_resources.py
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+QRC = os.path.join(ROOT, 'resources.qrc')
+OUTPUT = os.path.join(ROOT, 'resources.rcc')
+
+
+def find_rcc():
+    for name in ('rcc', 'pyside6-rcc'):
+        path = shutil.which(name)
+        if path:
+            return path
+    try:
+        from PyQt6.QtCore import QLibraryInfo
+        for location in (QLibraryInfo.LibraryPath.LibraryExecutablesPath, QLibraryInfo.LibraryPath.BinariesPath):
+            candidate = os.path.join(QLibraryInfo.path(location), 'rcc.exe' if sys.platform == 'win32' else 'rcc')
+            if os.path.exists(candidate):
+                return candidate
+    except ImportError:
+        pass
+    return None
+
+
+def main():
+    rcc = find_rcc()
+    if not rcc:
+        print("No rcc found (install Qt's tools or PySide6). Dyslexim will load resources/ from disk instead.")
+        return 1
+    result = subprocess.run([rcc, '--binary', QRC, '-o', OUTPUT], cwd=ROOT)
+    if result.returncode == 0:
+        print(f"Wrote {OUTPUT}")
+    return result.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
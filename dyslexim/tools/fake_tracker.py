@@ -0,0 +1,74 @@
+# dyslexim/tools/fake_tracker.py
+"""
+Fake eye tracker for testing Dyslexim's network gaze source.
+
+Streams normalized "x y t" samples that sweep across the screen like a reader
+moving line by line. Run it next to Dyslexim:
+
+    python tools/fake_tracker.py --protocol udp --port 4242 --rate 250
+    python main.py --gaze-source udp://127.0.0.1:4242
+"""
+import argparse
+import math
+import socket
+import time
+
+
+def reading_path(t, line_seconds=2.5, lines=12):
+    """Returns a normalized (x, y) gaze position that reads left-to-right, top-to-bottom."""
+    line = int(t / line_seconds) % lines
+    progress = (t % line_seconds) / line_seconds
+    # Small saccade-like jitter on top of the smooth sweep
+    jitter = 0.004 * math.sin(t * 40.0)
+    x = 0.1 + 0.8 * progress
+    y = 0.15 + 0.7 * (line + 0.5) / lines + jitter
+    return x, y
+
+
+def stream(send, rate):
+    interval = 1.0 / rate
+    start = time.monotonic()
+    sent = 0
+    next_tick = start
+    while True:
+        now = time.monotonic()
+        x, y = reading_path(now - start)
+        send(f"{x:.5f} {y:.5f} {now:.6f}\n".encode('ascii'))
+        sent += 1
+        if sent % (rate * 5) == 0:
+            print(f"{sent} samples sent ({sent / (now - start):.0f} Hz)")
+        next_tick += interval
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--protocol", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4242)
+    parser.add_argument("--rate", type=int, default=120, help="samples per second")
+    args = parser.parse_args()
+
+    if args.protocol == "udp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        print(f"Streaming UDP gaze to {args.host}:{args.port} at {args.rate} Hz")
+        stream(lambda data: sock.sendto(data, (args.host, args.port)), args.rate)
+    else:
+        server = socket.create_server((args.host, args.port))
+        print(f"Waiting for Dyslexim on tcp://{args.host}:{args.port}")
+        while True:
+            conn, addr = server.accept()
+            print(f"Connected: {addr}")
+            try:
+                stream(conn.sendall, args.rate)
+            except OSError:
+                print("Client disconnected")
+            finally:
+                conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
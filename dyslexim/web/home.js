@@ -6,6 +6,10 @@ document.addEventListener('DOMContentLoaded', () => {
     
     // --- 1. Initialize the QWebChannel ---
     new QWebChannel(qt.webChannelTransport, (channel) => {
+        // Share the channel with the injected gaze handler (one QWebChannel per page)
+        window.__dyslexim_channel = channel;
+        (window.__dyslexim_channelWaiters || []).forEach(cb => cb(channel));
+
         // 'handler' is the name we registered in main_window.py
         pyHandler = channel.objects.handler;
         console.log("Home Page: WebChannel connection established.");